@@ -2,6 +2,10 @@ from flask import Flask
 from app.config import Config
 from app.extensions import mongo, login_manager, bcrypt
 from app.services.user_service import UserService
+from app.commands import register_commands
+from app.services import identity_map
+from app.services.facet_service import FacetService
+from app.services.feed_cache import FeedCache
 
 # Blueprints - import all blueprints
 from app.views.auth_views import auth_bp
@@ -10,6 +14,7 @@ from app.views.resume_views import resume_bp
 from app.views.resume_form_views import resume_form_bp
 from app.views.feed_views import feed_bp
 from app.views.resume_reviews_views import resume_reviews_bp
+from app.views.metrics_views import metrics_bp
 
 
 def create_app(config_class=Config):
@@ -27,6 +32,15 @@ def create_app(config_class=Config):
     bcrypt.init_app(app)
 
     login_manager.login_view = "auth.login"
+    identity_map.init_app(app)
+    UserService.configure_user_cache(
+        maxsize=app.config.get("USER_CACHE_SIZE"), ttl=app.config.get("USER_CACHE_TTL")
+    )
+    FeedCache.configure(
+        maxsize=app.config.get("FEED_CACHE_SIZE"),
+        ttl=app.config.get("FEED_CACHE_TTL"),
+        poll_interval=app.config.get("FEED_CACHE_GENERATION_POLL"),
+    )
 
     @login_manager.user_loader
     def load_user(user_id):
@@ -48,10 +62,25 @@ def create_app(config_class=Config):
     app.register_blueprint(resume_form_bp)
     app.register_blueprint(feed_bp)
     app.register_blueprint(resume_reviews_bp)
+    app.register_blueprint(metrics_bp)
+
+    # CLI maintenance commands
+    register_commands(app)
 
     # mongo
     try:
         mongo.db.resumes.create_index([("$**", "text")])
+        # Newest-first feed order, also used by its keyset cursors
+        mongo.db.resumes.create_index([("created_at", -1), ("_id", -1)])
+        # Other workers' search indexes catch up on writes by updated_at
+        mongo.db.resumes.create_index([("updated_at", 1)])
+        FacetService.ensure_indexes()
+        # Paging through one resume's reviews in display order
+        mongo.db.highlights.create_index(
+            [("document_id", 1), ("first_highlight_created_at", 1), ("_id", 1)]
+        )
+        # Reviews changed since a version, for live updates
+        mongo.db.highlights.create_index([("document_id", 1), ("version", 1)])
     except Exception as e:
-        app.logger.warning(f"Could not create text index on 'resumes' collection: {e}")
+        app.logger.warning(f"Could not create indexes on 'resumes' collection: {e}")
     return app
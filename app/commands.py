@@ -0,0 +1,159 @@
+from datetime import timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.services.blob_storage import BlobStorage, BACKENDS, create_backend
+from app.services.facet_service import FacetService
+from app.services.review_stats_service import ReviewStatsService
+from app.services.search_service import SearchService
+from app.services.storage_gc_service import (
+    StorageGCService,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_BATCH_PAUSE,
+)
+
+
+@click.command("gc-storage")
+@click.option(
+    "--grace-hours",
+    default=24.0,
+    show_default=True,
+    help="Only delete unreferenced files older than this many hours.",
+)
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option(
+    "--batch-pause",
+    default=DEFAULT_BATCH_PAUSE,
+    show_default=True,
+    help="Seconds to wait between delete batches.",
+)
+@click.option("--dry-run", is_flag=True, help="Report orphans without deleting them.")
+@with_appcontext
+def gc_storage_command(grace_hours, batch_size, batch_pause, dry_run):
+    """Delete stored files that no resume references."""
+    report = StorageGCService.collect(
+        grace_period=timedelta(hours=grace_hours),
+        batch_size=batch_size,
+        batch_pause=batch_pause,
+        dry_run=dry_run,
+    )
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    click.echo(
+        f"{report['orphaned_files']} orphaned file(s), "
+        f"{report['deleted_files']} deleted. "
+        f"{verb} {report['reclaimed_bytes']} bytes."
+    )
+
+
+@click.command("migrate-small-blobs")
+@click.option(
+    "--threshold",
+    type=int,
+    default=None,
+    help="Largest file size in bytes to inline (defaults to BLOB_INLINE_THRESHOLD).",
+)
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option(
+    "--batch-pause",
+    default=DEFAULT_BATCH_PAUSE,
+    show_default=True,
+    help="Seconds to wait between batches.",
+)
+@click.option("--dry-run", is_flag=True, help="Report candidates without moving them.")
+@with_appcontext
+def migrate_small_blobs_command(threshold, batch_size, batch_pause, dry_run):
+    """Move small GridFS files into the inline blobs collection."""
+    report = BlobStorage.migrate_small_files(
+        threshold=threshold,
+        batch_size=batch_size,
+        batch_pause=batch_pause,
+        dry_run=dry_run,
+    )
+    if dry_run:
+        click.echo(
+            f"Would move {report['candidate_files']} file(s), "
+            f"{report['migrated_bytes']} bytes."
+        )
+    else:
+        click.echo(
+            f"Moved {report['migrated_files']} file(s), "
+            f"{report['migrated_bytes']} bytes."
+        )
+
+
+@click.command("copy-blobs")
+@click.argument("source", type=click.Choice(BACKENDS))
+@click.argument("destination", type=click.Choice(BACKENDS))
+@click.option(
+    "--delete-source",
+    is_flag=True,
+    help="Remove each blob from the source once it is in the destination.",
+)
+@click.option("--dry-run", is_flag=True, help="Report what would be copied.")
+@with_appcontext
+def copy_blobs_command(source, destination, delete_source, dry_run):
+    """Copy stored files between blob storage backends, keeping their ids."""
+    if source == destination:
+        raise click.BadParameter("source and destination must differ")
+    try:
+        report = BlobStorage.copy(
+            create_backend(source, current_app.config),
+            create_backend(destination, current_app.config),
+            delete_source=delete_source,
+            dry_run=dry_run,
+        )
+    except (ValueError, RuntimeError) as e:
+        raise click.ClickException(str(e))
+    verb = "Would copy" if dry_run else "Copied"
+    click.echo(
+        f"{verb} {report['copied_files']} file(s), {report['copied_bytes']} bytes; "
+        f"{report['skipped_files']} already in {destination}."
+    )
+
+
+@click.command("build-search-index")
+@with_appcontext
+def build_search_index_command():
+    """Rebuild the feed search index and write its snapshot."""
+    if not current_app.config.get("SEARCH_SNAPSHOT_PATH"):
+        raise click.ClickException("SEARCH_SNAPSHOT_PATH is not set")
+    index = SearchService.build()
+    SearchService.save_snapshot(index)
+    stats = index.stats()
+    click.echo(
+        f"Indexed {stats['documents']} resume(s), {stats['terms']} term(s); "
+        f"wrote {current_app.config['SEARCH_SNAPSHOT_PATH']}."
+    )
+
+
+@click.command("rebuild-facets")
+@with_appcontext
+def rebuild_facets_command():
+    """Recompute resume facet values and the facet_counts rollup."""
+    report = FacetService.rebuild()
+    click.echo(
+        f"Recomputed facets for {report['resumes']} resume(s); "
+        f"{report['values']} distinct value(s)."
+    )
+
+
+@click.command("reconcile-review-stats")
+@with_appcontext
+def reconcile_review_stats_command():
+    """Recompute each resume's review counters from its highlights."""
+    report = ReviewStatsService.reconcile()
+    click.echo(
+        f"Checked {report['resumes']} resume(s); " f"corrected {report['corrected']}."
+    )
+
+
+def register_commands(app):
+    """Attach maintenance commands to the Flask CLI."""
+    app.cli.add_command(gc_storage_command)
+    app.cli.add_command(migrate_small_blobs_command)
+    app.cli.add_command(copy_blobs_command)
+    app.cli.add_command(build_search_index_command)
+    app.cli.add_command(rebuild_facets_command)
+    app.cli.add_command(reconcile_review_stats_command)
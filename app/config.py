@@ -4,3 +4,74 @@ import os
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev_secret_key")
     MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/mydb")
+
+    # Per-process cache for the flask-login user loader
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 1024))
+    USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", 60))
+
+    # Blobs up to this many bytes are stored inline instead of in GridFS
+    BLOB_INLINE_THRESHOLD = int(os.environ.get("BLOB_INLINE_THRESHOLD", 512 * 1024))
+
+    # Where PDF/LaTeX bytes live: gridfs (default), local or s3
+    BLOB_STORAGE_BACKEND = os.environ.get("BLOB_STORAGE_BACKEND", "gridfs")
+    BLOB_STORAGE_PATH = os.environ.get("BLOB_STORAGE_PATH", "instance/blobs")
+    S3_BUCKET = os.environ.get("S3_BUCKET")
+    S3_PREFIX = os.environ.get("S3_PREFIX", "")
+    S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")
+    S3_REGION = os.environ.get("S3_REGION")
+
+    # Node-local disk cache for hot PDFs; disabled unless a directory is set
+    BLOB_CACHE_DIR = os.environ.get("BLOB_CACHE_DIR")
+    BLOB_CACHE_MAX_BYTES = int(
+        os.environ.get("BLOB_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+    )
+
+    # Thumbnails and viewer text layers are built after compile/upload:
+    # async, sync or off
+    PDF_DERIVATIVES = os.environ.get("PDF_DERIVATIVES", "async")
+
+    # Linearize and compress stored PDFs with qpdf (skipped if it isn't installed)
+    PDF_OPTIMIZE = os.environ.get("PDF_OPTIMIZE", "true").lower() == "true"
+
+    # In-process BM25 feed search; "mongo" falls back to the $text operator
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "index")
+    # Snapshot file so new workers start warm (unset to always build from Mongo)
+    SEARCH_SNAPSHOT_PATH = os.environ.get("SEARCH_SNAPSHOT_PATH")
+    SEARCH_SYNC_INTERVAL = int(os.environ.get("SEARCH_SYNC_INTERVAL", 30))
+    SEARCH_SNAPSHOT_INTERVAL = int(os.environ.get("SEARCH_SNAPSHOT_INTERVAL", 300))
+    # Load each worker's search index on a background thread (async) or
+    # inside the first search (sync)
+    SEARCH_BUILD = os.environ.get("SEARCH_BUILD", "async")
+    SEARCH_RECENCY_WEIGHT = float(os.environ.get("SEARCH_RECENCY_WEIGHT", 0.5))
+    SEARCH_RECENCY_HALF_LIFE_DAYS = float(
+        os.environ.get("SEARCH_RECENCY_HALF_LIFE_DAYS", 30)
+    )
+
+    # Per-process cache of feed pages, dropped whenever a resume is written
+    FEED_CACHE_SIZE = int(os.environ.get("FEED_CACHE_SIZE", 256))
+    FEED_CACHE_TTL = float(os.environ.get("FEED_CACHE_TTL", 300))
+    # How often each worker checks whether other workers wrote a resume
+    FEED_CACHE_GENERATION_POLL = float(
+        os.environ.get("FEED_CACHE_GENERATION_POLL", 1.0)
+    )
+
+    # Seconds between rebuilds of each worker's search-box completions
+    SUGGEST_REFRESH_INTERVAL = int(os.environ.get("SUGGEST_REFRESH_INTERVAL", 60))
+
+    # Seconds between each worker catching up on other workers' writes to
+    # its similar-resumes index
+    SIMILAR_SYNC_INTERVAL = int(os.environ.get("SIMILAR_SYNC_INTERVAL", 60))
+    # Build each worker's similar-resumes index on a background thread
+    # (async) or inside the first request that needs it (sync)
+    SIMILAR_BUILD = os.environ.get("SIMILAR_BUILD", "async")
+
+    # Live review updates: how often each open stream re-reads review
+    # versions (writes in the same worker are pushed at once), and how long
+    # a stream stays open before the browser reconnects
+    REVIEW_EVENTS_POLL_INTERVAL = float(
+        os.environ.get("REVIEW_EVENTS_POLL_INTERVAL", 2.0)
+    )
+    REVIEW_EVENTS_MAX_SECONDS = float(os.environ.get("REVIEW_EVENTS_MAX_SECONDS", 300))
+    # Open streams allowed per worker; each holds a gunicorn thread, so keep
+    # this below GUNICORN_THREADS
+    REVIEW_EVENTS_MAX_STREAMS = int(os.environ.get("REVIEW_EVENTS_MAX_STREAMS", 8))
@@ -0,0 +1,520 @@
+"""Blob storage backends for PDF and LaTeX bytes.
+
+Every backend stores blobs under ObjectIds and returns read-only file objects
+exposing the gridfs.GridOut attributes send_stored_file relies on (_id,
+length, upload_date, metadata, chunk_size, read/seek), so resume documents
+and the HTTP layer don't care where the bytes live.
+"""
+
+import abc
+import hashlib
+import json
+import os
+import time
+import warnings
+from datetime import datetime, timezone
+from io import BytesIO
+from urllib.parse import quote, unquote
+from bson import Binary, ObjectId, errors as bson_errors
+from gridfs import GridFS, NoFile
+from pymongo.errors import DuplicateKeyError
+from app.extensions import mongo
+
+BLOBS_COLLECTION = "blobs"
+
+# Generated resumes are 40-120 KB and LaTeX sources a few KB; anything under
+# this size is stored as one document instead of fs.files + fs.chunks
+DEFAULT_INLINE_THRESHOLD = 512 * 1024
+
+# Ranged reads against S3 are separate requests, so read in larger pieces
+S3_READ_SIZE = 1024 * 1024
+
+
+def _md5_metadata(data, metadata=None):
+    metadata = dict(metadata or {})
+    metadata.setdefault("md5", hashlib.md5(data).hexdigest())
+    return metadata
+
+
+def _to_object_id(file_id):
+    if isinstance(file_id, ObjectId):
+        return file_id
+    try:
+        return ObjectId(file_id)
+    except (bson_errors.InvalidId, TypeError):
+        return None
+
+
+def content_type_of(file_obj):
+    """Content type of a stored file; GridOut still works but warns on access."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return getattr(file_obj, "content_type", None)
+
+
+class InlineBlob:
+    """Read-only file object for a blob stored in a single document."""
+
+    chunk_size = None
+
+    def __init__(self, doc):
+        self._id = doc["_id"]
+        self.filename = doc.get("filename")
+        self.content_type = doc.get("contentType")
+        self.length = doc.get("length", len(doc["data"]))
+        self.upload_date = doc.get("uploadDate")
+        self.metadata = doc.get("metadata") or {}
+        self._buffer = BytesIO(bytes(doc["data"]))
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+    def seek(self, position, whence=0):
+        return self._buffer.seek(position, whence)
+
+    def tell(self):
+        return self._buffer.tell()
+
+
+class _PositionedBlob(abc.ABC):
+    """Base for blobs read lazily from outside MongoDB, one read at a time."""
+
+    chunk_size = None
+
+    def __init__(self, file_id, filename, content_type, length, upload_date, metadata):
+        self._id = file_id
+        self.filename = filename
+        self.content_type = content_type
+        self.length = length
+        self.upload_date = upload_date
+        self.metadata = metadata or {}
+        self._position = 0
+
+    def seek(self, position, whence=0):
+        if whence == 1:
+            position += self._position
+        elif whence == 2:
+            position += self.length
+        self._position = max(0, position)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        if self._position >= self.length:
+            return b""
+        stop = self.length if size is None or size < 0 else self._position + size
+        data = self._read_range(self._position, min(stop, self.length))
+        self._position += len(data)
+        return data
+
+    @abc.abstractmethod
+    def _read_range(self, start, stop):
+        """Return bytes [start, stop) of the blob."""
+
+
+class GridFSBackend:
+    """Blobs in MongoDB: small ones inline in `blobs`, larger ones in GridFS.
+
+    Both tiers share the ObjectId space, so resume documents reference either
+    kind of blob the same way.
+    """
+
+    name = "gridfs"
+
+    def __init__(self, inline_threshold=DEFAULT_INLINE_THRESHOLD):
+        self.inline_threshold = inline_threshold
+
+    def put(
+        self,
+        data,
+        filename,
+        content_type,
+        file_id=None,
+        upload_date=None,
+        metadata=None,
+    ):
+        metadata = _md5_metadata(data, metadata)
+        file_id = file_id or ObjectId()
+        if len(data) <= self.inline_threshold:
+            mongo.db[BLOBS_COLLECTION].insert_one(
+                {
+                    "_id": file_id,
+                    "filename": filename,
+                    "contentType": content_type,
+                    "length": len(data),
+                    "uploadDate": upload_date or datetime.now(timezone.utc),
+                    "metadata": metadata,
+                    "data": Binary(data),
+                }
+            )
+            return file_id
+
+        GridFS(mongo.db).put(
+            data,
+            _id=file_id,
+            filename=filename,
+            content_type=content_type,
+            metadata=metadata,
+        )
+        if upload_date is not None:
+            # Copies between backends keep the original upload time
+            mongo.db["fs.files"].update_one(
+                {"_id": file_id}, {"$set": {"uploadDate": upload_date}}
+            )
+        return file_id
+
+    def get(self, file_id):
+        """Inline blobs cost one query; GridFS blobs add the fs.files lookup."""
+        file_id = _to_object_id(file_id)
+        if file_id is None:
+            return None
+        doc = mongo.db[BLOBS_COLLECTION].find_one({"_id": file_id})
+        if doc is not None:
+            return InlineBlob(doc)
+        try:
+            return GridFS(mongo.db).get(file_id)
+        except NoFile:
+            return None
+
+    def delete(self, file_id):
+        self.delete_many([file_id])
+
+    def delete_many(self, file_ids):
+        file_ids = list(file_ids)
+        mongo.db[BLOBS_COLLECTION].delete_many({"_id": {"$in": file_ids}})
+        # Same order as GridFS.delete: the file disappears before its chunks
+        mongo.db["fs.files"].delete_many({"_id": {"$in": file_ids}})
+        mongo.db["fs.chunks"].delete_many({"files_id": {"$in": file_ids}})
+
+    def iter_files(self, uploaded_before=None):
+        """Yield (file_id, length) for every stored blob, optionally only older ones."""
+        query = {}
+        if uploaded_before is not None:
+            query["uploadDate"] = {"$lt": uploaded_before}
+        for collection in ("fs.files", BLOBS_COLLECTION):
+            for doc in mongo.db[collection].find(query, {"_id": 1, "length": 1}):
+                yield doc["_id"], doc.get("length", 0)
+
+    def migrate_small_files(
+        self, threshold=None, batch_size=100, batch_pause=0.0, dry_run=False
+    ):
+        """Move GridFS files at or under the threshold into the inline tier.
+
+        Each file keeps its id, so no resume document needs rewriting. The
+        inline copy is written before the GridFS copy is removed; get() prefers
+        the inline tier, so readers never see a missing file mid-migration,
+        and an interrupted run can simply be repeated.
+
+        Returns:
+            dict: Counts of candidate files, migrated files and bytes moved
+        """
+        threshold = self.inline_threshold if threshold is None else threshold
+        fs = GridFS(mongo.db)
+        candidates = list(
+            mongo.db["fs.files"].find(
+                {"length": {"$lte": threshold}},
+                {
+                    "length": 1,
+                    "filename": 1,
+                    "contentType": 1,
+                    "uploadDate": 1,
+                    "metadata": 1,
+                },
+            )
+        )
+        report = {
+            "dry_run": dry_run,
+            "candidate_files": len(candidates),
+            "migrated_files": 0,
+            "migrated_bytes": 0,
+        }
+        if dry_run:
+            report["migrated_bytes"] = sum(doc.get("length", 0) for doc in candidates)
+            return report
+
+        for index, candidate in enumerate(candidates):
+            if index and batch_pause and index % batch_size == 0:
+                time.sleep(batch_pause)
+
+            file_id = candidate["_id"]
+            try:
+                data = fs.get(file_id).read()
+            except NoFile:
+                continue
+            try:
+                mongo.db[BLOBS_COLLECTION].insert_one(
+                    {
+                        "_id": file_id,
+                        "filename": candidate.get("filename"),
+                        "contentType": candidate.get("contentType"),
+                        "length": len(data),
+                        "uploadDate": candidate.get("uploadDate"),
+                        "metadata": _md5_metadata(data, candidate.get("metadata")),
+                        "data": Binary(data),
+                    }
+                )
+            except DuplicateKeyError:
+                # Copied by an earlier, interrupted run
+                pass
+            fs.delete(file_id)
+
+            report["migrated_files"] += 1
+            report["migrated_bytes"] += len(data)
+
+        return report
+
+
+class LocalBlob(_PositionedBlob):
+    """Blob on local disk; each read opens the file so nothing is left open."""
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+
+    def _read_range(self, start, stop):
+        with open(self._path, "rb") as handle:
+            handle.seek(start)
+            return handle.read(stop - start)
+
+
+class LocalBackend:
+    """Blobs as files under a directory, with a JSON sidecar per blob.
+
+    Files are sharded by the last two hex digits of their id (the leading
+    digits are a timestamp and would put everything in one directory). The
+    sidecar is written last and marks the blob as complete.
+    """
+
+    name = "local"
+
+    def __init__(self, root):
+        self.root = root
+
+    def _paths(self, file_id):
+        key = str(file_id)
+        directory = os.path.join(self.root, key[-2:])
+        return os.path.join(directory, key), os.path.join(directory, f"{key}.json")
+
+    @staticmethod
+    def _write_atomically(path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+    def put(
+        self,
+        data,
+        filename,
+        content_type,
+        file_id=None,
+        upload_date=None,
+        metadata=None,
+    ):
+        file_id = file_id or ObjectId()
+        upload_date = upload_date or datetime.now(timezone.utc)
+        if upload_date.tzinfo is None:
+            upload_date = upload_date.replace(tzinfo=timezone.utc)
+        data_path, info_path = self._paths(file_id)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+        self._write_atomically(data_path, data)
+        info = {
+            "filename": filename,
+            "contentType": content_type,
+            "length": len(data),
+            "uploadDate": upload_date.isoformat(),
+            "metadata": _md5_metadata(data, metadata),
+        }
+        self._write_atomically(info_path, json.dumps(info).encode("utf-8"))
+        return file_id
+
+    def get(self, file_id):
+        file_id = _to_object_id(file_id)
+        if file_id is None:
+            return None
+        data_path, info_path = self._paths(file_id)
+        try:
+            with open(info_path, "rb") as handle:
+                info = json.load(handle)
+        except FileNotFoundError:
+            return None
+        return LocalBlob(
+            data_path,
+            file_id=file_id,
+            filename=info.get("filename"),
+            content_type=info.get("contentType"),
+            length=info["length"],
+            upload_date=datetime.fromisoformat(info["uploadDate"]),
+            metadata=info.get("metadata"),
+        )
+
+    def delete(self, file_id):
+        data_path, info_path = self._paths(file_id)
+        # Sidecar first, so a half-deleted blob reads as missing
+        for path in (info_path, data_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def delete_many(self, file_ids):
+        for file_id in file_ids:
+            self.delete(file_id)
+
+    def iter_files(self, uploaded_before=None):
+        if not os.path.isdir(self.root):
+            return
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                file_id = _to_object_id(name[: -len(".json")])
+                if file_id is None:
+                    continue
+                with open(os.path.join(directory, name), "rb") as handle:
+                    info = json.load(handle)
+                uploaded = datetime.fromisoformat(info["uploadDate"])
+                if uploaded_before is None or uploaded < uploaded_before:
+                    yield file_id, info.get("length", 0)
+
+
+class S3Blob(_PositionedBlob):
+    """Blob in an S3 bucket, read with ranged GETs."""
+
+    chunk_size = S3_READ_SIZE
+
+    def __init__(self, client, bucket, key, **kwargs):
+        super().__init__(**kwargs)
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+
+    def _read_range(self, start, stop):
+        response = self._client.get_object(
+            Bucket=self._bucket, Key=self._key, Range=f"bytes={start}-{stop - 1}"
+        )
+        return response["Body"].read()
+
+
+class S3Backend:
+    """Blobs in an S3-compatible bucket (AWS S3, MinIO, ...), keyed by id.
+
+    Requires boto3. Credentials come from the usual AWS environment
+    variables or instance profile.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self, bucket, prefix="", endpoint_url=None, region_name=None, client=None
+    ):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError(
+                    "boto3 is required for the s3 blob storage backend"
+                ) from e
+            client = boto3.client(
+                "s3", endpoint_url=endpoint_url, region_name=region_name
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, file_id):
+        return f"{self.prefix}{file_id}"
+
+    def put(
+        self,
+        data,
+        filename,
+        content_type,
+        file_id=None,
+        upload_date=None,
+        metadata=None,
+    ):
+        file_id = file_id or ObjectId()
+        upload_date = upload_date or datetime.now(timezone.utc)
+        if upload_date.tzinfo is None:
+            upload_date = upload_date.replace(tzinfo=timezone.utc)
+        metadata = _md5_metadata(data, metadata)
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(file_id),
+            Body=data,
+            ContentType=content_type or "application/octet-stream",
+            # S3 user metadata must be ASCII
+            Metadata={
+                "md5": metadata["md5"],
+                "filename": quote(filename or ""),
+                "upload-date": upload_date.isoformat(),
+            },
+        )
+        return file_id
+
+    def get(self, file_id):
+        file_id = _to_object_id(file_id)
+        if file_id is None:
+            return None
+        key = self._key(file_id)
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        user_metadata = head.get("Metadata", {})
+        upload_date = user_metadata.get("upload-date")
+        return S3Blob(
+            self.client,
+            self.bucket,
+            key,
+            file_id=file_id,
+            filename=unquote(user_metadata.get("filename", "")) or None,
+            content_type=head.get("ContentType"),
+            length=head["ContentLength"],
+            upload_date=(
+                datetime.fromisoformat(upload_date)
+                if upload_date
+                else head.get("LastModified")
+            ),
+            metadata={"md5": user_metadata["md5"]} if "md5" in user_metadata else {},
+        )
+
+    def delete(self, file_id):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(file_id))
+
+    def delete_many(self, file_ids):
+        keys = [{"Key": self._key(file_id)} for file_id in file_ids]
+        # DeleteObjects accepts at most 1000 keys per request
+        for start in range(0, len(keys), 1000):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": keys[start : start + 1000], "Quiet": True},
+            )
+
+    def iter_files(self, uploaded_before=None):
+        """Yield (file_id, length) for blobs uploaded before a cutoff.
+
+        The upload date lives in object metadata, so BlobStorage.copy
+        keeps it. LastModified is never earlier than it: older objects
+        pass without a HEAD, newer ones are checked against the metadata.
+        """
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                file_id = _to_object_id(item["Key"][len(self.prefix) :])
+                if file_id is None:
+                    continue
+                if uploaded_before is None or item["LastModified"] < uploaded_before:
+                    yield file_id, item["Size"]
+                    continue
+                blob = self.get(file_id)
+                if blob is not None and blob.upload_date < uploaded_before:
+                    yield file_id, item["Size"]
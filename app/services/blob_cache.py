@@ -0,0 +1,313 @@
+"""Per-node read-through disk cache for hot blobs.
+
+Blobs never change under a given id, so a cached copy is valid forever and
+only needs evicting for space. Each cached blob is a data file plus a JSON
+sidecar holding the attributes send_stored_file needs, so a hit doesn't
+touch the storage backend at all. A miss only reads backend metadata; the
+bytes are copied in when a body is first read, so revalidations answered
+with a 304 never fill the cache.
+
+The LRU index lives in process memory and is rebuilt from the directory on
+start. Several workers may share one directory: writes are atomic renames,
+and a file evicted by another worker is simply treated as a miss.
+"""
+
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from app.services.blob_backends import content_type_of
+
+COPY_CHUNK_SIZE = 256 * 1024
+
+
+class CachedBlob:
+    """A cached blob, read through a memory map and sent with sendfile when possible."""
+
+    chunk_size = None
+
+    def __init__(self, cache, file_id, handle, info):
+        self._cache = cache
+        self._id = file_id
+        self.filename = info.get("filename")
+        self.content_type = info.get("contentType")
+        self.length = info["length"]
+        self.upload_date = (
+            datetime.fromisoformat(info["uploadDate"])
+            if info.get("uploadDate")
+            else None
+        )
+        self.metadata = info.get("metadata") or {}
+        self._position = 0
+        # Opened at lookup, so a later eviction can't pull the file away
+        self._handle = handle
+        self._map = None
+
+    def _mapped(self):
+        if self._map is None:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def seek(self, position, whence=0):
+        if whence == 1:
+            position += self._position
+        elif whence == 2:
+            position += self.length
+        self._position = max(0, position)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        if self._position >= self.length:
+            return b""
+        stop = self.length if size is None or size < 0 else self._position + size
+        stop = min(stop, self.length)
+        data = self._mapped()[self._position : stop]
+        self._position = stop
+        self._cache.record_served(len(data))
+        return data
+
+    def open_for_sendfile(self):
+        """Hand the open cached file to the WSGI server for sendfile()."""
+        self._cache.record_served(self.length)
+        return self._handle
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._handle.close()
+
+
+class PendingBlob:
+    """A cache miss: backend metadata now, the bytes cached on first read.
+
+    send_stored_file answers a matching If-None-Match from the metadata
+    alone, so only responses that send a body copy the blob to disk.
+    """
+
+    def __init__(self, cache, blob):
+        self._cache = cache
+        self._blob = blob
+        self._body = None
+        self._id = blob._id
+        self.filename = blob.filename
+        self.content_type = content_type_of(blob)
+        self.length = blob.length
+        self.upload_date = blob.upload_date
+        self.metadata = blob.metadata or {}
+        self.chunk_size = getattr(blob, "chunk_size", None)
+
+    def _source(self):
+        if self._body is None:
+            self._body = self._cache._fill(self._id, self._blob)
+        return self._body
+
+    def seek(self, position, whence=0):
+        return self._source().seek(position, whence)
+
+    def tell(self):
+        return self._source().tell()
+
+    def read(self, size=-1):
+        return self._source().read(size)
+
+    def open_for_sendfile(self):
+        """The cached file, or None when the blob is streamed from the backend."""
+        open_for_sendfile = getattr(self._source(), "open_for_sendfile", None)
+        return open_for_sendfile() if open_for_sendfile else None
+
+    def close(self):
+        for blob in (self._body, self._blob):
+            close = getattr(blob, "close", None)
+            if close is not None:
+                close()
+
+
+class DiskBlobCache:
+    """Byte-budgeted LRU cache of blobs in a local directory."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # One lock per file id being fetched, so concurrent misses share a fetch
+        self._inflight = {}
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "fetches": 0,
+            "bytes_served_from_cache": 0,
+        }
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _paths(self, file_id):
+        key = str(file_id)
+        return (
+            os.path.join(self.directory, key),
+            os.path.join(self.directory, f"{key}.json"),
+        )
+
+    def _load_index(self):
+        """Rebuild the LRU order from disk, least recently modified first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            data_path = os.path.join(self.directory, name[: -len(".json")])
+            try:
+                stat = os.stat(data_path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, name[: -len(".json")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used blobs until the cache fits its budget (lock held)."""
+        while self._size > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            self._counters["evictions"] += 1
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _lookup(self, file_id):
+        key = str(file_id)
+        data_path, info_path = self._paths(key)
+        try:
+            with open(info_path, "rb") as handle:
+                info = json.load(handle)
+            data = open(data_path, "rb")
+        except (FileNotFoundError, ValueError):
+            # Not cached, half written, or evicted since the index lookup
+            return None
+        with self._lock:
+            if key not in self._index:
+                # Written by another worker sharing the directory
+                self._index[key] = info["length"]
+                self._size += info["length"]
+            self._index.move_to_end(key)
+        return CachedBlob(self, file_id, data, info)
+
+    def _store(self, file_id, blob):
+        """Copy a backend blob into the cache; returns False if it can't fit."""
+        if blob.length > self.max_bytes:
+            return False
+        data_path, info_path = self._paths(file_id)
+        tmp_path = f"{data_path}.{threading.get_ident()}.tmp"
+        blob.seek(0)
+        with open(tmp_path, "wb") as handle:
+            while True:
+                data = blob.read(COPY_CHUNK_SIZE)
+                if not data:
+                    break
+                handle.write(data)
+        os.replace(tmp_path, data_path)
+
+        upload_date = blob.upload_date
+        info = {
+            "filename": blob.filename,
+            "contentType": content_type_of(blob),
+            "length": blob.length,
+            "uploadDate": upload_date.isoformat() if upload_date else None,
+            "metadata": dict(blob.metadata or {}),
+        }
+        # The sidecar is written last and marks the entry complete
+        tmp_info = f"{info_path}.{threading.get_ident()}.tmp"
+        with open(tmp_info, "w") as handle:
+            json.dump(info, handle)
+        os.replace(tmp_info, info_path)
+
+        with self._lock:
+            key = str(file_id)
+            self._size -= self._index.pop(key, 0)
+            self._index[key] = blob.length
+            self._size += blob.length
+            self._evict()
+        return True
+
+    def get(self, file_id, fetch):
+        """Return a cached blob, or wrap fetch(file_id) to cache it on first read."""
+        cached = self._lookup(file_id)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        self._count("misses")
+        blob = fetch(file_id)
+        if blob is None:
+            return None
+        return PendingBlob(self, blob)
+
+    def _fill(self, file_id, blob):
+        """Copy a fetched blob into the cache and return a readable copy.
+
+        Only one caller per file id copies at a time; others wait for it and
+        then read the freshly cached copy. Falls back to the backend blob
+        when it doesn't fit or has already been evicted again.
+        """
+        key = str(file_id)
+        with self._lock:
+            inflight = self._inflight.setdefault(key, threading.Lock())
+        with inflight:
+            try:
+                cached = self._lookup(file_id)
+                if cached is None:
+                    self._count("fetches")
+                    if self._store(file_id, blob):
+                        cached = self._lookup(file_id)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        if cached is None:
+            blob.seek(0)
+            return blob
+        return cached
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def record_served(self, nbytes):
+        self._count("bytes_served_from_cache", nbytes)
+
+    def clear(self):
+        """Remove every cached blob and reset the counters."""
+        with self._lock:
+            for key in list(self._index):
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            self._index.clear()
+            self._size = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            lookups = counters["hits"] + counters["misses"]
+            counters.update(
+                entries=len(self._index),
+                size_bytes=self._size,
+                max_bytes=self.max_bytes,
+                hit_ratio=round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            )
+            return counters
@@ -0,0 +1,166 @@
+from flask import current_app
+from app.services.blob_cache import DiskBlobCache
+from app.services.blob_backends import (
+    DEFAULT_INLINE_THRESHOLD,
+    GridFSBackend,
+    LocalBackend,
+    S3Backend,
+    content_type_of,
+)
+
+BACKENDS = ("gridfs", "local", "s3")
+
+
+def create_backend(name, config):
+    """Build a blob storage backend from app config.
+
+    Args:
+        name: One of BACKENDS
+        config: Mapping with BLOB_INLINE_THRESHOLD, BLOB_STORAGE_PATH and the
+            S3_* settings used by the chosen backend
+
+    Raises:
+        ValueError: If the backend name is unknown or its settings are missing
+    """
+    if name == "gridfs":
+        return GridFSBackend(
+            inline_threshold=config.get(
+                "BLOB_INLINE_THRESHOLD", DEFAULT_INLINE_THRESHOLD
+            )
+        )
+    if name == "local":
+        root = config.get("BLOB_STORAGE_PATH")
+        if not root:
+            raise ValueError("BLOB_STORAGE_PATH must be set for the local backend")
+        return LocalBackend(root)
+    if name == "s3":
+        bucket = config.get("S3_BUCKET")
+        if not bucket:
+            raise ValueError("S3_BUCKET must be set for the s3 backend")
+        return S3Backend(
+            bucket,
+            prefix=config.get("S3_PREFIX", ""),
+            endpoint_url=config.get("S3_ENDPOINT_URL"),
+            region_name=config.get("S3_REGION"),
+        )
+    raise ValueError(f"Unknown blob storage backend: {name}")
+
+
+class BlobStorage:
+    """Entry point for storing and reading PDF and LaTeX bytes.
+
+    The backend is chosen by BLOB_STORAGE_BACKEND (gridfs, local or s3) and
+    built once per app. Callers only deal with file ids and the file objects
+    returned by get().
+    """
+
+    @staticmethod
+    def backend():
+        backend = current_app.extensions.get("blob_storage")
+        if backend is None:
+            backend = create_backend(
+                current_app.config.get("BLOB_STORAGE_BACKEND", "gridfs"),
+                current_app.config,
+            )
+            current_app.extensions["blob_storage"] = backend
+        return backend
+
+    @staticmethod
+    def cache():
+        """The node-local disk cache, or None when BLOB_CACHE_DIR is unset."""
+        if "blob_cache" not in current_app.extensions:
+            directory = current_app.config.get("BLOB_CACHE_DIR")
+            current_app.extensions["blob_cache"] = (
+                DiskBlobCache(
+                    directory, current_app.config.get("BLOB_CACHE_MAX_BYTES", 0)
+                )
+                if directory
+                else None
+            )
+        return current_app.extensions["blob_cache"]
+
+    @staticmethod
+    def put(data, filename, content_type):
+        """Store bytes and return their id, recording an md5 used for HTTP validators."""
+        return BlobStorage.backend().put(data, filename, content_type)
+
+    @staticmethod
+    def get(file_id):
+        """Return a readable file object for file_id, or None if it doesn't exist."""
+        if not file_id:
+            return None
+        return BlobStorage.backend().get(file_id)
+
+    @staticmethod
+    def get_cached(file_id):
+        """Like get(), but read through the disk cache for frequently served blobs.
+
+        A miss costs only the backend metadata lookup until the body is read,
+        so conditional requests answered with a 304 leave the cache alone.
+        """
+        if not file_id:
+            return None
+        cache = BlobStorage.cache()
+        if cache is None:
+            return BlobStorage.get(file_id)
+        return cache.get(file_id, BlobStorage.get)
+
+    @staticmethod
+    def delete(file_id):
+        """Remove a blob from the configured backend."""
+        BlobStorage.backend().delete(file_id)
+
+    @staticmethod
+    def migrate_small_files(
+        threshold=None, batch_size=100, batch_pause=0.0, dry_run=False
+    ):
+        """Move small GridFS files into the inline tier (see GridFSBackend)."""
+        return create_backend("gridfs", current_app.config).migrate_small_files(
+            threshold=threshold,
+            batch_size=batch_size,
+            batch_pause=batch_pause,
+            dry_run=dry_run,
+        )
+
+    @staticmethod
+    def copy(source, destination, delete_source=False, dry_run=False):
+        """Copy every blob from one backend to another, keeping ids.
+
+        Blobs already present in the destination are skipped, so an
+        interrupted copy can be rerun. Switch BLOB_STORAGE_BACKEND only after
+        a copy completes; with delete_source the source copy is removed once
+        the destination holds the blob.
+
+        Returns:
+            dict: Counts of copied and skipped files and bytes copied
+        """
+        report = {
+            "dry_run": dry_run,
+            "copied_files": 0,
+            "skipped_files": 0,
+            "copied_bytes": 0,
+        }
+
+        for file_id, length in list(source.iter_files()):
+            if destination.get(file_id) is not None:
+                report["skipped_files"] += 1
+            else:
+                if not dry_run:
+                    blob = source.get(file_id)
+                    if blob is None:
+                        continue
+                    destination.put(
+                        blob.read(),
+                        blob.filename,
+                        content_type_of(blob),
+                        file_id=file_id,
+                        upload_date=blob.upload_date,
+                        metadata=blob.metadata,
+                    )
+                report["copied_files"] += 1
+                report["copied_bytes"] += length
+
+            if delete_source and not dry_run:
+                source.delete(file_id)
+
+        return report
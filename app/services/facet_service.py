@@ -0,0 +1,259 @@
+import re
+from pymongo import ASCENDING, DESCENDING
+from bson import ObjectId, errors as bson_errors
+from app.extensions import mongo
+from app.services.feed_cache import FeedCache
+
+FACET_COUNTS_COLLECTION = "facet_counts"
+
+# Facets extracted from structured_data, in the order the feed shows them
+STRUCTURED_FACETS = ("skill", "role", "company", "school", "location")
+# "none" until the first reviewer leaves a highlight, then "some"
+REVIEWS_FACET = "reviews"
+FACETS = STRUCTURED_FACETS + (REVIEWS_FACET,)
+
+SKILL_SEPARATORS = re.compile(r"[,;|/\n]")
+MAX_VALUE_LENGTH = 60
+
+
+def _label(text):
+    return " ".join(str(text or "").split()).strip(" .-")
+
+
+def normalize_facet_value(text):
+    """Canonical form used for storage and filtering (case- and spacing-insensitive)."""
+    return _label(text).casefold()
+
+
+def _collect(values, text):
+    label = _label(text)
+    value = label.casefold()
+    if value and len(value) <= MAX_VALUE_LENGTH:
+        values.setdefault(value, label)
+
+
+def _items(structured_data, key):
+    value = structured_data.get(key)
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+
+def extract_facets(structured_data):
+    """Normalised facet values of a resume.
+
+    Returns:
+        dict: {facet: {normalised value: display label}} for STRUCTURED_FACETS
+    """
+    facets = {facet: {} for facet in STRUCTURED_FACETS}
+    if not isinstance(structured_data, dict):
+        return facets
+
+    for item in _items(structured_data, "skills"):
+        for skill in SKILL_SEPARATORS.split(str(item.get("skills") or "")):
+            _collect(facets["skill"], skill)
+    for item in _items(structured_data, "experience"):
+        _collect(facets["role"], item.get("role"))
+        _collect(facets["company"], item.get("company"))
+        _collect(facets["location"], item.get("location"))
+    for item in _items(structured_data, "education"):
+        _collect(facets["school"], item.get("institution"))
+        _collect(facets["location"], item.get("location"))
+    return facets
+
+
+def facet_fields(extracted):
+    """The resume document's facets.<name> arrays for extract_facets() output."""
+    return {f"facets.{facet}": sorted(values) for facet, values in extracted.items()}
+
+
+class FacetService:
+    """Facet values stored on resumes plus a rollup of how many resumes have each.
+
+    Resumes carry facets.<name> arrays of normalised values (indexed for
+    filtering). facet_counts holds one document per (facet, value) with a
+    count that every resume write adjusts by $inc, so the feed never has to
+    aggregate over resumes to show counts.
+    """
+
+    @staticmethod
+    def ensure_indexes():
+        for facet in FACETS:
+            mongo.db.resumes.create_index(f"facets.{facet}")
+        mongo.db[FACET_COUNTS_COLLECTION].create_index(
+            [("facet", ASCENDING), ("count", DESCENDING)]
+        )
+
+    @staticmethod
+    def apply_delta(old, new, labels=None):
+        """Adjust facet_counts for a resume whose facets changed from old to new.
+
+        Costs a fixed number of round trips however many values changed, plus
+        one upsert per value never seen before. Runs after the resume write
+        rather than inside its transaction: the rollup is derived data and
+        rebuild() can always recompute it.
+
+        Args:
+            old: {facet: iterable of values} before the write ({} for an insert)
+            new: {facet: iterable of values} after the write
+            labels: Optional {facet: {value: label}} for newly seen values
+        """
+        labels = labels or {}
+        added, removed = {}, []
+        for facet in set(old) | set(new):
+            before = set(old.get(facet) or ())
+            after = set(new.get(facet) or ())
+            for value in after - before:
+                added[f"{facet}:{value}"] = (facet, value)
+            removed.extend(f"{facet}:{value}" for value in before - after)
+
+        collection = mongo.db[FACET_COUNTS_COLLECTION]
+        if removed:
+            collection.update_many({"_id": {"$in": removed}}, {"$inc": {"count": -1}})
+        if not added:
+            return
+
+        existing = [
+            doc["_id"]
+            for doc in collection.find({"_id": {"$in": list(added)}}, {"_id": 1})
+        ]
+        if existing:
+            collection.update_many({"_id": {"$in": existing}}, {"$inc": {"count": 1}})
+        for key in set(added) - set(existing):
+            facet, value = added[key]
+            # Upsert so a writer racing us to create the counter still counts
+            collection.update_one(
+                {"_id": key},
+                {
+                    "$inc": {"count": 1},
+                    "$setOnInsert": {
+                        "facet": facet,
+                        "value": value,
+                        "label": labels.get(facet, {}).get(value, value),
+                    },
+                },
+                upsert=True,
+            )
+
+    @staticmethod
+    def mark_reviewed(resume_id):
+        """Move a resume from reviews=none to reviews=some on its first review."""
+        try:
+            object_id = ObjectId(resume_id)
+        except (bson_errors.InvalidId, TypeError):
+            return
+        result = mongo.db.resumes.update_one(
+            {"_id": object_id, f"facets.{REVIEWS_FACET}": "none"},
+            {"$set": {f"facets.{REVIEWS_FACET}": ["some"]}},
+        )
+        if result.modified_count:
+            FacetService.apply_delta(
+                {REVIEWS_FACET: ["none"]}, {REVIEWS_FACET: ["some"]}
+            )
+            # Feed pages filtered on reviews=none no longer include it
+            FeedCache.bump()
+
+    @staticmethod
+    def build_filter(selected):
+        """Mongo filter for {facet: [normalised values]}; every value must match."""
+        return {
+            f"facets.{facet}": {"$all": values}
+            for facet, values in selected.items()
+            if facet in FACETS and values
+        }
+
+    @staticmethod
+    def max_matches(selected):
+        """Upper bound, from the rollup, on resumes matching build_filter(selected).
+
+        Every selected value must match, so no more resumes match than carry
+        the rarest of them. The rollup may lag, so treat this as an estimate.
+
+        Returns:
+            int or None: The bound, or None when nothing is selected
+        """
+        keys = [
+            f"{facet}:{value}"
+            for facet, values in selected.items()
+            if facet in FACETS
+            for value in values
+        ]
+        if not keys:
+            return None
+        counts = {
+            doc["_id"]: doc.get("count", 0)
+            for doc in mongo.db[FACET_COUNTS_COLLECTION].find(
+                {"_id": {"$in": keys}}, {"count": 1}
+            )
+        }
+        return max(0, min(counts.get(key, 0) for key in keys))
+
+    @staticmethod
+    def top_values(limit=10):
+        """The most common values per facet from the rollup.
+
+        Returns:
+            dict: {facet: [{"value", "label", "count"}, ...]}
+        """
+        counts = {}
+        for facet in FACETS:
+            cursor = (
+                mongo.db[FACET_COUNTS_COLLECTION]
+                .find({"facet": facet, "count": {"$gt": 0}})
+                .sort("count", DESCENDING)
+                .limit(limit)
+            )
+            counts[facet] = [
+                {"value": d["value"], "label": d.get("label"), "count": d["count"]}
+                for d in cursor
+            ]
+        return counts
+
+    @staticmethod
+    def rebuild():
+        """Recompute every resume's facets and the whole rollup from scratch.
+
+        Used to backfill resumes written before facets existed.
+
+        Returns:
+            dict: Number of resumes processed and facet values counted
+        """
+        reviewed = set(
+            mongo.db.highlights.distinct(
+                "document_id", {"highlights": {"$nin": [{}, None]}}
+            )
+        )
+        totals = {}
+        labels = {}
+        resumes = 0
+        for doc in mongo.db.resumes.find({}, {"structured_data": 1}):
+            extracted = extract_facets(doc.get("structured_data"))
+            review_state = "some" if str(doc["_id"]) in reviewed else "none"
+            extracted[REVIEWS_FACET] = {review_state: review_state}
+            mongo.db.resumes.update_one(
+                {"_id": doc["_id"]}, {"$set": facet_fields(extracted)}
+            )
+            for facet, values in extracted.items():
+                for value, label in values.items():
+                    key = (facet, value)
+                    totals[key] = totals.get(key, 0) + 1
+                    labels.setdefault(key, label)
+            resumes += 1
+
+        collection = mongo.db[FACET_COUNTS_COLLECTION]
+        collection.delete_many({})
+        if totals:
+            collection.insert_many(
+                [
+                    {
+                        "_id": f"{facet}:{value}",
+                        "facet": facet,
+                        "value": value,
+                        "label": labels[(facet, value)],
+                        "count": count,
+                    }
+                    for (facet, value), count in totals.items()
+                ]
+            )
+        FeedCache.bump()
+        return {"resumes": resumes, "values": len(totals)}
@@ -0,0 +1,154 @@
+import threading
+import time
+from app.extensions import mongo
+from app.utils.ttl_cache import TTLCache
+
+FEED_STATE_COLLECTION = "feed_state"
+GENERATION_ID = "generation"
+
+DEFAULT_FEED_CACHE_SIZE = 256
+DEFAULT_FEED_CACHE_TTL = 300
+DEFAULT_GENERATION_POLL = 1.0
+
+# Rendered feed pages, keyed by normalised query, filters, page and page size
+_feed_cache = TTLCache(maxsize=DEFAULT_FEED_CACHE_SIZE, ttl=DEFAULT_FEED_CACHE_TTL)
+
+_state = {
+    # Bumped by writes in this worker, so they show up here immediately
+    "local": 0,
+    # Last value read from feed_state, bumped by writes in any worker
+    "shared": None,
+    "polled_at": 0.0,
+    "poll_interval": DEFAULT_GENERATION_POLL,
+    "stale": 0,
+    "hit_age_total": 0.0,
+    "hit_age_max": 0.0,
+}
+_state_lock = threading.Lock()
+
+
+def normalize_query(query):
+    """Lowercase and collapse whitespace, keeping a trailing space.
+
+    Search treats a trailing space as "no prefix match on the last word".
+    """
+    normalized = " ".join((query or "").lower().split())
+    if normalized and query.endswith(" "):
+        normalized += " "
+    return normalized
+
+
+class FeedCache:
+    """Per-process cache of feed results invalidated by a generation counter.
+
+    Every resume write bumps the generation (in this worker and in the
+    feed_state collection that other workers poll). Entries remember the
+    generation they were built under and are dropped when it moves on, so
+    invalidation never scans the cache. The TTL is only a backstop.
+    """
+
+    @staticmethod
+    def configure(maxsize=None, ttl=None, poll_interval=None):
+        """Resize the cache (0 disables it); clears entries and counters."""
+        _feed_cache.configure(maxsize=maxsize, ttl=ttl)
+        with _state_lock:
+            if poll_interval is not None:
+                _state["poll_interval"] = poll_interval
+            _state.update(
+                shared=None, polled_at=0.0, stale=0, hit_age_total=0.0, hit_age_max=0.0
+            )
+
+    @staticmethod
+    def key(query, filters, page, per_page):
+        """Cache key for one feed page.
+
+        filters is {facet: [values]}; page is a page number or any hashable
+        cursor.
+        """
+        normalized_filters = tuple(
+            (name, tuple(sorted(values))) for name, values in sorted(filters.items())
+        )
+        return (normalize_query(query), normalized_filters, page, per_page)
+
+    @staticmethod
+    def generation():
+        """The current (shared, local) generation pair.
+
+        The shared counter is re-read at most once per poll interval.
+        """
+        now = time.monotonic()
+        with _state_lock:
+            fresh = (
+                _state["shared"] is not None
+                and now - _state["polled_at"] < _state["poll_interval"]
+            )
+            if fresh:
+                return (_state["shared"], _state["local"])
+
+        doc = mongo.db[FEED_STATE_COLLECTION].find_one({"_id": GENERATION_ID})
+        shared = doc.get("value", 0) if doc else 0
+        with _state_lock:
+            _state["shared"] = shared
+            _state["polled_at"] = now
+            return (shared, _state["local"])
+
+    @staticmethod
+    def bump():
+        """Invalidate every cached feed page after a resume was written."""
+        with _state_lock:
+            _state["local"] += 1
+        mongo.db[FEED_STATE_COLLECTION].update_one(
+            {"_id": GENERATION_ID}, {"$inc": {"value": 1}}, upsert=True
+        )
+
+    @staticmethod
+    def get(key):
+        """Return the cached value for key if it was built under the current generation."""
+        entry = _feed_cache.get(key)
+        if entry is None:
+            return None
+        generation, built_at, value = entry
+        if generation != FeedCache.generation():
+            _feed_cache.pop(key)
+            with _state_lock:
+                _state["stale"] += 1
+            return None
+        age = time.monotonic() - built_at
+        with _state_lock:
+            _state["hit_age_total"] += age
+            _state["hit_age_max"] = max(_state["hit_age_max"], age)
+        return value
+
+    @staticmethod
+    def get_or_build(key, build):
+        """Cached value for key, calling build() to fill it on a miss."""
+        value = FeedCache.get(key)
+        if value is None:
+            # Read the generation before building so a concurrent write isn't masked
+            generation = FeedCache.generation()
+            value = build()
+            _feed_cache.set(key, (generation, time.monotonic(), value))
+        return value
+
+    @staticmethod
+    def stats():
+        """Hit/miss counters plus how old served entries were, for the metrics endpoint.
+
+        Entries dropped for being from an old generation count as misses.
+        """
+        stats = _feed_cache.stats()
+        with _state_lock:
+            stale = _state["stale"]
+            hits = stats["hits"] - stale
+            misses = stats["misses"] + stale
+            stats.update(
+                hits=hits,
+                misses=misses,
+                stale=stale,
+                hit_rate=round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                generation=_state["local"],
+                shared_generation=_state["shared"],
+                mean_hit_age=round(_state["hit_age_total"] / hits, 3) if hits else 0.0,
+                max_hit_age=round(_state["hit_age_max"], 3),
+            )
+        return stats
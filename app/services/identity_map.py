@@ -0,0 +1,93 @@
+"""Request-scoped identity map for documents fetched by _id.
+
+Within one request the same resume or user is often read several times (the
+user loader, an ownership check, the page itself). Reads made through
+fetch_one are remembered in flask.g, keyed by collection and id, and served
+from there for the rest of the request. Writes must call invalidate so a
+later read in the same request sees the new state.
+
+Outside a request context (CLI commands, background work, service-level
+tests) every call goes straight to MongoDB.
+"""
+
+from flask import current_app, g, has_request_context
+from app.extensions import mongo
+
+
+def _entries():
+    if not has_request_context():
+        return None
+    if "identity_map" not in g:
+        g.identity_map = {}
+        g.identity_map_stats = {"hits": 0, "misses": 0}
+    return g.identity_map
+
+
+def _projected_fields(projection):
+    """Fields a projection asks for, or None when it asks for the whole document."""
+    if not projection:
+        return None
+    return frozenset(field for field, include in projection.items() if include)
+
+
+def fetch_one(collection_name, doc_id, projection=None):
+    """find_one({"_id": doc_id}) through the request's identity map.
+
+    A cached entry satisfies the read when it holds the whole document or at
+    least every field the projection asks for. Partial entries are widened
+    with each new projection, so a request never refetches a field it has.
+    """
+    entries = _entries()
+    if entries is None:
+        return mongo.db[collection_name].find_one({"_id": doc_id}, projection)
+
+    key = (collection_name, doc_id)
+    wanted = _projected_fields(projection)
+    entry = entries.get(key)
+    if entry is not None:
+        fields, doc = entry
+        if doc is None or fields is None or (wanted is not None and wanted <= fields):
+            g.identity_map_stats["hits"] += 1
+            return dict(doc) if doc is not None else None
+
+    g.identity_map_stats["misses"] += 1
+    doc = mongo.db[collection_name].find_one({"_id": doc_id}, projection)
+    if doc is not None and entry is not None and entry[1] is not None:
+        # Merge with what we already had instead of dropping it
+        fields = None if wanted is None or entry[0] is None else entry[0] | wanted
+        doc = {**entry[1], **doc}
+    else:
+        fields = wanted
+    entries[key] = (fields, doc)
+    return dict(doc) if doc is not None else None
+
+
+def invalidate(collection_name, doc_id):
+    """Forget a cached document after it has been written."""
+    entries = _entries()
+    if entries is not None:
+        entries.pop((collection_name, doc_id), None)
+
+
+def stats():
+    """Hit/miss counters for the current request (zeros outside a request)."""
+    if not has_request_context() or "identity_map_stats" not in g:
+        return {"hits": 0, "misses": 0}
+    return dict(g.identity_map_stats)
+
+
+def init_app(app):
+    """In debug mode, report how many queries the identity map avoided per request."""
+
+    @app.after_request
+    def report_identity_map_stats(response):
+        if current_app.debug:
+            counters = stats()
+            response.headers["X-Identity-Map"] = (
+                f"hits={counters['hits']}; misses={counters['misses']}"
+            )
+            if counters["hits"]:
+                current_app.logger.debug(
+                    "Identity map avoided %d queries", counters["hits"]
+                )
+        return response
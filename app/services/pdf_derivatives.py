@@ -0,0 +1,193 @@
+import abc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId, errors as bson_errors
+from flask import current_app
+from app.extensions import mongo
+from app.services import identity_map
+from app.services.blob_storage import BlobStorage
+
+# Derivatives shell out to pdftoppm or parse the PDF, so a couple of workers is plenty
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-derivatives")
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+class PdfDerivative(abc.ABC):
+    """Base for files built from a resume's PDF once per PDF version.
+
+    A derivative is stored in blob storage and recorded on the resume together
+    with the file_id it was built from (SOURCE_FIELD). It is current only while
+    that still matches the resume's file_id, so a new upload or compile makes
+    the old one stale (and later garbage) automatically. A failed build records
+    the file_id in ERROR_FIELD instead, so a broken PDF is not rebuilt on
+    every view. Derivatives with a versioned format also set VERSION_FIELD
+    and VERSION, and ones built by an older version are rebuilt.
+
+    Subclasses set the field names and implement build().
+    """
+
+    FILE_FIELD = None
+    SOURCE_FIELD = None
+    ERROR_FIELD = None
+    VERSION_FIELD = None
+    VERSION = None
+    CONTENT_TYPE = None
+    EXTENSION = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Derivatives are used as classes and never instantiated, so ABCMeta
+        # alone would not catch a missing build()
+        if getattr(cls.build, "__isabstractmethod__", False):
+            raise TypeError(f"{cls.__name__} must implement build()")
+
+    @classmethod
+    def projection(cls):
+        fields = (
+            "file_id",
+            cls.FILE_FIELD,
+            cls.SOURCE_FIELD,
+            cls.ERROR_FIELD,
+            cls.VERSION_FIELD,
+        )
+        return {field: 1 for field in fields if field}
+
+    @classmethod
+    @abc.abstractmethod
+    def build(cls, resume_id, pdf_bytes):
+        """Return (data, success, error) for the given PDF bytes."""
+
+    @classmethod
+    def is_current(cls, doc):
+        return bool(
+            doc
+            and doc.get(cls.FILE_FIELD)
+            and doc.get("file_id")
+            and doc.get(cls.SOURCE_FIELD) == doc.get("file_id")
+            and (cls.VERSION_FIELD is None or doc.get(cls.VERSION_FIELD) == cls.VERSION)
+        )
+
+    @classmethod
+    def has_failed(cls, doc):
+        """True if building from the resume's current PDF already failed."""
+        return bool(
+            doc and doc.get("file_id") and doc.get(cls.ERROR_FIELD) == doc["file_id"]
+        )
+
+    @classmethod
+    def generate(cls, resume_id):
+        """Build and store the derivative for a resume's current PDF.
+
+        Returns:
+            dict: Resume fields with the (possibly existing) derivative, or None
+            if the resume has no PDF or building it failed (now or before)
+        """
+        try:
+            object_id = ObjectId(resume_id)
+        except (bson_errors.InvalidId, TypeError):
+            return None
+        doc = mongo.db.resumes.find_one({"_id": object_id}, cls.projection())
+        if not doc or not doc.get("file_id"):
+            return None
+        if cls.is_current(doc):
+            return doc
+        if cls.has_failed(doc):
+            return None
+
+        source_id = doc["file_id"]
+        pdf_file = BlobStorage.get(source_id)
+        if pdf_file is None:
+            return None
+
+        data, success, error = cls.build(resume_id, pdf_file.read())
+        if not success:
+            current_app.logger.warning(
+                f"Could not build {cls.EXTENSION} for resume {resume_id}: {error}"
+            )
+            mongo.db.resumes.update_one(
+                {"_id": object_id, "file_id": source_id},
+                {"$set": {cls.ERROR_FIELD: source_id}},
+            )
+            identity_map.invalidate("resumes", object_id)
+            return None
+
+        derivative_id = BlobStorage.put(
+            data,
+            filename=f"resume_{resume_id}.{cls.EXTENSION}",
+            content_type=cls.CONTENT_TYPE,
+        )
+        fields = {cls.FILE_FIELD: derivative_id, cls.SOURCE_FIELD: source_id}
+        if cls.VERSION_FIELD:
+            fields[cls.VERSION_FIELD] = cls.VERSION
+        # Only record it if the PDF didn't change while we were building
+        mongo.db.resumes.update_one(
+            {"_id": object_id, "file_id": source_id}, {"$set": fields}
+        )
+        identity_map.invalidate("resumes", object_id)
+        return {**doc, **fields}
+
+    @classmethod
+    def get_current(cls, resume_id):
+        """Return (resume fields, stored file) for a resume, or (None, None).
+
+        A missing derivative (e.g. for resumes created before it existed) is
+        queued with schedule() rather than built in the request, so callers
+        answer 404 until the background build has stored it.
+        """
+        try:
+            object_id = ObjectId(resume_id)
+        except (bson_errors.InvalidId, TypeError):
+            return None, None
+        doc = identity_map.fetch_one("resumes", object_id, cls.projection())
+        if not cls.is_current(doc):
+            if not doc or not doc.get("file_id") or cls.has_failed(doc):
+                return None, None
+            PdfDerivative.schedule(resume_id, (cls,))
+            # Already there if PDF_DERIVATIVES is "sync"
+            doc = identity_map.fetch_one("resumes", object_id, cls.projection())
+            if not cls.is_current(doc):
+                return None, None
+        return doc, BlobStorage.get_cached(doc[cls.FILE_FIELD])
+
+    @staticmethod
+    def schedule(resume_id, derivatives):
+        """Build a resume's derivatives in the background after its PDF changed.
+
+        PDF_DERIVATIVES selects "async" (default), "sync" or "off".
+        Duplicate requests for a resume already queued are dropped.
+        """
+        mode = current_app.config.get("PDF_DERIVATIVES", "async")
+        if mode == "off" or not resume_id:
+            return
+        if mode == "sync":
+            PdfDerivative.generate_all(resume_id, derivatives)
+            return
+
+        key = str(resume_id)
+        with _pending_lock:
+            if key in _pending:
+                return
+            _pending.add(key)
+        _executor.submit(
+            PdfDerivative._run_in_background,
+            current_app._get_current_object(),
+            key,
+            derivatives,
+        )
+
+    @staticmethod
+    def generate_all(resume_id, derivatives):
+        for derivative in derivatives:
+            derivative.generate(resume_id)
+
+    @staticmethod
+    def _run_in_background(app, resume_id, derivatives):
+        try:
+            with app.app_context():
+                PdfDerivative.generate_all(resume_id, derivatives)
+        except Exception:
+            app.logger.exception(f"PDF derivative job failed for resume {resume_id}")
+        finally:
+            with _pending_lock:
+                _pending.discard(resume_id)
@@ -1,7 +1,86 @@
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from bson import ObjectId, errors as bson_errors
-from gridfs import GridFS
+from flask import current_app
+from pymongo import ReturnDocument
 from app.extensions import mongo
+from app.services import identity_map
+from app.services.blob_storage import BlobStorage
+from app.services.feed_cache import FeedCache
+from app.services.facet_service import (
+    FacetService,
+    REVIEWS_FACET,
+    STRUCTURED_FACETS,
+    extract_facets,
+    facet_fields,
+)
+from app.services.pdf_derivatives import PdfDerivative
+from app.services.review_events import ReviewEvents
+from app.services.review_stats_service import (
+    PENDING_VERSION,
+    ReviewStatsService,
+    page_counts,
+    page_deltas,
+)
+from app.services.search_service import SearchService, INDEXED_FIELDS
+from app.services.similarity_service import SimilarityService
+from app.services.suggest_service import SuggestService
+from app.services.text_layer_service import TextLayerService
+from app.services.thumbnail_service import ThumbnailService
+from app.services.user_service import UserService
+from app.utils.pdf_optimizer import optimize_pdf
+
+# Named projections for resume reads. Each read path asks only for the fields
+# it uses, so growing structured_data/preview metadata doesn't inflate lookups.
+OWNERSHIP_PROJECTION = {"user_id": 1}
+LISTING_PROJECTION = {
+    "user_id": 1,
+    "resume_path": 1,
+    "title": 1,
+    "created_at": 1,
+    "file_id": 1,
+    "review_stats": 1,
+    "review_version": 1,
+}
+PDF_POINTER_PROJECTION = {
+    "user_id": 1,
+    "title": 1,
+    "filename": 1,
+    "content_type": 1,
+    "file_id": 1,
+    "template_name": 1,
+    "preview_file_id": 1,
+    "preview_latex_file_id": 1,
+    "preview_template_id": 1,
+    "preview_template_name": 1,
+    "preview_generated_at": 1,
+}
+# Highlight fields a reviewer may change through the patch API
+PATCHABLE_HIGHLIGHT_FIELDS = ("comment", "text", "rects")
+# Review reads skip document_id/timestamps and page in first-highlight order
+REVIEW_PROJECTION = {"_id": 0, "reviewer_id": 1, "reviewer_name": 1, "highlights": 1}
+REVIEW_SORT = [("first_highlight_created_at", 1), ("_id", 1)]
+REVIEWS_PAGE_SIZE = 10
+
+EDIT_PROJECTION = {"user_id": 1, "title": 1, "structured_data": 1}
+# Files built from each new PDF version (feed thumbnail, viewer text layer)
+DERIVATIVE_SERVICES = (ThumbnailService, TextLayerService)
+FEED_CARD_PROJECTION = {
+    "user_id": 1,
+    "title": 1,
+    "filename": 1,
+    "created_at": 1,
+    "file_id": 1,
+    "structured_data.name": 1,
+    "structured_data.professional_summary": 1,
+    "structured_data.skills": 1,
+    "structured_data.experience": 1,
+    "structured_data.education": 1,
+    "review_stats.reviewers": 1,
+    "review_stats.highlights": 1,
+}
+# Top-level resume fields whose changes can alter a feed page
+FEED_FIELDS = {field.split(".")[0] for field in FEED_CARD_PROJECTION}
 
 
 class ResumeService:
@@ -43,6 +122,110 @@ class ResumeService:
                     earliest = ts
         return earliest
 
+    @staticmethod
+    @contextmanager
+    def _write_session():
+        """Yield write kwargs carrying a transaction session when the deployment supports it.
+
+        Multi-document transactions need a replica set or sharded cluster; on a
+        standalone server (or mongomock) writes simply run without a session.
+        """
+        client = getattr(mongo, "cx", None)
+        topology = getattr(client, "topology_description", None)
+        if topology is None or topology.topology_type_name not in (
+            "ReplicaSetWithPrimary",
+            "Sharded",
+        ):
+            yield {}
+            return
+
+        with client.start_session() as session:
+            with session.start_transaction():
+                yield {"session": session}
+
+    @staticmethod
+    def _to_object_id(resume_id):
+        """Convert a resume id to ObjectId; returns None when it isn't valid."""
+        try:
+            return ObjectId(resume_id)
+        except (bson_errors.InvalidId, TypeError):
+            return None
+
+    @staticmethod
+    def find_resume(resume_id, projection):
+        """Fetch a resume document by id, restricted to the given projection."""
+        object_id = ResumeService._to_object_id(resume_id)
+        if object_id is None:
+            return None
+        return identity_map.fetch_one("resumes", object_id, projection)
+
+    @staticmethod
+    def update_resume(resume_id, set_fields=None, unset_fields=None):
+        """Apply a $set/$unset to one resume and drop it from the request's identity map."""
+        object_id = ObjectId(resume_id)
+        # updated_at lets other workers' search indexes catch up on the change
+        update = {
+            "$set": {**(set_fields or {}), "updated_at": datetime.now(timezone.utc)}
+        }
+        if unset_fields:
+            update["$unset"] = {field: "" for field in unset_fields}
+        result = mongo.db.resumes.update_one({"_id": object_id}, update)
+        identity_map.invalidate("resumes", object_id)
+        if set_fields and set_fields.get("file_id"):
+            PdfDerivative.schedule(resume_id, DERIVATIVE_SERVICES)
+        changed = set(set_fields or ()) | set(unset_fields or ())
+        if changed.intersection(INDEXED_FIELDS):
+            SearchService.index_resume(resume_id)
+            SimilarityService.index_resume(resume_id)
+        if changed.intersection(FEED_FIELDS):
+            FeedCache.bump()
+        return bool(result.matched_count)
+
+    @staticmethod
+    def build_pdf_path(resume_id, file_id=None, is_preview=False):
+        """Streaming URL for a resume PDF, versioned by file id when one is known.
+
+        The version lets browsers cache the bytes as immutable: a new compile or
+        upload always gets a new file id, and therefore a new URL.
+        """
+        params = []
+        if is_preview:
+            params.append("mode=preview")
+        if file_id:
+            params.append(f"v={file_id}")
+        query = f"?{'&'.join(params)}" if params else ""
+        return f"/resume/{resume_id}/pdf{query}"
+
+    @staticmethod
+    def build_thumbnail_path(resume_id, file_id=None):
+        """Thumbnail URL, versioned by the PDF file id it is rendered from."""
+        query = f"?v={file_id}" if file_id else ""
+        return f"/resume/{resume_id}/thumbnail.png{query}"
+
+    @staticmethod
+    def build_text_layer_path(resume_id, file_id=None):
+        """Text-layer JSON URL, versioned by the PDF file id it is extracted from."""
+        query = f"?v={file_id}" if file_id else ""
+        return f"/resume/{resume_id}/text-layer.json{query}"
+
+    @staticmethod
+    def store_file(data, filename, content_type):
+        """Store PDF/LaTeX bytes in blob storage and return the new file id.
+
+        PDFs are linearized first (PDF_OPTIMIZE) so viewers can show page 1
+        before the whole file has downloaded.
+        """
+        if content_type == "application/pdf" and current_app.config.get("PDF_OPTIMIZE"):
+            optimized, success, error = optimize_pdf(data)
+            if success:
+                current_app.logger.info(
+                    f"Optimized {filename}: {len(data)} -> {len(optimized)} bytes"
+                )
+                data = optimized
+            else:
+                current_app.logger.debug(f"Storing {filename} as-is: {error}")
+        return BlobStorage.put(data, filename=filename, content_type=content_type)
+
     @staticmethod
     def get_highlights(document_id, reviewer_id=None):
         ResumeService._validate_db()
@@ -51,30 +234,107 @@ class ResumeService:
             query["reviewer_id"] = reviewer_id
 
         doc = mongo.db.highlights.find_one(query)
-        return doc.get("highlights", {}) if doc else {}
+        return ResumeService._assemble_highlights(doc)
+
+    @staticmethod
+    def _assemble_highlights(doc):
+        """Return a highlights document in the {page: [highlight, ...]} shape.
+
+        Deletes through the patch API $pull from page arrays and may leave an
+        empty list behind; readers expect pages without highlights to be absent.
+        """
+        if not doc:
+            return {}
+        highlights = doc.get("highlights") or {}
+        return {page: items for page, items in highlights.items() if items}
+
+    @staticmethod
+    def _review_entry(doc):
+        return {
+            "reviewer_id": doc.get("reviewer_id"),
+            "reviewer_name": doc.get("reviewer_name", "Anonymous"),
+            "highlights": ResumeService._assemble_highlights(doc),
+        }
 
     @staticmethod
     def get_all_reviews(document_id):
         ResumeService._validate_db()
         # returns a list of all review documents for this resume, sorted by first highlight
-        cursor = mongo.db.highlights.find({"document_id": document_id}).sort(
-            "first_highlight_created_at", 1
+        cursor = mongo.db.highlights.find(
+            {"document_id": document_id}, REVIEW_PROJECTION
+        ).sort(REVIEW_SORT)
+        return [ResumeService._review_entry(doc) for doc in cursor]
+
+    @staticmethod
+    def get_reviews_page(document_id, offset=0, limit=REVIEWS_PAGE_SIZE):
+        """One page of a resume's reviews, in the same order as get_all_reviews().
+
+        Returns:
+            tuple: (list of reviews, offset of the next page or None)
+        """
+        ResumeService._validate_db()
+        cursor = (
+            mongo.db.highlights.find({"document_id": document_id}, REVIEW_PROJECTION)
+            .sort(REVIEW_SORT)
+            .skip(offset)
+            .limit(limit + 1)
         )
-        reviews = []
-        for doc in cursor:
-            reviews.append(
-                {
-                    "reviewer_id": doc.get("reviewer_id"),
-                    "reviewer_name": doc.get("reviewer_name", "Anonymous"),
-                    "highlights": doc.get("highlights", {}),
-                }
-            )
-        return reviews
+        docs = list(cursor)
+        next_offset = offset + limit if len(docs) > limit else None
+        return [ResumeService._review_entry(doc) for doc in docs[:limit]], next_offset
+
+    @staticmethod
+    def get_review_changes(document_id, since):
+        """Reviews written after review version since, oldest change first.
+
+        Each entry is a reviewer's whole review (their highlights are
+        replaced as a unit). The resume's version is read before the
+        reviews: every write published by then already has its document in
+        place, stamped above since or still pending, so asking again from
+        that version never misses one. Pending writes may come back twice.
+
+        Returns:
+            tuple: (list of reviews, version to ask from next time)
+        """
+        ResumeService._validate_db()
+        version = ReviewStatsService.current_version(document_id)
+        cursor = mongo.db.highlights.find(
+            {"document_id": document_id, "version": {"$gt": since}},
+            REVIEW_PROJECTION,
+        ).sort("version", 1)
+        return [ResumeService._review_entry(doc) for doc in cursor], version
+
+    @staticmethod
+    def _publish_review_version(document_id, query, token):
+        """Give a landed highlights write its review version and wake listeners.
+
+        The version is taken only after the write, so a listener that sees
+        it can already read the write; the token keeps a newer write on the
+        same document pending until its own version is published.
+        """
+        version = ReviewStatsService.next_version(document_id) or 0
+        mongo.db.highlights.update_one(
+            {**query, "version_token": token},
+            {"$set": {"version": version}, "$unset": {"version_token": ""}},
+        )
+        ReviewEvents.notify()
 
     @staticmethod
     def save_highlights(
         document_id, highlights, reviewer_id=None, reviewer_name="Anonymous"
     ):
+        """Replace one reviewer's highlights on a resume.
+
+        Raises:
+            ValueError: If highlights is not {page number: [highlight, ...]};
+                nothing is written then
+        """
+        # Page keys become field paths in the review counters
+        if not isinstance(highlights, dict):
+            raise ValueError("highlights must map page numbers to highlights")
+        for page in highlights:
+            ResumeService._highlight_page_key(page)
+
         # composite key on document_id AND reviewer_id
         query = {"document_id": document_id}
         if reviewer_id:
@@ -86,37 +346,193 @@ class ResumeService:
         update_data = {
             "highlights": highlights,
             "document_id": document_id,
-            "first_highlight_created_at": earliest,
         }
         if reviewer_id:
             update_data["reviewer_id"] = reviewer_id
         if reviewer_name:
             update_data["reviewer_name"] = reviewer_name
 
-        mongo.db.highlights.update_one(query, {"$set": update_data}, upsert=True)
+        update = {"$set": update_data}
+        if earliest:
+            update_data["first_highlight_created_at"] = earliest
+        else:
+            # Leave the field absent rather than null so later $min updates apply
+            update["$unset"] = {"first_highlight_created_at": ""}
+        token = ObjectId()
+        update_data["version"] = PENDING_VERSION
+        update_data["version_token"] = token
+
+        # The previous page counts turn the wholesale replace into counter deltas
+        before = mongo.db.highlights.find_one_and_update(
+            query,
+            update,
+            projection={"highlights": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+        ReviewStatsService.record(
+            document_id,
+            page_deltas(
+                page_counts(before.get("highlights") if before else None),
+                page_counts(highlights),
+            ),
+            new_reviewers=0 if before else 1,
+        )
+        ResumeService._publish_review_version(document_id, query, token)
+        if isinstance(highlights, dict) and any(highlights.values()):
+            FacetService.mark_reviewed(document_id)
+
+    @staticmethod
+    def _highlight_page_key(page):
+        """Validate a page number from the highlights API and return it as a field-safe key."""
+        page_key = str(page)
+        if not page_key.isdigit() or int(page_key) < 1:
+            raise ValueError(f"Invalid page: {page!r}")
+        return page_key
+
+    @staticmethod
+    def _highlight_patch_update(operation):
+        """Translate one patch operation into a (filter additions, update) pair."""
+        op = operation.get("op")
+        page_key = ResumeService._highlight_page_key(operation.get("page"))
+        field = f"highlights.{page_key}"
+
+        if op == "add":
+            highlight = operation.get("highlight")
+            if not isinstance(highlight, dict) or not highlight.get("id"):
+                raise ValueError("add requires a highlight with an id")
+            update = {"$push": {field: highlight}}
+            created_at = ResumeService._parse_datetime(highlight.get("created_at"))
+            if created_at:
+                update["$min"] = {"first_highlight_created_at": created_at}
+            return {}, update
+
+        highlight_id = operation.get("id")
+        if not highlight_id:
+            raise ValueError(f"{op} requires a highlight id")
+
+        if op == "update":
+            changes = operation.get("changes") or {}
+            set_fields = {
+                f"{field}.$.{key}": value
+                for key, value in changes.items()
+                if key in PATCHABLE_HIGHLIGHT_FIELDS
+            }
+            if not set_fields:
+                raise ValueError("update requires at least one patchable field")
+            return {f"{field}.id": highlight_id}, {"$set": set_fields}
+
+        if op == "delete":
+            # Match only when the highlight exists, so the version $set that
+            # rides along can't make a no-op delete count as applied
+            return {f"{field}.id": highlight_id}, {
+                "$pull": {field: {"id": highlight_id}}
+            }
+
+        raise ValueError(f"Unknown highlight operation: {op!r}")
+
+    @staticmethod
+    def apply_highlight_patch(
+        document_id, operations, reviewer_id, reviewer_name="Anonymous"
+    ):
+        """Apply add/update/delete operations to one reviewer's highlights.
+
+        Each operation touches a single highlight with $push/$set/$pull on its
+        page array, so write cost no longer grows with the number of comments.
+        first_highlight_created_at is kept current with $min on add.
+
+        Args:
+            document_id: The resume being reviewed
+            operations: List of dicts such as
+                {"op": "add", "page": 1, "highlight": {...}},
+                {"op": "update", "page": 1, "id": "hl_1", "changes": {"comment": "..."}},
+                {"op": "delete", "page": 1, "id": "hl_1"}
+            reviewer_id: The reviewer whose highlights are patched
+            reviewer_name: Display name stored alongside the highlights
+
+        Returns:
+            int: Number of operations that matched a highlight
+
+        Raises:
+            ValueError: If any operation is malformed (nothing is written)
+        """
+        ResumeService._validate_db()
+        if not isinstance(operations, list):
+            raise ValueError("operations must be a list")
+        # Validate everything up front so a bad operation can't leave a partial patch
+        updates = [ResumeService._highlight_patch_update(op) for op in operations]
+
+        query = {"document_id": document_id, "reviewer_id": reviewer_id}
+        applied = 0
+        reviewed = False
+        deltas = {}
+        new_reviewers = 0
+        token = ObjectId()
+        for operation, (extra_filter, update) in zip(operations, updates):
+            upsert = "$push" in update
+            if upsert:
+                update.setdefault("$set", {})["reviewer_name"] = reviewer_name
+            update.setdefault("$set", {}).update(
+                version=PENDING_VERSION, version_token=token
+            )
+            result = mongo.db.highlights.update_one(
+                {**query, **extra_filter}, update, upsert=upsert
+            )
+            if result.modified_count or result.upserted_id is not None:
+                applied += 1
+                page_key = str(operation["page"])
+                if upsert:
+                    reviewed = True
+                    deltas[page_key] = deltas.get(page_key, 0) + 1
+                    if result.upserted_id is not None:
+                        new_reviewers += 1
+                elif "$pull" in update:
+                    deltas[page_key] = deltas.get(page_key, 0) - 1
+        if applied:
+            ReviewStatsService.record(document_id, deltas, new_reviewers)
+            ResumeService._publish_review_version(document_id, query, token)
+        if reviewed:
+            FacetService.mark_reviewed(document_id)
+        return applied
 
     @staticmethod
     def get_user_resumes(user_id):
         """Get all resumes owned by a user (oldest first, so newest is on the right)"""
         ResumeService._validate_db()
-        cursor = mongo.db.resumes.find({"user_id": user_id}).sort("created_at", 1)
+        cursor = mongo.db.resumes.find({"user_id": user_id}, LISTING_PROJECTION).sort(
+            "created_at", 1
+        )
         resumes = []
         for doc in cursor:
             resume_id = str(doc.get("_id"))
+            file_id = doc.get("file_id")
             resumes.append(
                 {
                     "_id": resume_id,
-                    # use stored path if present; otherwise fall back to streaming route
-                    "resume_path": doc.get("resume_path") or f"/resume/{resume_id}/pdf",
+                    # versioned streaming route when we have a PDF; otherwise the
+                    # stored path, falling back to the plain streaming route
+                    "resume_path": (
+                        ResumeService.build_pdf_path(resume_id, file_id)
+                        if file_id
+                        else doc.get("resume_path")
+                        or ResumeService.build_pdf_path(resume_id)
+                    ),
                     "title": doc.get("title", "Untitled Resume"),
                     "created_at": doc.get("created_at"),
+                    "review_stats": ReviewStatsService.summary(doc),
+                    "review_version": doc.get("review_version", 0),
                 }
             )
         return resumes
 
     @staticmethod
     def get_user_resume_entries(user_id):
-        """Get all resumes for a user with their reviews, ready for the template."""
+        """Get all resumes for a user with their review counts, ready for the template.
+
+        Counts come from each resume's review_stats; the reviews themselves
+        are fetched per resume through get_reviews_page() when the page shows
+        that resume.
+        """
         user_resumes = ResumeService.get_user_resumes(user_id)
         resume_entries = []
         for resume in user_resumes:
@@ -133,7 +549,9 @@ class ResumeService:
                     "resume_path": resume.get("resume_path"),
                     "title": resume.get("title"),
                     "created_at": created_at_iso,
-                    "reviews": ResumeService.get_all_reviews(rid),
+                    "review_count": resume["review_stats"]["reviewers"],
+                    "highlight_count": resume["review_stats"]["highlights"],
+                    "review_version": resume["review_version"],
                 }
             )
         return resume_entries
@@ -141,7 +559,7 @@ class ResumeService:
     @staticmethod
     def get_resume_by_id(resume_id):
         """Get a specific resume by ID"""
-        doc = mongo.db.resumes.find_one({"_id": resume_id})
+        doc = identity_map.fetch_one("resumes", resume_id, LISTING_PROJECTION)
         if doc:
             return {
                 "_id": str(doc.get("_id")),
@@ -153,10 +571,12 @@ class ResumeService:
         return None
 
     @staticmethod
-    def set_current_resume_for_user(user_id, resume_id):
+    def set_current_resume_for_user(user_id, resume_id, **write_kwargs):
         """
         Persist the pointer to the user's current resume.
-        Returns True if we matched a user record.
+        The filter skips the write in Mongo when the pointer already names
+        this resume, so no caller has to know the stored value.
+        Returns True if the pointer changed.
         """
         if not user_id or not resume_id:
             return False
@@ -167,26 +587,38 @@ class ResumeService:
             query_id = user_id
 
         result = mongo.db.users.update_one(
-            {"_id": query_id},
+            {"_id": query_id, "current_resume_id": {"$ne": str(resume_id)}},
             {"$set": {"current_resume_id": str(resume_id)}},
+            **write_kwargs,
         )
-        return bool(result.matched_count)
+        UserService.invalidate_cached_user(query_id)
+        return bool(result.modified_count)
 
     @staticmethod
     def save_resume_pdf(file_storage, user_id=None, title=None):
-        """Store an uploaded PDF in GridFS, link it to the user, and record metadata."""
-        fs = GridFS(mongo.db)
+        """Store an uploaded PDF in blob storage, link it to the user, and record metadata.
+
+        The resume id is allocated client-side so the streaming path goes into
+        the single insert; the insert and the user pointer update share a
+        transaction when one is available.
+        """
         file_storage.stream.seek(0)
-        file_id = fs.put(
+        file_id = ResumeService.store_file(
             file_storage.read(),
             filename=file_storage.filename,
             content_type=file_storage.mimetype or "application/pdf",
         )
+        resume_id = ObjectId()
+        now = datetime.now(timezone.utc)
         doc = {
+            "_id": resume_id,
             "filename": file_storage.filename,
             "content_type": file_storage.mimetype or "application/pdf",
             "file_id": file_id,
-            "created_at": datetime.now(timezone.utc),
+            "resume_path": f"/resume/{resume_id}/pdf",
+            "created_at": now,
+            "updated_at": now,
+            "facets": {REVIEWS_FACET: ["none"]},
         }
 
         if user_id:
@@ -194,52 +626,56 @@ class ResumeService:
         if title:
             doc["title"] = title
 
-        result = mongo.db.resumes.insert_one(doc)
-        resume_id = str(result.inserted_id)
+        with ResumeService._write_session() as write_kwargs:
+            mongo.db.resumes.insert_one(doc, **write_kwargs)
+            if user_id:
+                ResumeService.set_current_resume_for_user(
+                    user_id, resume_id, **write_kwargs
+                )
 
-        if user_id:
-            ResumeService.set_current_resume_for_user(user_id, resume_id)
-
-        # persist a convenient streaming path for later lookups
-        try:
-            mongo.db.resumes.update_one(
-                {"_id": ObjectId(resume_id)},
-                {"$set": {"resume_path": f"/resume/{resume_id}/pdf"}},
-            )
-        except (bson_errors.InvalidId, TypeError):
-            pass
-
-        return resume_id
+        FacetService.apply_delta({}, doc["facets"])
+        FeedCache.bump()
+        PdfDerivative.schedule(resume_id, DERIVATIVE_SERVICES)
+        SearchService.index_resume(resume_id)
+        SimilarityService.index_resume(resume_id)
+        return str(resume_id)
 
     @staticmethod
     def get_resume_pdf(resume_id, is_preview=False):
         """Fetch metadata and PDF stream by resumeId."""
-        try:
-            object_id = ObjectId(resume_id)
-        except (bson_errors.InvalidId, TypeError):
-            return None, None
-
-        doc = mongo.db.resumes.find_one({"_id": object_id})
+        doc = ResumeService.find_resume(resume_id, PDF_POINTER_PROJECTION)
         if not doc:
             return None, None
 
-        fs = GridFS(mongo.db)
-
         # Determine which file ID to use
         if is_preview:
             file_id = doc.get("preview_file_id")
         else:
             file_id = doc.get("file_id")
 
-        if not file_id or not fs.exists(file_id):
-            return doc, None
+        return doc, BlobStorage.get_cached(file_id)
 
-        file_obj = fs.get(file_id)
-        return doc, file_obj
+    @staticmethod
+    def uploaded_pdf_fields(file_id, filename, resume_id=None):
+        """Resume fields that make an uploaded PDF the official version."""
+        fields = {
+            "file_id": ObjectId(file_id),
+            "filename": filename,
+            "content_type": "application/pdf",
+            "template_id": "uploaded",
+            "template_name": "Uploaded PDF",
+        }
+        if resume_id:
+            fields["resume_path"] = f"/resume/{resume_id}/pdf"
+        return fields
 
     @staticmethod
     def save_resume_structured_data(
-        structured_data, user_id=None, title=None, resume_id=None
+        structured_data,
+        user_id=None,
+        title=None,
+        resume_id=None,
+        extra_fields=None,
     ):
         """Store structured resume data in MongoDB.
 
@@ -248,41 +684,78 @@ class ResumeService:
             user_id: Optional user ID to associate with the resume
             title: Optional title for the resume
             resume_id: Optional resume ID to update instead of creating new
+            extra_fields: Optional fields written in the same operation
+                (e.g. from uploaded_pdf_fields)
 
         Returns:
             str: The resume_id (MongoDB _id as string)
         """
+        now = datetime.now(timezone.utc)
         doc = {
             "structured_data": structured_data,
             # Update created_at to reflect the edit time, effectively bumping it to top of list
-            "created_at": datetime.now(timezone.utc),
+            "created_at": now,
+            "updated_at": now,
         }
+        if extra_fields:
+            doc.update(extra_fields)
 
         if user_id:
             doc["user_id"] = str(user_id)
         if title:
             doc["title"] = title
 
-        if resume_id:
-            mongo.db.resumes.update_one({"_id": ObjectId(resume_id)}, {"$set": doc})
-        else:
-            result = mongo.db.resumes.insert_one(doc)
-            resume_id = str(result.inserted_id)
-
-        if user_id:
-            ResumeService.set_current_resume_for_user(user_id, resume_id)
-
+        # Pre-allocate new ids so derived fields go into the single write
+        is_new = not resume_id
+        if is_new:
+            resume_id = str(ObjectId())
+        if doc.get("file_id") and "resume_path" not in doc:
+            doc["resume_path"] = f"/resume/{resume_id}/pdf"
+
+        extracted = extract_facets(structured_data)
+        new_facets = {facet: sorted(values) for facet, values in extracted.items()}
+
+        with ResumeService._write_session() as write_kwargs:
+            if is_new:
+                doc["_id"] = ObjectId(resume_id)
+                doc["facets"] = {**new_facets, REVIEWS_FACET: ["none"]}
+                mongo.db.resumes.insert_one(doc, **write_kwargs)
+                old_facets = {}
+            else:
+                # Read the old facet values in the same write to adjust the rollup
+                before = mongo.db.resumes.find_one_and_update(
+                    {"_id": ObjectId(resume_id)},
+                    {"$set": {**doc, **facet_fields(extracted)}},
+                    projection={"facets": 1},
+                    return_document=ReturnDocument.BEFORE,
+                    **write_kwargs,
+                )
+                identity_map.invalidate("resumes", ObjectId(resume_id))
+                old_facets = None
+                if before is not None:
+                    stored = before.get("facets") or {}
+                    old_facets = {f: stored.get(f) for f in STRUCTURED_FACETS}
+
+            if user_id:
+                ResumeService.set_current_resume_for_user(
+                    user_id, resume_id, **write_kwargs
+                )
+
+        if old_facets is not None:
+            new_facets = doc.get("facets") or new_facets
+            FacetService.apply_delta(old_facets, new_facets, extracted)
+            SuggestService.apply_delta(old_facets, new_facets, extracted)
+        FeedCache.bump()
+        if doc.get("file_id"):
+            PdfDerivative.schedule(resume_id, DERIVATIVE_SERVICES)
+        SearchService.index_resume(resume_id)
+        SimilarityService.index_resume(resume_id)
         return resume_id
 
     @staticmethod
     def get_resume_structured_data(resume_id):
         """Fetch structured resume data by resumeId."""
-        try:
-            object_id = ObjectId(resume_id)
-        except (bson_errors.InvalidId, TypeError):
-            return None
-
-        doc = mongo.db.resumes.find_one({"_id": object_id})
+        doc = ResumeService.find_resume(resume_id, EDIT_PROJECTION)
         if not doc:
             return None
 
@@ -0,0 +1,79 @@
+import threading
+from app.extensions import mongo
+from app.services.review_stats_service import REVIEW_STATS_FIELD, REVIEW_VERSION_FIELD
+
+_changed = threading.Condition()
+_state = {"generation": 0, "streams": 0}
+
+
+class ReviewEvents:
+    """Change notifications for resume reviews, without MongoDB change streams.
+
+    Listeners read their resumes' review_version (one small projected query)
+    and then wait(). A highlights write in this worker wakes every waiting
+    listener at once through notify(); writes from other workers are seen
+    when the wait times out and the listener reads the versions again.
+    """
+
+    @staticmethod
+    def generation():
+        """Number of local review writes so far; pass it to wait()."""
+        return _state["generation"]
+
+    @staticmethod
+    def notify():
+        """Wake listeners after a highlights write in this worker."""
+        with _changed:
+            _state["generation"] += 1
+            _changed.notify_all()
+
+    @staticmethod
+    def wait(generation, timeout):
+        """Block until notify() moves past generation or timeout seconds pass.
+
+        Returns:
+            int: The current generation
+        """
+        with _changed:
+            _changed.wait_for(lambda: _state["generation"] != generation, timeout)
+            return _state["generation"]
+
+    @staticmethod
+    def open_stream(limit):
+        """Reserve one of this worker's limit event streams.
+
+        Each open stream holds a server thread, so capping them leaves
+        threads for ordinary requests.
+
+        Returns:
+            bool: False when all limit streams are already open
+        """
+        with _changed:
+            if _state["streams"] >= limit:
+                return False
+            _state["streams"] += 1
+            return True
+
+    @staticmethod
+    def close_stream():
+        with _changed:
+            _state["streams"] -= 1
+
+    @staticmethod
+    def versions(user_id):
+        """Review version and reviewer count of each of a user's resumes.
+
+        Returns:
+            dict: {resume_id: {"version": int, "reviewers": int}}
+        """
+        cursor = mongo.db.resumes.find(
+            {"user_id": user_id},
+            {REVIEW_VERSION_FIELD: 1, f"{REVIEW_STATS_FIELD}.reviewers": 1},
+        )
+        return {
+            str(doc["_id"]): {
+                "version": doc.get(REVIEW_VERSION_FIELD, 0),
+                "reviewers": (doc.get(REVIEW_STATS_FIELD) or {}).get("reviewers", 0),
+            }
+            for doc in cursor
+        }
@@ -0,0 +1,198 @@
+from datetime import datetime, timezone
+from bson import ObjectId, errors as bson_errors
+from pymongo import ReturnDocument
+from app.extensions import mongo
+from app.services.feed_cache import FeedCache
+
+REVIEW_STATS_FIELD = "review_stats"
+# Bumped after every highlights write; reviewer documents carry the value
+# of the write that last touched them, so "changed since N" is one query
+REVIEW_VERSION_FIELD = "review_version"
+# Reviewer documents hold this from their write until its version is
+# published, so "changed since N" also returns writes still in flight
+PENDING_VERSION = 2**62
+
+
+def page_counts(highlights):
+    """{page: number of highlights} for one reviewer's {page: [highlight, ...]}."""
+    if not isinstance(highlights, dict):
+        return {}
+    return {
+        str(page): len(items)
+        for page, items in highlights.items()
+        if isinstance(items, list) and items
+    }
+
+
+def page_deltas(old_pages, new_pages):
+    """{page: change in highlight count} between two page_counts() results."""
+    pages = set(old_pages) | set(new_pages)
+    deltas = {page: new_pages.get(page, 0) - old_pages.get(page, 0) for page in pages}
+    return {page: delta for page, delta in deltas.items() if delta}
+
+
+def empty_stats():
+    return {"reviewers": 0, "highlights": 0, "pages": {}, "last_reviewed_at": None}
+
+
+def _parse_timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _stored_datetime(value):
+    """value as Mongo hands it back: naive UTC with millisecond precision."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+class ReviewStatsService:
+    """Per-resume review counters stored on the resume document.
+
+    review_stats holds reviewers (highlights documents on the resume),
+    highlights (their total), pages ({page: highlights}) and
+    last_reviewed_at. Highlight writes adjust them with one $inc/$max, so
+    readers never walk the highlights collection. reconcile() recomputes
+    them from source for resumes written before the counters existed or
+    after a failed write. Feed cards show the counts, so changing them
+    bumps FeedCache.
+    """
+
+    @staticmethod
+    def current_version(document_id):
+        """A resume's review version, 0 if it has none or does not exist."""
+        try:
+            object_id = ObjectId(document_id)
+        except (bson_errors.InvalidId, TypeError):
+            return 0
+        doc = mongo.db.resumes.find_one({"_id": object_id}, {REVIEW_VERSION_FIELD: 1})
+        return (doc or {}).get(REVIEW_VERSION_FIELD, 0)
+
+    @staticmethod
+    def next_version(document_id):
+        """Bump a resume's review version once a highlights write has landed.
+
+        Returns:
+            int or None: The new version, or None if there is no such resume
+        """
+        try:
+            object_id = ObjectId(document_id)
+        except (bson_errors.InvalidId, TypeError):
+            return None
+        doc = mongo.db.resumes.find_one_and_update(
+            {"_id": object_id},
+            {"$inc": {REVIEW_VERSION_FIELD: 1}},
+            projection={REVIEW_VERSION_FIELD: 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc[REVIEW_VERSION_FIELD] if doc else None
+
+    @staticmethod
+    def record(document_id, deltas=None, new_reviewers=0, reviewed_at=None):
+        """Apply one highlights write to a resume's counters.
+
+        Args:
+            deltas: {page: change in highlight count}
+            new_reviewers: Reviewer documents the write created
+            reviewed_at: When the write happened (defaults to now)
+        """
+        try:
+            object_id = ObjectId(document_id)
+        except (bson_errors.InvalidId, TypeError):
+            return
+        inc = {
+            f"{REVIEW_STATS_FIELD}.pages.{page}": delta
+            for page, delta in (deltas or {}).items()
+            if delta
+        }
+        total = sum((deltas or {}).values())
+        if total:
+            inc[f"{REVIEW_STATS_FIELD}.highlights"] = total
+        if new_reviewers:
+            inc[f"{REVIEW_STATS_FIELD}.reviewers"] = new_reviewers
+        update = {
+            "$max": {
+                f"{REVIEW_STATS_FIELD}.last_reviewed_at": reviewed_at
+                or datetime.now(timezone.utc)
+            }
+        }
+        if inc:
+            update["$inc"] = inc
+        result = mongo.db.resumes.update_one({"_id": object_id}, update)
+        if inc and result.matched_count:
+            FeedCache.bump()
+
+    @staticmethod
+    def summary(doc):
+        """The counters of a resume document read with review_stats, zeros if absent."""
+        stats = {**empty_stats(), **(doc.get(REVIEW_STATS_FIELD) or {})}
+        stats["pages"] = {
+            page: count for page, count in (stats["pages"] or {}).items() if count > 0
+        }
+        return stats
+
+    @staticmethod
+    def compute():
+        """Counters for every reviewed resume, from the highlights collection.
+
+        Returns:
+            dict: {document_id: review stats}
+        """
+        stats = {}
+        cursor = mongo.db.highlights.find({}, {"document_id": 1, "highlights": 1})
+        for doc in cursor:
+            entry = stats.setdefault(str(doc.get("document_id")), empty_stats())
+            entry["reviewers"] += 1
+            highlights = doc.get("highlights")
+            for page, count in page_counts(highlights).items():
+                entry["pages"][page] = entry["pages"].get(page, 0) + count
+                entry["highlights"] += count
+                for highlight in highlights[page]:
+                    if not isinstance(highlight, dict):
+                        continue
+                    created_at = _parse_timestamp(highlight.get("created_at"))
+                    if created_at is None:
+                        continue
+                    created_at = _stored_datetime(created_at)
+                    latest = entry["last_reviewed_at"]
+                    if latest is None or created_at > latest:
+                        entry["last_reviewed_at"] = created_at
+        return stats
+
+    @staticmethod
+    def reconcile():
+        """Rewrite every resume's review_stats that disagrees with its highlights.
+
+        A stored last_reviewed_at is kept when no highlight carries a
+        timestamp (or when it is later, since edits also count as reviews).
+
+        Returns:
+            dict: Number of resumes checked and corrected
+        """
+        computed = ReviewStatsService.compute()
+        checked = corrected = 0
+        for doc in mongo.db.resumes.find({}, {REVIEW_STATS_FIELD: 1}):
+            checked += 1
+            current = ReviewStatsService.summary(doc)
+            expected = computed.get(str(doc["_id"]), empty_stats())
+            stored_at = current["last_reviewed_at"]
+            if stored_at is not None and (
+                expected["last_reviewed_at"] is None
+                or stored_at > expected["last_reviewed_at"]
+            ):
+                expected["last_reviewed_at"] = stored_at
+            if current != expected:
+                mongo.db.resumes.update_one(
+                    {"_id": doc["_id"]}, {"$set": {REVIEW_STATS_FIELD: expected}}
+                )
+                corrected += 1
+        if corrected:
+            FeedCache.bump()
+        return {"resumes": checked, "corrected": corrected}
@@ -0,0 +1,314 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from bson import ObjectId, errors as bson_errors
+from flask import current_app
+from app.extensions import mongo
+from app.utils.search_index import SearchIndex
+
+# Only the fields that feed the index are read when building or refreshing it
+SEARCH_PROJECTION = {
+    "title": 1,
+    "filename": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "structured_data.name": 1,
+    "structured_data.first_name": 1,
+    "structured_data.last_name": 1,
+    "structured_data.professional_summary": 1,
+    "structured_data.experience": 1,
+    "structured_data.projects": 1,
+    "structured_data.skills": 1,
+    "structured_data.education": 1,
+}
+# Top-level resume fields whose changes need re-indexing
+INDEXED_FIELDS = ("title", "structured_data")
+
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "title": 2.0,
+    "roles": 2.0,
+    "skills": 2.0,
+    "organizations": 1.5,
+    "text": 1.0,
+}
+
+_build_lock = threading.Lock()
+
+
+def _timestamp(value):
+    if not isinstance(value, datetime):
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _written_at(doc):
+    """When a resume was last written; older documents only carry created_at."""
+    return _timestamp(doc.get("updated_at") or doc.get("created_at"))
+
+
+def _items(structured_data, key):
+    value = structured_data.get(key)
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+
+def _bullets(item):
+    bullets = item.get("bullets")
+    if isinstance(bullets, list):
+        return " ".join(str(b) for b in bullets if b)
+    return str(bullets or "")
+
+
+def search_fields(doc):
+    """Split a resume document into the weighted fields the index scores."""
+    data = doc.get("structured_data") or {}
+    if not isinstance(data, dict):
+        data = {}
+    experience = _items(data, "experience")
+    projects = _items(data, "projects")
+    education = _items(data, "education")
+    skills = _items(data, "skills")
+
+    return {
+        "name": " ".join(
+            str(data.get(key) or "") for key in ("name", "first_name", "last_name")
+        ),
+        "title": doc.get("title") or doc.get("filename") or "",
+        "roles": " ".join(str(item.get("role") or "") for item in experience),
+        "organizations": " ".join(
+            [str(item.get("company") or "") for item in experience]
+            + [str(item.get("institution") or "") for item in education]
+        ),
+        "skills": " ".join(
+            f"{item.get('category') or ''} {item.get('skills') or ''}"
+            for item in skills
+        ),
+        "text": " ".join(
+            [str(data.get("professional_summary") or "")]
+            + [_bullets(item) for item in experience]
+            + [f"{item.get('title') or ''} {_bullets(item)}" for item in projects]
+            + [str(item.get("degree") or "") for item in education]
+        ),
+    }
+
+
+class SearchService:
+    """Relevance-ranked feed search backed by an in-process SearchIndex.
+
+    Each worker loads the index on first use, from the snapshot file when one
+    exists (then catches up on resumes changed since), otherwise from a
+    projected scan of resumes. As with SimilarityService, SEARCH_BUILD "async"
+    (the default) loads it on a background thread and searches answer None
+    until it is ready; "sync" loads it inside the first request. Writes in
+    this worker update it immediately;
+    changes made by other workers are picked up every SEARCH_SYNC_INTERVAL
+    seconds via updated_at, which every ResumeService write stamps. Resumes
+    deleted elsewhere are dropped when the index holds more resumes than the
+    collection.
+    """
+
+    @staticmethod
+    def index():
+        """The worker's index, or None while it is still being loaded."""
+        state = current_app.extensions.get("search_index")
+        if state is None:
+            with _build_lock:
+                state = current_app.extensions.get("search_index")
+                if state is None:
+                    state = {"index": None, "synced_at": 0.0, "saved_at": 0.0}
+                    current_app.extensions["search_index"] = state
+                    if current_app.config.get("SEARCH_BUILD", "async") == "sync":
+                        SearchService._load(state)
+                    else:
+                        threading.Thread(
+                            target=SearchService._load_in_background,
+                            args=(current_app._get_current_object(), state),
+                            name="search-build",
+                            daemon=True,
+                        ).start()
+        if state["index"] is None:
+            return None
+        SearchService._maybe_sync(state)
+        return state["index"]
+
+    @staticmethod
+    def loaded_index():
+        """The index if this worker has already loaded it, else None."""
+        state = current_app.extensions.get("search_index")
+        return state["index"] if state else None
+
+    @staticmethod
+    def _load(state):
+        index = SearchService.load_snapshot()
+        if index is None:
+            index = SearchService.build()
+            SearchService.save_snapshot(index)
+        else:
+            SearchService._drop_deleted(index)
+        # Writes that landed while loading were not indexed by this worker
+        SearchService.sync(index)
+        now = time.monotonic()
+        state.update(synced_at=now, saved_at=now)
+        state["index"] = index
+
+    @staticmethod
+    def _load_in_background(app, state):
+        with app.app_context():
+            try:
+                SearchService._load(state)
+            except Exception:
+                app.logger.exception("Loading the search index failed")
+                # Let the next request start another load
+                if app.extensions.get("search_index") is state:
+                    app.extensions.pop("search_index")
+
+    @staticmethod
+    def build():
+        """Index every resume from a projected scan."""
+        index = SearchIndex(FIELD_WEIGHTS)
+        for doc in mongo.db.resumes.find({}, SEARCH_PROJECTION):
+            SearchService._add(index, doc)
+        return index
+
+    @staticmethod
+    def _add(index, doc):
+        index.add(
+            str(doc["_id"]), search_fields(doc), _timestamp(doc.get("created_at"))
+        )
+        # Recency ranks by created_at; catching up goes by the last write
+        index.watermark = max(index.watermark, _written_at(doc))
+
+    @staticmethod
+    def sync(index):
+        """Re-index resumes written since the index's watermark.
+
+        Returns:
+            int: Number of resumes re-indexed
+        """
+        # Overlap a little so writes racing the last sync aren't missed
+        since = datetime.fromtimestamp(max(0.0, index.watermark - 5), timezone.utc)
+        count = 0
+        for doc in mongo.db.resumes.find(
+            {
+                "$or": [
+                    {"updated_at": {"$gt": since}},
+                    {"created_at": {"$gt": since}},
+                ]
+            },
+            SEARCH_PROJECTION,
+        ):
+            SearchService._add(index, doc)
+            count += 1
+        return count
+
+    @staticmethod
+    def _drop_deleted(index):
+        live = {str(doc["_id"]) for doc in mongo.db.resumes.find({}, {"_id": 1})}
+        deleted = [key for key in index.keys() if key not in live]
+        for key in deleted:
+            index.remove(key)
+        return len(deleted)
+
+    @staticmethod
+    def _prune(index):
+        """Drop resumes deleted by other workers.
+
+        After a sync the index holds every live resume, so it can only
+        outnumber the collection when some were deleted; the id scan runs
+        only then.
+
+        Returns:
+            int: Number of resumes removed
+        """
+        if len(index) <= mongo.db.resumes.estimated_document_count():
+            return 0
+        return SearchService._drop_deleted(index)
+
+    @staticmethod
+    def _maybe_sync(state):
+        now = time.monotonic()
+        interval = current_app.config.get("SEARCH_SYNC_INTERVAL", 30)
+        if now - state["synced_at"] < interval:
+            return
+        state["synced_at"] = now
+        changed = SearchService.sync(state["index"])
+        changed += SearchService._prune(state["index"])
+        snapshot_interval = current_app.config.get("SEARCH_SNAPSHOT_INTERVAL", 300)
+        if changed and now - state["saved_at"] >= snapshot_interval:
+            state["saved_at"] = now
+            SearchService.save_snapshot(state["index"])
+
+    @staticmethod
+    def load_snapshot():
+        path = current_app.config.get("SEARCH_SNAPSHOT_PATH")
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return SearchIndex.from_snapshot(json.load(f))
+        except Exception as e:
+            current_app.logger.warning(f"Ignoring unreadable search snapshot: {e}")
+            return None
+
+    @staticmethod
+    def save_snapshot(index):
+        """Atomically write the index so new workers start warm."""
+        path = current_app.config.get("SEARCH_SNAPSHOT_PATH")
+        if not path:
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(index.to_snapshot(), f, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except OSError as e:
+            current_app.logger.warning(f"Could not write search snapshot: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def index_resume(resume_id):
+        """Refresh one resume in this worker's index after it was written."""
+        index = SearchService.loaded_index()
+        if index is None:
+            return
+        try:
+            object_id = ObjectId(resume_id)
+        except (bson_errors.InvalidId, TypeError):
+            return
+        doc = mongo.db.resumes.find_one({"_id": object_id}, SEARCH_PROJECTION)
+        if doc:
+            SearchService._add(index, doc)
+        else:
+            index.remove(str(resume_id))
+
+    @staticmethod
+    def search(query, limit=20, offset=0, allowed=None):
+        """Rank resumes for a feed query by BM25 relevance and recency.
+
+        Args:
+            allowed: Optional set of resume id strings to restrict results to
+
+        Returns:
+            tuple: (list of (resume_id, score), total number of matches), or
+            None while the index is still being loaded
+        """
+        index = SearchService.index()
+        if index is None:
+            return None
+        return index.search(
+            query,
+            limit=limit,
+            offset=offset,
+            now=time.time(),
+            recency_weight=current_app.config.get("SEARCH_RECENCY_WEIGHT", 0.5),
+            half_life_days=current_app.config.get("SEARCH_RECENCY_HALF_LIFE_DAYS", 30),
+            allowed=allowed,
+        )
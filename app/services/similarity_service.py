@@ -0,0 +1,186 @@
+import threading
+import time
+from datetime import datetime, timezone
+from bson import ObjectId, errors as bson_errors
+from flask import current_app
+from app.extensions import mongo
+from app.services.search_service import (
+    SEARCH_PROJECTION,
+    search_fields,
+    _timestamp,
+    _written_at,
+)
+from app.utils.similarity_index import SimilarityIndex
+
+# What makes two resumes alike: shared skills count most, then roles, then
+# the wording of summaries and bullets. Names and titles are left out.
+SIMILARITY_WEIGHTS = {
+    "skills": 3.0,
+    "roles": 2.0,
+    "text": 1.0,
+}
+
+_build_lock = threading.Lock()
+
+
+class SimilarityService:
+    """Similar-resume recommendations from an in-process SimilarityIndex.
+
+    Each worker builds the index from a projected scan of resumes on first
+    use. A full build takes too long to hold a request, so with SIMILAR_BUILD
+    "async" (the default) it runs on a background thread and queries answer
+    None until it is ready; "sync" builds inside the first request. Writes in
+    this worker re-index the resume straight away; writes from other workers
+    are picked up every SIMILAR_SYNC_INTERVAL seconds via updated_at, as with
+    SearchService.
+    """
+
+    @staticmethod
+    def index():
+        """The worker's index, or None while it is still being built."""
+        state = current_app.extensions.get("similarity_index")
+        if state is None:
+            with _build_lock:
+                state = current_app.extensions.get("similarity_index")
+                if state is None:
+                    state = {"index": None, "synced_at": 0.0}
+                    current_app.extensions["similarity_index"] = state
+                    if current_app.config.get("SIMILAR_BUILD", "async") == "sync":
+                        SimilarityService._load(state)
+                    else:
+                        threading.Thread(
+                            target=SimilarityService._load_in_background,
+                            args=(current_app._get_current_object(), state),
+                            name="similarity-build",
+                            daemon=True,
+                        ).start()
+        if state["index"] is None:
+            return None
+        SimilarityService._maybe_sync(state)
+        return state["index"]
+
+    @staticmethod
+    def loaded_index():
+        """The index if this worker has already built it, else None."""
+        state = current_app.extensions.get("similarity_index")
+        return state["index"] if state else None
+
+    @staticmethod
+    def _load(state):
+        index = SimilarityService.build()
+        # Writes that landed while the scan ran were not indexed by this worker
+        SimilarityService.sync(index)
+        state["synced_at"] = time.monotonic()
+        state["index"] = index
+
+    @staticmethod
+    def _load_in_background(app, state):
+        with app.app_context():
+            try:
+                SimilarityService._load(state)
+            except Exception:
+                app.logger.exception("Building the similarity index failed")
+                # Let the next request start another build
+                if app.extensions.get("similarity_index") is state:
+                    app.extensions.pop("similarity_index")
+
+    @staticmethod
+    def build():
+        """Index every resume from a projected scan."""
+        written = [0.0]
+
+        def documents():
+            for doc in mongo.db.resumes.find({}, SEARCH_PROJECTION):
+                written[0] = max(written[0], _written_at(doc))
+                yield str(doc["_id"]), search_fields(doc), _timestamp(
+                    doc.get("created_at")
+                )
+
+        index = SimilarityIndex.build(documents(), SIMILARITY_WEIGHTS)
+        # Recency of the last write, not of the newest resume, bounds catch-up
+        index.watermark = max(index.watermark, written[0])
+        return index
+
+    @staticmethod
+    def _add(index, doc):
+        index.add(
+            str(doc["_id"]), search_fields(doc), _timestamp(doc.get("created_at"))
+        )
+        index.watermark = max(index.watermark, _written_at(doc))
+
+    @staticmethod
+    def sync(index):
+        """Re-index resumes written since the index's watermark.
+
+        Returns:
+            int: Number of resumes re-indexed
+        """
+        since = datetime.fromtimestamp(max(0.0, index.watermark - 5), timezone.utc)
+        count = 0
+        for doc in mongo.db.resumes.find(
+            {
+                "$or": [
+                    {"updated_at": {"$gt": since}},
+                    {"created_at": {"$gt": since}},
+                ]
+            },
+            SEARCH_PROJECTION,
+        ):
+            SimilarityService._add(index, doc)
+            count += 1
+        return count
+
+    @staticmethod
+    def _maybe_sync(state):
+        now = time.monotonic()
+        interval = current_app.config.get("SIMILAR_SYNC_INTERVAL", 60)
+        if now - state["synced_at"] < interval:
+            return
+        state["synced_at"] = now
+        SimilarityService.sync(state["index"])
+
+    @staticmethod
+    def index_resume(resume_id):
+        """Refresh one resume in this worker's index after it was written."""
+        index = SimilarityService.loaded_index()
+        if index is None:
+            return
+        try:
+            object_id = ObjectId(resume_id)
+        except (bson_errors.InvalidId, TypeError):
+            return
+        doc = mongo.db.resumes.find_one({"_id": object_id}, SEARCH_PROJECTION)
+        if doc:
+            SimilarityService._add(index, doc)
+        else:
+            index.remove(str(resume_id))
+
+    @staticmethod
+    def similar(resume_id, limit=5):
+        """Resumes most like resume_id.
+
+        Returns:
+            list or None: [(resume_id, cosine similarity), ...], best first,
+                or None while the index is being built
+        """
+        index = SimilarityService.index()
+        if index is None:
+            return None
+        return index.similar(str(resume_id), limit)
+
+    @staticmethod
+    def match(job_description, limit=20):
+        """Resumes that best match a pasted job description.
+
+        The description is scored against skills, roles and bullet text
+        alike, since job ads mention skills in prose.
+
+        Returns:
+            list or None: [(resume_id, cosine similarity, [matched term, ...]),
+                ...], or None while the index is being built
+        """
+        index = SimilarityService.index()
+        if index is None:
+            return None
+        fields = {field: job_description for field in SIMILARITY_WEIGHTS}
+        return index.match(fields, limit)
@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timedelta, timezone
+from app.extensions import mongo
+from app.services.blob_storage import BlobStorage
+
+# Resume fields that point at stored blobs; anything not referenced here is garbage
+REFERENCE_FIELDS = (
+    "file_id",
+    "preview_file_id",
+    "latex_file_id",
+    "preview_latex_file_id",
+    "thumbnail_file_id",
+    "text_layer_file_id",
+)
+
+DEFAULT_GRACE_PERIOD = timedelta(hours=24)
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_PAUSE = 0.5
+
+
+class StorageGCService:
+    """Mark-and-sweep collector for stored blobs no resume points at.
+
+    Template selection stores a fresh .tex/.pdf preview each time and uploads
+    wait in the session until the form is submitted, so unreferenced files
+    accumulate. Files younger than the grace period are always kept, which
+    protects uploads that are still waiting to be linked to a resume.
+    """
+
+    @staticmethod
+    def find_referenced_file_ids():
+        """Mark phase: collect every file id referenced by any resume."""
+        projection = {field: 1 for field in REFERENCE_FIELDS}
+        referenced = set()
+        for doc in mongo.db.resumes.find({}, projection):
+            for field in REFERENCE_FIELDS:
+                if doc.get(field):
+                    referenced.add(doc[field])
+        return referenced
+
+    @staticmethod
+    def find_orphaned_files(grace_period=DEFAULT_GRACE_PERIOD, now=None):
+        """Return (file_id, length) pairs for unreferenced files older than the grace period.
+
+        Scans whichever blob storage backend is configured.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - grace_period
+        # Mark after fixing the cutoff: anything uploaded since is never a candidate
+        referenced = StorageGCService.find_referenced_file_ids()
+
+        return [
+            (file_id, length)
+            for file_id, length in BlobStorage.backend().iter_files(
+                uploaded_before=cutoff
+            )
+            if file_id not in referenced
+        ]
+
+    @staticmethod
+    def _drop_newly_referenced(batch):
+        """Re-check a batch right before deleting it, in case a resume linked a file since marking."""
+        file_ids = [file_id for file_id, _ in batch]
+        query = {"$or": [{field: {"$in": file_ids}} for field in REFERENCE_FIELDS]}
+        projection = {field: 1 for field in REFERENCE_FIELDS}
+        still_used = set()
+        for doc in mongo.db.resumes.find(query, projection):
+            for field in REFERENCE_FIELDS:
+                if doc.get(field) in file_ids:
+                    still_used.add(doc[field])
+        return [item for item in batch if item[0] not in still_used]
+
+    @staticmethod
+    def collect(
+        grace_period=DEFAULT_GRACE_PERIOD,
+        batch_size=DEFAULT_BATCH_SIZE,
+        batch_pause=DEFAULT_BATCH_PAUSE,
+        dry_run=False,
+        now=None,
+    ):
+        """Sweep orphaned blobs in rate-limited batches.
+
+        Args:
+            grace_period: Minimum age (timedelta) before an unreferenced file is removed
+            batch_size: Number of files deleted per batch
+            batch_pause: Seconds to sleep between batches to limit load on MongoDB
+            dry_run: If True, only report what would be deleted
+            now: Optional reference time (defaults to the current UTC time)
+
+        Returns:
+            dict: Report with orphaned/deleted file counts and reclaimed bytes
+        """
+        orphans = StorageGCService.find_orphaned_files(grace_period, now=now)
+        report = {
+            "dry_run": dry_run,
+            "orphaned_files": len(orphans),
+            "deleted_files": 0,
+            "reclaimed_bytes": 0,
+        }
+
+        if dry_run:
+            report["reclaimed_bytes"] = sum(length for _, length in orphans)
+            return report
+
+        for start in range(0, len(orphans), batch_size):
+            if start and batch_pause:
+                time.sleep(batch_pause)
+
+            batch = StorageGCService._drop_newly_referenced(
+                orphans[start : start + batch_size]
+            )
+            if not batch:
+                continue
+
+            BlobStorage.backend().delete_many([file_id for file_id, _ in batch])
+
+            report["deleted_files"] += len(batch)
+            report["reclaimed_bytes"] += sum(length for _, length in batch)
+
+        return report
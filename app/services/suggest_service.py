@@ -0,0 +1,73 @@
+import threading
+import time
+from flask import current_app
+from app.extensions import mongo
+from app.services.facet_service import FACET_COUNTS_COLLECTION
+from app.utils.suggest_index import SuggestIndex
+
+# Facets offered as search completions (locations and review state are filters only)
+SUGGEST_FACETS = ("skill", "role", "company", "school")
+
+_build_lock = threading.Lock()
+
+
+class SuggestService:
+    """Typeahead completions for the feed search box.
+
+    Each worker builds a SuggestIndex from the facet_counts rollup on first
+    use. Resume writes in this worker adjust it straight away through
+    apply_delta(); writes from other workers arrive when it is rebuilt every
+    SUGGEST_REFRESH_INTERVAL seconds.
+    """
+
+    @staticmethod
+    def index():
+        state = current_app.extensions.get("suggest_index")
+        interval = current_app.config.get("SUGGEST_REFRESH_INTERVAL", 60)
+        if state is None or time.monotonic() - state["built_at"] >= interval:
+            with _build_lock:
+                state = current_app.extensions.get("suggest_index")
+                if state is None or time.monotonic() - state["built_at"] >= interval:
+                    state = {
+                        "index": SuggestService.build(),
+                        "built_at": time.monotonic(),
+                    }
+                    current_app.extensions["suggest_index"] = state
+        return state["index"]
+
+    @staticmethod
+    def loaded_index():
+        """The index if this worker has already built it, else None."""
+        state = current_app.extensions.get("suggest_index")
+        return state["index"] if state else None
+
+    @staticmethod
+    def build():
+        """Index every suggestible facet value with its resume count."""
+        cursor = mongo.db[FACET_COUNTS_COLLECTION].find(
+            {"facet": {"$in": list(SUGGEST_FACETS)}, "count": {"$gt": 0}},
+            {"facet": 1, "value": 1, "label": 1, "count": 1},
+        )
+        return SuggestIndex.build(
+            (doc["facet"], doc["value"], doc.get("label"), doc["count"])
+            for doc in cursor
+        )
+
+    @staticmethod
+    def apply_delta(old, new, labels=None):
+        """Mirror a FacetService.apply_delta() change into this worker's index."""
+        index = SuggestService.loaded_index()
+        if index is None:
+            return
+        labels = labels or {}
+        for facet in SUGGEST_FACETS:
+            before = set(old.get(facet) or ())
+            after = set(new.get(facet) or ())
+            for value in after - before:
+                index.update(facet, value, labels.get(facet, {}).get(value), 1)
+            for value in before - after:
+                index.update(facet, value, delta=-1)
+
+    @staticmethod
+    def suggest(prefix, limit=8):
+        return SuggestService.index().complete(prefix, limit)
@@ -0,0 +1,23 @@
+from app.services.pdf_derivatives import PdfDerivative
+from app.utils.pdf_text_layer import TEXT_LAYER_VERSION, extract_text_layer
+
+
+class TextLayerService(PdfDerivative):
+    """Per-page text items and page geometry for the review viewer.
+
+    Extracted once per PDF version so the browser can lay out pages, the
+    selectable text layer and highlights without running pdf.js text
+    extraction on every load.
+    """
+
+    FILE_FIELD = "text_layer_file_id"
+    SOURCE_FIELD = "text_layer_source_id"
+    ERROR_FIELD = "text_layer_error_source_id"
+    VERSION_FIELD = "text_layer_version"
+    VERSION = TEXT_LAYER_VERSION
+    CONTENT_TYPE = "application/json"
+    EXTENSION = "json"
+
+    @classmethod
+    def build(cls, resume_id, pdf_bytes):
+        return extract_text_layer(pdf_bytes)
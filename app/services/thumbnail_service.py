@@ -0,0 +1,16 @@
+from app.services.pdf_derivatives import PdfDerivative
+from app.utils.pdf_thumbnail import render_first_page_png
+
+
+class ThumbnailService(PdfDerivative):
+    """PNG previews of page 1 for feed cards, rendered once per PDF version."""
+
+    FILE_FIELD = "thumbnail_file_id"
+    SOURCE_FIELD = "thumbnail_source_id"
+    ERROR_FIELD = "thumbnail_error_source_id"
+    CONTENT_TYPE = "image/png"
+    EXTENSION = "png"
+
+    @classmethod
+    def build(cls, resume_id, pdf_bytes):
+        return render_first_page_png(pdf_bytes)
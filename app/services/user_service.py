@@ -1,8 +1,26 @@
 from app.extensions import mongo, bcrypt
 from app.models.user import User
-from bson import ObjectId
+from app.services import identity_map
+from app.utils.ttl_cache import TTLCache
+from bson import ObjectId, errors as bson_errors
 import datetime
 
+# Everything User needs except password_hash, which only the login path reads
+SESSION_USER_PROJECTION = {
+    "email": 1,
+    "first_name": 1,
+    "last_name": 1,
+    "headline": 1,
+    "created_at": 1,
+    "current_resume_id": 1,
+}
+
+DEFAULT_USER_CACHE_SIZE = 1024
+DEFAULT_USER_CACHE_TTL = 60
+
+# Per-process cache of session user documents, keyed by string id
+_user_cache = TTLCache(maxsize=DEFAULT_USER_CACHE_SIZE, ttl=DEFAULT_USER_CACHE_TTL)
+
 
 class UserService:
     @staticmethod
@@ -26,15 +44,49 @@ class UserService:
 
     @staticmethod
     def get_user_by_id(user_id):
+        """Load a user for the session, without the password hash.
+
+        flask-login calls this on every authenticated request, so documents
+        are kept in a short-lived per-process cache. Writes to a cached field
+        must call invalidate_cached_user (set_current_resume_for_user does).
+        """
         try:
             if not user_id:
                 return None
-            user_data = mongo.db.users.find_one({"_id": ObjectId(user_id)})
+            key = str(user_id)
+            user_data = _user_cache.get(key)
+            if user_data is None:
+                user_data = identity_map.fetch_one(
+                    "users", ObjectId(user_id), SESSION_USER_PROJECTION
+                )
+                if user_data is None:
+                    return None
+                _user_cache.set(key, user_data)
+            # Build a fresh User each time so requests never share one object
             return User.from_mongo(user_data)
         except (ValueError, TypeError, Exception) as e:
             # Invalid ObjectId or other error - return None to prevent crashes
             return None
 
+    @staticmethod
+    def invalidate_cached_user(user_id):
+        """Forget a user in both the process cache and the request's identity map."""
+        _user_cache.pop(str(user_id))
+        try:
+            identity_map.invalidate("users", ObjectId(user_id))
+        except (bson_errors.InvalidId, TypeError):
+            pass
+
+    @staticmethod
+    def configure_user_cache(maxsize=None, ttl=None):
+        """Resize the user cache (0 disables it); clears existing entries."""
+        _user_cache.configure(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def user_cache_stats():
+        """Hit/miss/eviction counters for the user cache."""
+        return _user_cache.stats()
+
     @staticmethod
     def verify_password(user, password):
         return bcrypt.check_password_hash(user.password_hash, password)
@@ -1,34 +1,16 @@
 let currentIndex = 0;
 
-async function generateThumbnail(pdfUrl, canvas) {
-    try {
-        pdfjsLib.GlobalWorkerOptions.workerSrc = 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js';
-
-        const loadingTask = pdfjsLib.getDocument(pdfUrl);
-        const pdf = await loadingTask.promise;
-        const page = await pdf.getPage(1);
-
-        const scale = 1; // Smaller scale for thumbnails
-        const viewport = page.getViewport({ scale });
-
-        const context = canvas.getContext('2d');
-        canvas.height = viewport.height;
-        canvas.width = viewport.width;
-
-        await page.render({
-            canvasContext: context,
-            viewport: viewport
-        }).promise;
-    } catch (error) {
-        console.error('Error generating thumbnail:', error);
-    }
-}
+// Infinite scroll state: the cursor for the next page and its prefetched response
+let nextCursor = null;
+let prefetched = null;
+let loading = false;
 
 function updateDetails(index) {
     if (!window.feedResumes || window.feedResumes.length === 0) return;
 
     const resume = window.feedResumes[index];
     const detailsDisplay = document.getElementById('details-display');
+    currentIndex = index;
 
     // Highlight selected thumbnail
     document.querySelectorAll('.thumbnail-card').forEach((card, i) => {
@@ -42,31 +24,157 @@ function updateDetails(index) {
             <p><strong>Skills:</strong> ${resume.skills || 'N/A'}</p>
             <p><strong>Experience:</strong> ${resume.experience_level || 'N/A'}</p>
             <p><strong>Location:</strong> ${resume.location || 'N/A'}</p>
+            <p><strong>Reviews:</strong> ${resume.review_count || 0} reviewer(s), ${resume.comment_count || 0} comment(s)</p>
             <a href="/resume/feedback/${resume._id}" class="view-resume-btn">Comment on this Resume</a>
         `;
     }
 }
 
-document.addEventListener('DOMContentLoaded', () => {
-    if (window.feedResumes && window.feedResumes.length > 0) {
-        // Generate all thumbnails
-        window.feedResumes.forEach((resume, index) => {
-            const canvas = document.getElementById(`thumbnail-${index}`);
-            if (canvas && resume._id) {
-                const pdfUrl = `/resume/${resume._id}/pdf`;
-                generateThumbnail(pdfUrl, canvas);
-            }
+function bindCard(card) {
+    card.addEventListener('click', () => {
+        updateDetails(parseInt(card.dataset.index));
+    });
+}
+
+function createCard(resume, index) {
+    const card = document.createElement('div');
+    card.className = 'thumbnail-card';
+    card.dataset.index = index;
+
+    if (resume.thumbnail_url) {
+        const img = document.createElement('img');
+        img.src = resume.thumbnail_url;
+        img.className = 'thumbnail-image';
+        img.loading = 'lazy';
+        img.decoding = 'async';
+        img.width = 600;
+        img.height = 776;
+        img.alt = `First page of ${resume.title || 'resume'}`;
+        card.appendChild(img);
+    }
+
+    const info = document.createElement('div');
+    info.className = 'thumbnail-info';
+    const title = document.createElement('h6');
+    title.textContent = resume.title || 'Untitled';
+    const experience = document.createElement('small');
+    experience.textContent = resume.experience_level || '';
+    info.append(title, experience);
+    card.appendChild(info);
+
+    bindCard(card);
+    return card;
+}
+
+function fetchPage(cursor) {
+    const url = new URL(window.feedApiUrl, window.location.origin);
+    url.searchParams.set('cursor', cursor);
+    return fetch(url, { credentials: 'same-origin', headers: { Accept: 'application/json' } })
+        .then(response => {
+            if (!response.ok) throw new Error(`Feed request failed: ${response.status}`);
+            return response.json();
         });
+}
 
-        // Add click handlers to thumbnail cards
-        document.querySelectorAll('.thumbnail-card').forEach(card => {
-            card.addEventListener('click', () => {
-                const index = parseInt(card.dataset.index);
-                updateDetails(index);
+// Start downloading the page after the one on screen while the user reads
+function prefetchNext() {
+    prefetched = nextCursor ? fetchPage(nextCursor) : null;
+    if (prefetched) prefetched.catch(() => { prefetched = null; });
+}
+
+function appendNextPage(grid, sentinel, onDone) {
+    if (loading || !nextCursor) return;
+    loading = true;
+
+    const page = prefetched || fetchPage(nextCursor);
+    prefetched = null;
+    page
+        .then(data => {
+            data.items.forEach(resume => {
+                const card = createCard(resume, window.feedResumes.length);
+                window.feedResumes.push(resume);
+                grid.insertBefore(card, sentinel);
             });
+            nextCursor = data.next_cursor;
+            prefetchNext();
+        })
+        .catch(error => {
+            console.error(error);
+        })
+        .finally(() => {
+            loading = false;
+            onDone();
         });
+}
+
+function setupInfiniteScroll() {
+    const grid = document.querySelector('.thumbnails-grid');
+    const sentinel = document.getElementById('feed-sentinel');
+    if (!grid || !sentinel || !window.feedApiUrl || !('IntersectionObserver' in window)) return;
+
+    nextCursor = window.feedNextCursor;
+    // Pages load as the grid scrolls, so the page links are only a no-JS fallback
+    const pagination = document.querySelector('.pagination');
+    if (pagination) pagination.hidden = true;
+    if (!nextCursor) return;
+
+    prefetchNext();
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            appendNextPage(grid, sentinel, () => {
+                // Re-observing reports the sentinel again if it is still in view
+                observer.unobserve(sentinel);
+                if (nextCursor) observer.observe(sentinel);
+            });
+        }
+    }, { root: grid, rootMargin: '0px 0px 400px 0px' });
+    observer.observe(sentinel);
+}
+
+function setupSuggestions() {
+    const input = document.querySelector('input[data-suggest-url]');
+    const list = document.getElementById('feed-suggestions');
+    if (!input || !list) return;
+
+    let timer = null;
+    let latest = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const prefix = input.value.trim();
+        if (!prefix) {
+            list.replaceChildren();
+            return;
+        }
+        // Wait for a pause in typing rather than requesting on every key
+        timer = setTimeout(() => {
+            const url = new URL(input.dataset.suggestUrl, window.location.origin);
+            url.searchParams.set('prefix', prefix);
+            latest = prefix;
+            fetch(url, { credentials: 'same-origin' })
+                .then(response => (response.ok ? response.json() : { suggestions: [] }))
+                .then(data => {
+                    // Ignore answers that arrive after a newer request was sent
+                    if (prefix !== latest) return;
+                    list.replaceChildren(...data.suggestions.map(suggestion => {
+                        const option = document.createElement('option');
+                        option.value = suggestion.text;
+                        option.label = `${suggestion.kind} · ${suggestion.count}`;
+                        return option;
+                    }));
+                })
+                .catch(error => console.error(error));
+        }, 120);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    if (window.feedResumes && window.feedResumes.length > 0) {
+        // Add click handlers to thumbnail cards
+        document.querySelectorAll('.thumbnail-card').forEach(bindCard);
 
         // Show first resume details
         updateDetails(0);
     }
-});
\ No newline at end of file
+    setupInfiniteScroll();
+    setupSuggestions();
+});
@@ -5,6 +5,7 @@
 // Usage:
 //   const viewer = createResumeViewer({
 //     pdfUrl: string,
+//     textLayerUrl: string, // optional precomputed text items + page geometry
 //     scale: number,
 //     containerId: "viewer",
 //     renderHighlightsForPage: (pageNum, viewport, highlightLayer) => {},
@@ -16,6 +17,7 @@
   function createResumeViewer({
     pdfUrl,
     pdfData,
+    textLayerUrl,
     scale = 1.5,
     containerId = "viewer",
     renderHighlightsForPage,
@@ -23,9 +25,42 @@
   }) {
     let pdfDocument = null;
 
-    async function renderPage(pageNum, pdfPage, container) {
-      const viewport = pdfPage.getViewport({ scale });
+    // Precomputed layer from the server, or null to fall back to pdf.js
+    async function loadTextLayer() {
+      if (!textLayerUrl) return null;
+      try {
+        const response = await fetch(textLayerUrl);
+        if (!response.ok) return null;
+        return await response.json();
+      } catch (err) {
+        return null;
+      }
+    }
+
+    // Expand the compact server items into pdf.js textContent
+    function toTextContent(layer, page) {
+      const styles = {};
+      layer.fonts.forEach((font, index) => {
+        styles["f" + index] = {
+          fontFamily: font.family,
+          ascent: 0.8,
+          descent: -0.2,
+          vertical: false,
+        };
+      });
+      const items = page.items.map(([str, a, b, c, d, e, f, width, hasEOL, font]) => ({
+        str,
+        dir: "ltr",
+        transform: [a, b, c, d, e, f],
+        width,
+        height: Math.hypot(c, d),
+        fontName: "f" + font,
+        hasEOL: Boolean(hasEOL),
+      }));
+      return { items, styles };
+    }
 
+    function createPageShell(viewport, container) {
       const pageDiv = document.createElement("div");
       pageDiv.className = "page-container";
       pageDiv.style.width = viewport.width + "px";
@@ -56,15 +91,17 @@
       pageDiv.appendChild(canvasWrapper);
       container.appendChild(pageDiv);
 
-      const renderContext = {
-        canvasContext: context,
-        viewport: viewport,
-      };
-      await pdfPage.render(renderContext).promise;
+      return { pageDiv, canvas, context, textLayer, highlightLayer };
+    }
+
+    // Lay out the text layer and highlights for one page; the canvas is
+    // painted separately once pdf.js has the page.
+    async function decoratePage(pageNum, viewport, shell, textContentSource) {
+      const { textLayer, highlightLayer } = shell;
 
       // Render text layer only when selection is needed
       if (onTextSelection) {
-        const textContent = await pdfPage.getTextContent();
+        const textContent = await textContentSource();
         await pdfjsLib.renderTextLayer({
           textContent,
           container: textLayer,
@@ -87,28 +124,65 @@
           }, 10);
         });
       }
+    }
 
-      return pageDiv;
+    async function paintCanvas(pdfPage, viewport, shell) {
+      await pdfPage.render({
+        canvasContext: shell.context,
+        viewport: viewport,
+      }).promise;
     }
 
     async function renderAll() {
       const source = pdfData ? { data: pdfData } : { url: pdfUrl };
-      pdfDocument = await pdfjsLib
-        .getDocument({
-          ...source,
-          cMapUrl:
-            "https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/cmaps/",
-          cMapPacked: true,
-        })
-        .promise;
+      const documentTask = pdfjsLib.getDocument({
+        ...source,
+        cMapUrl: "https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/cmaps/",
+        cMapPacked: true,
+      }).promise;
+      const layer = await loadTextLayer();
 
       const viewer = document.getElementById(containerId);
       viewer.innerHTML = "";
 
+      if (layer) {
+        // Page geometry is known up front: build every page, its text layer
+        // and highlights while pdf.js is still fetching the PDF.
+        const pages = layer.pages.map((page, index) => {
+          const viewport = new pdfjsLib.PageViewport({
+            viewBox: page.view,
+            scale,
+            rotation: page.rotate,
+            offsetX: 0,
+            offsetY: 0,
+          });
+          const shell = createPageShell(viewport, viewer);
+          return { page, index, viewport, shell };
+        });
+        for (const { page, index, viewport, shell } of pages) {
+          await decoratePage(index + 1, viewport, shell, async () =>
+            toTextContent(layer, page)
+          );
+        }
+
+        pdfDocument = await documentTask;
+        for (const { index, viewport, shell } of pages) {
+          const pdfPage = await pdfDocument.getPage(index + 1);
+          await paintCanvas(pdfPage, viewport, shell);
+        }
+        return;
+      }
+
+      pdfDocument = await documentTask;
       const numPages = pdfDocument.numPages;
       for (let pageNum = 1; pageNum <= numPages; pageNum++) {
         const pdfPage = await pdfDocument.getPage(pageNum);
-        await renderPage(pageNum, pdfPage, viewer);
+        const viewport = pdfPage.getViewport({ scale });
+        const shell = createPageShell(viewport, viewer);
+        await paintCanvas(pdfPage, viewport, shell);
+        await decoratePage(pageNum, viewport, shell, () =>
+          pdfPage.getTextContent()
+        );
       }
     }
 
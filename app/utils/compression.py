@@ -0,0 +1,38 @@
+import gzip
+from flask import request
+
+# Below this the gzip header and CPU cost outweigh the savings
+GZIP_MIN_SIZE = 1024
+
+
+def gzip_response(response, min_size=GZIP_MIN_SIZE, level=6):
+    """
+    Gzip a buffered response body if the client accepts it.
+
+    Streamed (direct passthrough) and already-encoded responses are returned
+    unchanged. mtime is fixed so identical bodies compress to identical bytes.
+
+    Args:
+        response: Flask response with the full body in memory
+        min_size: Smallest body, in bytes, worth compressing
+        level: zlib compression level
+
+    Returns:
+        The same response, compressed in place when worthwhile
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.direct_passthrough
+        or response.status_code != 200
+        or "Content-Encoding" in response.headers
+        or not request.accept_encodings["gzip"]
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=level, mtime=0))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
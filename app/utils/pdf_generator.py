@@ -4,11 +4,36 @@ import tempfile
 import shutil
 from pathlib import Path
 
+# pdflatex stamps the build time and a random /ID into every PDF. Pinning the
+# timestamp and dropping the ID makes identical LaTeX compile to identical
+# bytes, so ETags stay stable and outputs can be deduplicated by content.
+SOURCE_DATE_EPOCH = "946684800"  # 2000-01-01T00:00:00Z
+
+# Kept on one line so LaTeX error line numbers are only off by one
+REPRODUCIBLE_PREAMBLE = (
+    "\\ifdefined\\pdftrailerid\\pdftrailerid{}\\fi"
+    "\\ifdefined\\pdfinfoomitdate\\pdfinfoomitdate=1\\fi"
+    "\\ifdefined\\pdfsuppressptexinfo\\pdfsuppressptexinfo=-1\\fi\n"
+)
+
+
+def _reproducible_env():
+    """Environment for pdflatex with a fixed SOURCE_DATE_EPOCH.
+
+    FORCE_SOURCE_DATE is deliberately left unset so \\today in templates
+    still reflects the real compile date.
+    """
+    env = dict(os.environ)
+    env["SOURCE_DATE_EPOCH"] = SOURCE_DATE_EPOCH
+    return env
+
 
 def compile_latex_to_pdf(latex_content, output_dir=None):
     """
     Compile LaTeX content to PDF using pdflatex.
 
+    The output is reproducible: the same LaTeX always yields the same bytes.
+
     Args:
         latex_content: String containing LaTeX source code
         output_dir: Optional directory to save the PDF. If None, uses a temp directory.
@@ -26,7 +51,7 @@ def compile_latex_to_pdf(latex_content, output_dir=None):
         # Write LaTeX content to .tex file
         tex_file = os.path.join(temp_dir, "resume.tex")
         with open(tex_file, "w", encoding="utf-8") as f:
-            f.write(latex_content)
+            f.write(REPRODUCIBLE_PREAMBLE + latex_content)
 
         # Change to temp directory for compilation (pdflatex needs to be in the same dir)
         original_dir = os.getcwd()
@@ -41,6 +66,7 @@ def compile_latex_to_pdf(latex_content, output_dir=None):
                 capture_output=True,
                 text=True,
                 timeout=60,
+                env=_reproducible_env(),
             )
 
             # Run again to resolve references
@@ -49,6 +75,7 @@ def compile_latex_to_pdf(latex_content, output_dir=None):
                 capture_output=True,
                 text=True,
                 timeout=60,
+                env=_reproducible_env(),
             )
 
             # Check if PDF was generated
@@ -114,6 +141,8 @@ def compile_latex_to_pdf_bytes(latex_content):
     """
     Compile LaTeX content to PDF and return as bytes.
 
+    The output is reproducible: the same LaTeX always yields the same bytes.
+
     Args:
         latex_content: String containing LaTeX source code
 
@@ -131,7 +160,7 @@ def compile_latex_to_pdf_bytes(latex_content):
         # Write LaTeX content to .tex file
         tex_file = os.path.join(temp_dir, "resume.tex")
         with open(tex_file, "w", encoding="utf-8") as f:
-            f.write(latex_content)
+            f.write(REPRODUCIBLE_PREAMBLE + latex_content)
 
         # Change to temp directory for compilation
         original_dir = os.getcwd()
@@ -144,6 +173,7 @@ def compile_latex_to_pdf_bytes(latex_content):
                 capture_output=True,
                 text=True,
                 timeout=60,
+                env=_reproducible_env(),
             )
 
             result2 = subprocess.run(
@@ -151,6 +181,7 @@ def compile_latex_to_pdf_bytes(latex_content):
                 capture_output=True,
                 text=True,
                 timeout=60,
+                env=_reproducible_env(),
             )
 
             # Check if PDF was generated
@@ -0,0 +1,111 @@
+import io
+import os
+import subprocess
+import tempfile
+import shutil
+import threading
+from pypdf import PdfReader
+
+# qpdf exits with 3 when it succeeded but printed warnings
+QPDF_OK_CODES = (0, 3)
+
+_stats = {
+    "optimized": 0,
+    "failed": 0,
+    "bytes_before": 0,
+    "bytes_after": 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _page_count(pdf_bytes):
+    return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+
+def _record(success, bytes_before=0, bytes_after=0):
+    with _stats_lock:
+        if success:
+            _stats["optimized"] += 1
+            _stats["bytes_before"] += bytes_before
+            _stats["bytes_after"] += bytes_after
+        else:
+            _stats["failed"] += 1
+
+
+def optimizer_stats():
+    """Counters for this worker, including the total bytes saved so far."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["bytes_saved"] = stats["bytes_before"] - stats["bytes_after"]
+    return stats
+
+
+def optimize_pdf(pdf_bytes):
+    """
+    Linearize a PDF and pack its objects into compressed object streams with qpdf.
+
+    A linearized ("fast web view") file starts with everything needed for
+    page 1, so pdf.js can render it before the rest has arrived. The output
+    is only used if pypdf can open it and it has the same number of pages;
+    otherwise the original bytes are returned unchanged.
+
+    Args:
+        pdf_bytes: Bytes of the PDF document
+
+    Returns:
+        tuple: (pdf_bytes, success, error_message)
+            - pdf_bytes: Optimized bytes, or the original bytes if optimization failed
+            - success: Boolean indicating if the optimized output is being returned
+            - error_message: Error message if optimization failed (or None if successful)
+    """
+    temp_dir = None
+    try:
+        temp_dir = tempfile.mkdtemp()
+        input_path = os.path.join(temp_dir, "input.pdf")
+        output_path = os.path.join(temp_dir, "output.pdf")
+        with open(input_path, "wb") as f:
+            f.write(pdf_bytes)
+
+        result = subprocess.run(
+            [
+                "qpdf",
+                "--linearize",
+                "--object-streams=generate",
+                "--compress-streams=y",
+                "--recompress-flate",
+                # Derive /ID from the content so reproducible inputs stay reproducible
+                "--deterministic-id",
+                input_path,
+                output_path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+        if result.returncode not in QPDF_OK_CODES or not os.path.exists(output_path):
+            _record(False)
+            return (pdf_bytes, False, (result.stderr or "") + (result.stdout or ""))
+
+        with open(output_path, "rb") as f:
+            optimized = f.read()
+
+        if _page_count(optimized) != _page_count(pdf_bytes):
+            _record(False)
+            return (pdf_bytes, False, "Optimized PDF has a different page count")
+
+        _record(True, len(pdf_bytes), len(optimized))
+        return (optimized, True, None)
+
+    except FileNotFoundError:
+        _record(False)
+        return (pdf_bytes, False, "qpdf is not installed")
+    except subprocess.TimeoutExpired:
+        _record(False)
+        return (pdf_bytes, False, "PDF optimization timed out after 30 seconds")
+    except Exception as e:
+        _record(False)
+        return (pdf_bytes, False, f"Error during PDF optimization: {str(e)}")
+    finally:
+        if temp_dir and os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir, ignore_errors=True)
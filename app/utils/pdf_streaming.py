@@ -0,0 +1,231 @@
+import secrets
+from datetime import timezone
+from urllib.parse import quote
+
+from flask import Response, request
+from werkzeug.wsgi import wrap_file
+
+# Fallback read size when the stored file doesn't advertise a chunk size
+DEFAULT_CHUNK_SIZE = 255 * 1024
+
+# Stored files never change under a given id, so versioned URLs can be cached for a year
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def stored_file_etag(file_obj):
+    """Strong validator for a stored file, derived from its id and md5 checksum.
+
+    Files written before checksums were recorded fall back to their length,
+    which is still safe because a new upload or compile always gets a new id.
+    """
+    metadata = getattr(file_obj, "metadata", None) or {}
+    digest = metadata.get("md5") or file_obj.length
+    return f"{file_obj._id}-{digest}"
+
+
+def _content_disposition(download_name, as_attachment):
+    """Build a Content-Disposition value, RFC 5987-encoding non-ASCII names."""
+    disposition = "attachment" if as_attachment else "inline"
+    if not download_name:
+        return disposition
+    try:
+        download_name.encode("ascii")
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=UTF-8''{quote(download_name)}"
+    return f'{disposition}; filename="{download_name}"'
+
+
+def _resolve_ranges(byte_ranges, length):
+    """Turn parsed Range header ranges into sorted, merged (start, end) pairs.
+
+    End offsets are exclusive. Ranges that start past the end of the file are
+    dropped; an empty result means the request is unsatisfiable.
+    """
+    resolved = []
+    for start, stop in byte_ranges:
+        if start < 0:
+            # Suffix range: the last N bytes
+            start = max(0, length + start)
+            stop = length
+        else:
+            stop = length if stop is None else min(stop, length)
+        if start >= length or start >= stop:
+            continue
+        resolved.append((start, stop))
+
+    resolved.sort()
+    merged = []
+    for start, stop in resolved:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _iter_file_range(file_obj, start, stop):
+    """Yield the bytes in [start, stop) from a seekable stored file, chunk by chunk."""
+    chunk_size = getattr(file_obj, "chunk_size", None) or DEFAULT_CHUNK_SIZE
+    file_obj.seek(start)
+    position = start
+    while position < stop:
+        # Align reads to storage chunks so each read touches a single chunk
+        to_read = min(stop - position, chunk_size - (position % chunk_size))
+        data = file_obj.read(to_read)
+        if not data:
+            break
+        position += len(data)
+        yield data
+
+
+def _wants_full_body(etag, last_modified):
+    """Honour If-Range: a stale validator means the client needs the whole file."""
+    if_range = request.if_range
+    if not if_range or (if_range.date is None and if_range.etag is None):
+        return False
+    if if_range.etag is not None:
+        return if_range.etag != etag
+    if last_modified is not None:
+        return if_range.date < last_modified.replace(microsecond=0)
+    return True
+
+
+def _is_not_modified(etag, last_modified):
+    """Check If-None-Match (preferred) or If-Modified-Since against the file."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return request.if_modified_since >= last_modified.replace(microsecond=0)
+    return False
+
+
+def send_stored_file(
+    file_obj,
+    mimetype=None,
+    download_name=None,
+    as_attachment=False,
+    immutable=False,
+):
+    """Stream a stored (GridFS-style) file, honouring single and multiple byte ranges.
+
+    Args:
+        file_obj: Seekable file exposing _id, length, upload_date and optionally
+            chunk_size and metadata (e.g. a gridfs.GridOut)
+        mimetype: Content type to serve the file with
+        download_name: Filename offered to the browser
+        as_attachment: Whether to force a download instead of inline display
+        immutable: True when the request URL is versioned by file id, so the
+            response may be cached without revalidation
+
+    Returns:
+        Response: 304 when the client's copy is current, 200 with the whole
+        file, 206 for satisfiable ranges (multipart for more than one), or 416
+        when no requested range can be served
+    """
+    mimetype = mimetype or getattr(file_obj, "content_type", None) or "application/pdf"
+    length = file_obj.length
+    last_modified = file_obj.upload_date
+    if last_modified is not None and last_modified.tzinfo is None:
+        # GridFS stores naive UTC datetimes
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    etag = stored_file_etag(file_obj)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        ),
+        "Content-Disposition": _content_disposition(download_name, as_attachment),
+    }
+
+    byte_range = request.range
+    if _is_not_modified(etag, last_modified):
+        # Revalidation only needs the files document, never the chunk data
+        response = Response(status=304, headers=headers)
+    elif (
+        byte_range is None
+        or byte_range.units != "bytes"
+        or _wants_full_body(etag, last_modified)
+    ):
+        open_for_sendfile = getattr(file_obj, "open_for_sendfile", None)
+        handle = open_for_sendfile() if open_for_sendfile else None
+        # Files already on local disk go through wsgi.file_wrapper (sendfile)
+        body = (
+            wrap_file(request.environ, handle)
+            if handle is not None
+            else _iter_file_range(file_obj, 0, length)
+        )
+        response = Response(
+            body,
+            status=200,
+            mimetype=mimetype,
+            headers=headers,
+            direct_passthrough=True,
+        )
+        response.content_length = length
+    else:
+        ranges = _resolve_ranges(byte_range.ranges, length)
+        if not ranges:
+            headers["Content-Range"] = f"bytes */{length}"
+            response = Response(status=416, headers=headers)
+        elif len(ranges) == 1:
+            start, stop = ranges[0]
+            headers["Content-Range"] = f"bytes {start}-{stop - 1}/{length}"
+            response = Response(
+                _iter_file_range(file_obj, start, stop),
+                status=206,
+                mimetype=mimetype,
+                headers=headers,
+                direct_passthrough=True,
+            )
+            response.content_length = stop - start
+        else:
+            response = _multipart_range_response(
+                file_obj, ranges, length, mimetype, headers
+            )
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    close = getattr(file_obj, "close", None)
+    if close is not None:
+        response.call_on_close(close)
+    return response
+
+
+def _multipart_range_response(file_obj, ranges, length, mimetype, headers):
+    """Build a multipart/byteranges 206 response for several ranges."""
+    boundary = secrets.token_hex(16)
+    part_headers = [
+        (
+            f"--{boundary}\r\n"
+            f"Content-Type: {mimetype}\r\n"
+            f"Content-Range: bytes {start}-{stop - 1}/{length}\r\n\r\n"
+        ).encode("ascii")
+        for start, stop in ranges
+    ]
+    closing = f"--{boundary}--\r\n".encode("ascii")
+
+    def generate():
+        for part_header, (start, stop) in zip(part_headers, ranges):
+            yield part_header
+            yield from _iter_file_range(file_obj, start, stop)
+            yield b"\r\n"
+        yield closing
+
+    body_length = (
+        sum(len(h) for h in part_headers)
+        + sum(stop - start + 2 for start, stop in ranges)
+        + len(closing)
+    )
+    response = Response(
+        generate(),
+        status=206,
+        content_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers,
+        direct_passthrough=True,
+    )
+    response.content_length = body_length
+    return response
@@ -0,0 +1,146 @@
+import io
+import json
+import math
+from pypdf import PdfReader
+
+# Bump when the JSON layout changes so stale layers get rebuilt
+TEXT_LAYER_VERSION = 1
+
+# Glyph width (in 1/1000 em) for fonts without a /Widths array
+DEFAULT_GLYPH_WIDTH = 500
+
+
+def _multiply(m1, m2):
+    """Concatenate two PDF matrices [a, b, c, d, e, f] (m1 applied first)."""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return [
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2,
+        e1 * b2 + f1 * d2 + f2,
+    ]
+
+
+def _font_family(base_font):
+    """Map a PDF BaseFont name to the generic family pdf.js styles use."""
+    name = base_font.lower()
+    if any(key in name for key in ("mono", "courier", "cmtt")):
+        return "monospace"
+    if any(key in name for key in ("times", "roman", "serif", "cmr", "lmr")):
+        return "serif"
+    return "sans-serif"
+
+
+class _FontTable:
+    """Fonts seen while extracting, numbered in order of first use."""
+
+    def __init__(self):
+        self.fonts = []
+        self._index = {}
+        self._widths = {}
+
+    def lookup(self, font_dict):
+        base_font = str(font_dict.get("/BaseFont", "")).lstrip("/") if font_dict else ""
+        if base_font not in self._index:
+            self._index[base_font] = len(self.fonts)
+            self.fonts.append({"name": base_font, "family": _font_family(base_font)})
+            self._widths[base_font] = self._read_widths(font_dict)
+        return self._index[base_font], self._widths[base_font]
+
+    @staticmethod
+    def _read_widths(font_dict):
+        if not font_dict or "/Widths" not in font_dict:
+            return None
+        try:
+            widths = [float(w) for w in font_dict["/Widths"].get_object()]
+            first_char = int(font_dict.get("/FirstChar", 0))
+        except (TypeError, ValueError):
+            return None
+        known = [w for w in widths if w > 0]
+        average = sum(known) / len(known) if known else DEFAULT_GLYPH_WIDTH
+        return first_char, widths, average
+
+
+def _text_width(text, widths):
+    """Advance width of a string in text space units (ems)."""
+    if widths is None:
+        return len(text) * DEFAULT_GLYPH_WIDTH / 1000
+    first_char, table, average = widths
+    total = 0
+    for ch in text:
+        code = ord(ch) - first_char
+        total += table[code] if 0 <= code < len(table) else average
+    return total / 1000
+
+
+def _round(value):
+    rounded = round(value, 2)
+    return int(rounded) if rounded == int(rounded) else rounded
+
+
+def _extract_page(page, fonts):
+    items = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        if not text or not text.strip():
+            # A bare newline ends the previous item's line
+            if "\n" in (text or "") and items:
+                items[-1][8] = 1
+            return
+        index, widths = fonts.lookup(font_dict)
+        matrix = _multiply(tm, cm)
+        transform = _multiply([font_size, 0, 0, font_size, 0, 0], matrix)
+        scale_x = math.hypot(matrix[0], matrix[1])
+        width = _text_width(text.rstrip("\n"), widths) * font_size * scale_x
+        items.append(
+            [text.rstrip("\n")]
+            + [_round(v) for v in transform]
+            + [_round(width), 1 if text.endswith("\n") else 0, index]
+        )
+
+    page.extract_text(visitor_text=visit)
+
+    box = page.cropbox
+    return {
+        "view": [_round(float(v)) for v in box],
+        "rotate": int(page.get("/Rotate", 0) or 0) % 360,
+        "items": items,
+    }
+
+
+def extract_text_layer(pdf_bytes):
+    """
+    Extract per-page text items, positions and page geometry from a PDF.
+
+    The result mirrors what pdf.js' getTextContent() yields, so the viewer
+    can build its selectable text layer without parsing content streams in
+    the browser. Each item is a compact array:
+    [str, a, b, c, d, e, f, width, has_eol, font_index] where a..f is the
+    item's transform in PDF user space (font size folded in).
+
+    Args:
+        pdf_bytes: Bytes of the PDF document
+
+    Returns:
+        tuple: (json_bytes, success, error_message)
+            - json_bytes: Compact UTF-8 JSON (or None if extraction failed)
+            - success: Boolean indicating if extraction was successful
+            - error_message: Error message if extraction failed (or None if successful)
+    """
+    try:
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        fonts = _FontTable()
+        pages = [_extract_page(page, fonts) for page in reader.pages]
+        layer = {
+            "version": TEXT_LAYER_VERSION,
+            "num_pages": len(pages),
+            "fonts": fonts.fonts,
+            "pages": pages,
+        }
+        data = json.dumps(layer, separators=(",", ":"), ensure_ascii=False)
+        return (data.encode("utf-8"), True, None)
+    except Exception as e:
+        return (None, False, f"Error extracting text layer: {str(e)}")
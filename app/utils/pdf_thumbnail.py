@@ -0,0 +1,67 @@
+import os
+import subprocess
+import tempfile
+import shutil
+
+# Feed cards are ~300px wide; render at 2x for high-DPI screens
+THUMBNAIL_WIDTH = 600
+
+
+def render_first_page_png(pdf_bytes, width=THUMBNAIL_WIDTH):
+    """
+    Rasterise page 1 of a PDF to a PNG of a fixed width using pdftoppm.
+
+    Args:
+        pdf_bytes: Bytes of the PDF document
+        width: Width of the PNG in pixels; height follows the page aspect ratio
+
+    Returns:
+        tuple: (png_bytes, success, error_message)
+            - png_bytes: Bytes of the PNG image (or None if rendering failed)
+            - success: Boolean indicating if rendering was successful
+            - error_message: Error message if rendering failed (or None if successful)
+    """
+    temp_dir = None
+    try:
+        temp_dir = tempfile.mkdtemp()
+        pdf_path = os.path.join(temp_dir, "resume.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(pdf_bytes)
+
+        output_base = os.path.join(temp_dir, "thumbnail")
+        result = subprocess.run(
+            [
+                "pdftoppm",
+                "-png",
+                "-f",
+                "1",
+                "-l",
+                "1",
+                "-singlefile",
+                "-scale-to-x",
+                str(width),
+                "-scale-to-y",
+                "-1",
+                pdf_path,
+                output_base,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+        png_path = f"{output_base}.png"
+        if os.path.exists(png_path):
+            with open(png_path, "rb") as f:
+                return (f.read(), True, None)
+        return (None, False, (result.stderr or "") + (result.stdout or ""))
+
+    except FileNotFoundError:
+        return (None, False, "pdftoppm is not installed")
+    except subprocess.TimeoutExpired:
+        return (None, False, "Thumbnail rendering timed out after 30 seconds")
+    except Exception as e:
+        return (None, False, f"Error during thumbnail rendering: {str(e)}")
+    finally:
+        if temp_dir and os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,376 @@
+import base64
+import math
+import re
+import threading
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+# Expansion weights relative to an exact term match
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+MAX_PREFIX_TERMS = 50
+MAX_FUZZY_TERMS = 10
+MIN_FUZZY_LENGTH = 4
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+SNAPSHOT_VERSION = 2
+
+
+def _encode_array(values):
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode_array(typecode, text):
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    return values
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping things like c++, c# and node.js whole."""
+    if not text:
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Edit distance counting an adjacent transposition as one edit.
+
+    Returns limit + 1 as soon as the distance is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, 1):
+        current = [i]
+        for j, ch_b in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ch_a != ch_b),
+            )
+            if i > 1 and j > 1 and ch_a == b[j - 2] and a[i - 2] == ch_b:
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking, prefix and fuzzy term matching.
+
+    Documents are added as {field: text} with per-field weights folded into
+    the term frequencies (a light BM25F). Each term's postings are two parallel
+    compact arrays (internal doc numbers and weighted frequencies), appended in
+    doc-number order. Re-adding a key tombstones the old doc number; tombstones
+    are skipped at query time and dropped by compact().
+    """
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75):
+        self.field_weights = dict(field_weights or {})
+        self.k1 = k1
+        self.b = b
+        self.watermark = 0.0
+        self._keys = []
+        self._numbers = {}
+        self._lengths = array("f")
+        self._timestamps = array("d")
+        self._live = bytearray()
+        self._live_count = 0
+        self._total_length = 0.0
+        self._postings = {}
+        self._trigrams = defaultdict(set)
+        self._sorted_terms = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._live_count
+
+    def __contains__(self, key):
+        return key in self._numbers
+
+    def keys(self):
+        with self._lock:
+            return list(self._numbers)
+
+    # -- writes ------------------------------------------------------------
+
+    def add(self, key, fields, timestamp=0.0):
+        """Index (or re-index) a document under key."""
+        frequencies = defaultdict(float)
+        length = 0.0
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for token in tokenize(text):
+                frequencies[token] += weight
+                length += weight
+
+        with self._lock:
+            self._remove_locked(key)
+            number = len(self._keys)
+            self._keys.append(key)
+            self._numbers[key] = number
+            self._lengths.append(length)
+            self._timestamps.append(timestamp or 0.0)
+            self._live.append(1)
+            self._live_count += 1
+            self._total_length += length
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("f"))
+                    for gram in trigrams(term):
+                        self._trigrams[gram].add(term)
+                    self._sorted_terms = None
+                postings[0].append(number)
+                postings[1].append(frequency)
+            if timestamp and timestamp > self.watermark:
+                self.watermark = timestamp
+            if self._needs_compaction():
+                self._compact_locked()
+
+    def remove(self, key):
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key):
+        number = self._numbers.pop(key, None)
+        if number is None:
+            return
+        self._live[number] = 0
+        self._live_count -= 1
+        self._total_length -= self._lengths[number]
+
+    def _needs_compaction(self):
+        dead = len(self._keys) - self._live_count
+        return dead > 1000 and dead > len(self._keys) // 4
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the rest."""
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        remap = array("i", [-1]) * len(self._keys)
+        keys, lengths, timestamps = [], array("f"), array("d")
+        for number, key in enumerate(self._keys):
+            if self._live[number]:
+                remap[number] = len(keys)
+                keys.append(key)
+                lengths.append(self._lengths[number])
+                timestamps.append(self._timestamps[number])
+
+        postings = {}
+        for term, (numbers, frequencies) in self._postings.items():
+            new_numbers, new_frequencies = array("I"), array("f")
+            for number, frequency in zip(numbers, frequencies):
+                if remap[number] >= 0:
+                    new_numbers.append(remap[number])
+                    new_frequencies.append(frequency)
+            if new_numbers:
+                postings[term] = (new_numbers, new_frequencies)
+
+        self._keys = keys
+        self._numbers = {key: number for number, key in enumerate(keys)}
+        self._lengths = lengths
+        self._timestamps = timestamps
+        self._live = bytearray(b"\x01") * len(keys)
+        self._postings = postings
+        self._rebuild_trigrams()
+
+    def _rebuild_trigrams(self):
+        self._trigrams = defaultdict(set)
+        for term in self._postings:
+            for gram in trigrams(term):
+                self._trigrams[gram].add(term)
+        self._sorted_terms = None
+
+    # -- queries -----------------------------------------------------------
+
+    def _prefix_terms(self, prefix):
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        matches = []
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix):
+            if terms[i] != prefix:
+                matches.append(terms[i])
+            i += 1
+        if len(matches) > MAX_PREFIX_TERMS:
+            matches = heapq.nlargest(
+                MAX_PREFIX_TERMS, matches, key=lambda t: len(self._postings[t][0])
+            )
+        return matches
+
+    def _fuzzy_terms(self, token):
+        if len(token) < MIN_FUZZY_LENGTH:
+            return []
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for term in self._trigrams.get(gram, ()):
+                shared[term] += 1
+        limit = 1 if len(token) < 8 else 2
+        candidates = []
+        for term, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(term) + 1)
+            if similarity < MIN_TRIGRAM_SIMILARITY or term == token:
+                continue
+            distance = edit_distance(token, term, limit)
+            if distance <= limit:
+                candidates.append((similarity, term))
+        return [term for _, term in heapq.nlargest(MAX_FUZZY_TERMS, candidates)]
+
+    def expand(self, token, prefix=False):
+        """Map a query token to {index term: weight}."""
+        expansions = {}
+        if token in self._postings:
+            expansions[token] = 1.0
+        if prefix:
+            for term in self._prefix_terms(token):
+                expansions.setdefault(term, PREFIX_WEIGHT)
+        if not expansions:
+            for term in self._fuzzy_terms(token):
+                expansions[term] = FUZZY_WEIGHT
+        return expansions
+
+    def search(
+        self,
+        query,
+        limit=20,
+        offset=0,
+        now=None,
+        recency_weight=0.0,
+        half_life_days=30.0,
+        allowed=None,
+    ):
+        """Rank documents matching every query token.
+
+        The last token is also matched as a prefix (search-as-you-type), and a
+        token ending in * always is. Tokens with no exact or prefix match fall
+        back to typo-tolerant matches. BM25 scores are multiplied by
+        1 + recency_weight * 2^(-age / half_life). When allowed is given, only
+        documents whose key is in it are returned.
+
+        Returns:
+            tuple: (list of (key, score), total number of matches)
+        """
+        raw_tokens = query.lower().split()
+        if not raw_tokens:
+            return [], 0
+
+        with self._lock:
+            if not self._live_count:
+                return [], 0
+            average_length = self._total_length / self._live_count or 1.0
+            scores = defaultdict(float)
+            matched = defaultdict(int)
+            token_count = 0
+
+            for position, raw in enumerate(raw_tokens):
+                is_last = position == len(raw_tokens) - 1
+                for token in tokenize(raw):
+                    token_count += 1
+                    prefix = raw.endswith("*") or (is_last and not query.endswith(" "))
+                    best = {}
+                    for term, weight in self.expand(token, prefix=prefix).items():
+                        self._score_term(term, weight, average_length, best)
+                    for number, score in best.items():
+                        scores[number] += score
+                        matched[number] += 1
+
+            hits = [n for n, count in matched.items() if count == token_count]
+            if allowed is not None:
+                hits = [n for n in hits if self._keys[n] in allowed]
+            if recency_weight and now:
+                half_life = half_life_days * 86400.0
+                for number in hits:
+                    age = max(0.0, now - self._timestamps[number])
+                    scores[number] *= 1 + recency_weight * 0.5 ** (age / half_life)
+
+            top = heapq.nlargest(offset + limit, hits, key=lambda n: scores[n])
+            results = [(self._keys[n], scores[n]) for n in top[offset:]]
+            return results, len(hits)
+
+    def _score_term(self, term, weight, average_length, best):
+        """Add weight * BM25(term) per live doc into best, keeping the max per doc."""
+        numbers, frequencies = self._postings[term]
+        # Postings still hold tombstoned docs until compaction
+        document_frequency = min(len(numbers), self._live_count)
+        idf = math.log(
+            1
+            + (self._live_count - document_frequency + 0.5) / (document_frequency + 0.5)
+        )
+        k1, b = self.k1, self.b
+        for number, frequency in zip(numbers, frequencies):
+            if not self._live[number]:
+                continue
+            norm = k1 * (1 - b + b * self._lengths[number] / average_length)
+            score = weight * idf * frequency * (k1 + 1) / (frequency + norm)
+            if number not in best or score > best[number]:
+                best[number] = score
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": self._live_count,
+                "tombstones": len(self._keys) - self._live_count,
+                "terms": len(self._postings),
+                "postings": sum(len(p[0]) for p in self._postings.values()),
+            }
+
+    # -- persistence -------------------------------------------------------
+
+    def to_snapshot(self):
+        """JSON-serialisable state with arrays as base64-encoded raw bytes."""
+        with self._lock:
+            self._compact_locked()
+            return {
+                "version": SNAPSHOT_VERSION,
+                "field_weights": self.field_weights,
+                "k1": self.k1,
+                "b": self.b,
+                "watermark": self.watermark,
+                "keys": list(self._keys),
+                "lengths": _encode_array(self._lengths),
+                "timestamps": _encode_array(self._timestamps),
+                "postings": {
+                    term: [_encode_array(numbers), _encode_array(frequencies)]
+                    for term, (numbers, frequencies) in self._postings.items()
+                },
+            }
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Rebuild an index from to_snapshot() output; None if the format is stale."""
+        if not snapshot or snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        index = cls(snapshot["field_weights"], k1=snapshot["k1"], b=snapshot["b"])
+        index.watermark = snapshot["watermark"]
+        index._keys = list(snapshot["keys"])
+        index._numbers = {key: number for number, key in enumerate(index._keys)}
+        index._lengths = _decode_array("f", snapshot["lengths"])
+        index._timestamps = _decode_array("d", snapshot["timestamps"])
+        index._live = bytearray(b"\x01") * len(index._keys)
+        index._live_count = len(index._keys)
+        index._total_length = float(sum(index._lengths))
+        for term, (numbers, frequencies) in snapshot["postings"].items():
+            index._postings[term] = (
+                _decode_array("I", numbers),
+                _decode_array("f", frequencies),
+            )
+        index._rebuild_trigrams()
+        return index
@@ -0,0 +1,305 @@
+import math
+import threading
+import zlib
+import numpy as np
+from scipy import sparse
+from app.utils.search_index import tokenize
+
+# Hashed feature space; collisions are rare enough at this size not to matter
+N_FEATURES = 2**18
+# Pending rows are folded into the main matrix (and IDF refit) at this size
+MERGE_THRESHOLD = 512
+# Fraction of tombstoned rows that triggers compaction during a merge
+COMPACT_FRACTION = 0.25
+# Rows scored per matrix-vector product, bounding the temporary score arrays
+SCORE_CHUNK_ROWS = 8192
+
+
+def _term_weights(fields, field_weights, n_features):
+    """Weighted sublinear term counts keyed by hashed feature index.
+
+    Returns:
+        dict: {feature index: [weight, [term, ...]]}, where terms are the
+        "field:token" strings hashed to that index
+    """
+    counts = {}
+    for field in field_weights:
+        for token in tokenize(fields.get(field)):
+            term = f"{field}:{token}"
+            counts[term] = counts.get(term, 0) + 1
+
+    features = {}
+    for term, count in counts.items():
+        field = term.split(":", 1)[0]
+        index = zlib.crc32(term.encode()) % n_features
+        feature = features.setdefault(index, [0.0, []])
+        feature[0] += field_weights[field] * (1 + math.log(count))
+        feature[1].append(term)
+    return features
+
+
+def hashed_features(fields, field_weights, n_features=N_FEATURES):
+    """Hash {field: text} into a sparse vector of weighted sublinear term counts.
+
+    Terms are namespaced by field ("skills:python" and "text:python" are
+    different features) and weighted by field_weights.
+
+    Returns:
+        tuple: (sorted unique int32 feature indices, float32 values)
+    """
+    features = _term_weights(fields, field_weights, n_features)
+    indices = np.fromiter(sorted(features), dtype=np.int32, count=len(features))
+    data = np.array([features[i][0] for i in indices.tolist()], dtype=np.float32)
+    return indices, data
+
+
+def _csr(rows, n_features):
+    """Stack (indices, values) pairs into a CSR matrix."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    for i, (indices, _) in enumerate(rows):
+        indptr[i + 1] = indptr[i] + len(indices)
+    if rows:
+        indices = np.concatenate([r[0] for r in rows])
+        data = np.concatenate([r[1] for r in rows])
+    else:
+        indices = np.zeros(0, dtype=np.int32)
+        data = np.zeros(0, dtype=np.float32)
+    return sparse.csr_matrix(
+        (data, indices, indptr), shape=(len(rows), n_features), dtype=np.float32
+    )
+
+
+def _row_block(matrix, start, end):
+    """Rows start:end of a CSR matrix as a view over its arrays (no copy)."""
+    indptr = matrix.indptr[start : end + 1]
+    first, last = indptr[0], indptr[-1]
+    return sparse.csr_matrix(
+        (matrix.data[first:last], matrix.indices[first:last], indptr - first),
+        shape=(end - start, matrix.shape[1]),
+    )
+
+
+class SimilarityIndex:
+    """Cosine nearest neighbours over hashed TF-IDF vectors.
+
+    Raw term weights live in a CSR matrix (one row per document) with a small
+    list of pending rows for recent writes. Queries score every row with one
+    sparse matrix-vector product against the L2-normalised TF-IDF matrix.
+    Re-adding a key tombstones its old row. Pending rows are merged, the IDF
+    refit and tombstones compacted once MERGE_THRESHOLD rows are pending.
+    """
+
+    def __init__(self, field_weights, n_features=N_FEATURES):
+        self.field_weights = dict(field_weights)
+        self.n_features = n_features
+        self.watermark = 0.0
+        self._keys = []
+        self._rows = {}
+        self._live = np.zeros(0, dtype=bool)
+        self._tf = _csr([], n_features)
+        self._pending = []
+        self._df = np.zeros(n_features, dtype=np.int32)
+        self._idf = np.ones(n_features, dtype=np.float32)
+        self._matrix = self._tf
+        self._pending_matrix = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, documents, field_weights, n_features=N_FEATURES):
+        """Index (key, fields, timestamp) triples in one pass."""
+        index = cls(field_weights, n_features)
+        rows = []
+        for key, fields, timestamp in documents:
+            index._keys.append(key)
+            index._rows[key] = len(rows)
+            rows.append(hashed_features(fields, index.field_weights, n_features))
+            index.watermark = max(index.watermark, timestamp or 0.0)
+        index._tf = _csr(rows, n_features)
+        index._live = np.ones(len(rows), dtype=bool)
+        index._df = np.bincount(index._tf.indices, minlength=n_features).astype(
+            np.int32
+        )
+        index._refit()
+        return index
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    # -- writes ------------------------------------------------------------
+
+    def add(self, key, fields, timestamp=0.0):
+        """Index (or re-index) one document."""
+        row = hashed_features(fields, self.field_weights, self.n_features)
+        with self._lock:
+            self._remove_locked(key)
+            self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            self._live = np.append(self._live, True)
+            self._pending.append(row)
+            self._pending_matrix = None
+            self._df[row[0]] += 1
+            if timestamp and timestamp > self.watermark:
+                self.watermark = timestamp
+            if len(self._pending) >= MERGE_THRESHOLD:
+                self._merge()
+
+    def remove(self, key):
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key):
+        number = self._rows.pop(key, None)
+        if number is None:
+            return
+        self._live[number] = False
+        self._df[self._row_indices(number)] -= 1
+
+    def _row_indices(self, number):
+        merged = self._tf.shape[0]
+        if number < merged:
+            start, end = self._tf.indptr[number], self._tf.indptr[number + 1]
+            return self._tf.indices[start:end]
+        return self._pending[number - merged][0]
+
+    def _merge(self):
+        self._tf = sparse.vstack([self._tf, _csr(self._pending, self.n_features)])
+        self._tf = self._tf.tocsr()
+        self._pending = []
+        dead = len(self._keys) - len(self._rows)
+        if dead and dead >= COMPACT_FRACTION * len(self._keys):
+            self._tf = self._tf[self._live]
+            self._keys = [k for k, live in zip(self._keys, self._live) if live]
+            self._rows = {key: number for number, key in enumerate(self._keys)}
+            self._live = np.ones(len(self._keys), dtype=bool)
+        self._refit()
+
+    def _refit(self):
+        """Recompute IDF from live document frequencies and reweight every row."""
+        n = max(len(self._rows), 1)
+        self._idf = (np.log((1 + n) / (1 + np.maximum(self._df, 0))) + 1).astype(
+            np.float32
+        )
+        self._matrix = self._weigh(self._tf)
+        self._pending_matrix = None
+
+    def _weigh(self, tf):
+        weighted = tf @ sparse.diags(self._idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags((1 / norms).astype(np.float32)) @ weighted
+
+    # -- queries -----------------------------------------------------------
+
+    def _blocks(self):
+        """(first row number, weighted matrix) for the merged and pending rows."""
+        if self._pending and self._pending_matrix is None:
+            self._pending_matrix = self._weigh(_csr(self._pending, self.n_features))
+        yield 0, self._matrix
+        if self._pending:
+            yield self._matrix.shape[0], self._pending_matrix
+
+    def _weighted_row(self, number):
+        for first, matrix in self._blocks():
+            if number < first + matrix.shape[0]:
+                return _row_block(matrix, number - first, number - first + 1)
+
+    def _top(self, query, k, exclude=None):
+        """Best k live rows by dot product with a dense query vector.
+
+        Rows are scored SCORE_CHUNK_ROWS at a time and only each chunk's
+        top k are kept, so memory stays flat however many rows there are.
+
+        Returns:
+            list: [(row number, score), ...], best first, scores > 0 only
+        """
+        numbers, values = [], []
+        for first, matrix in self._blocks():
+            for start in range(0, matrix.shape[0], SCORE_CHUNK_ROWS):
+                end = min(start + SCORE_CHUNK_ROWS, matrix.shape[0])
+                scores = _row_block(matrix, start, end) @ query
+                scores[~self._live[first + start : first + end]] = 0
+                if exclude is not None and first + start <= exclude < first + end:
+                    scores[exclude - first - start] = 0
+                candidates = np.flatnonzero(scores > 0)
+                if len(candidates) > k:
+                    best = np.argpartition(-scores[candidates], k - 1)[:k]
+                    candidates = candidates[best]
+                numbers.append(candidates + first + start)
+                values.append(scores[candidates])
+        if not numbers:
+            return []
+        numbers = np.concatenate(numbers)
+        values = np.concatenate(values)
+        order = np.lexsort((numbers, -values))[:k]
+        return list(zip(numbers[order].tolist(), values[order].tolist()))
+
+    def similar(self, key, k=10):
+        """The k live documents closest to key by cosine similarity.
+
+        Returns:
+            list: [(key, score), ...], best first, excluding key itself and
+            documents with nothing in common
+        """
+        with self._lock:
+            number = self._rows.get(key)
+            if number is None or k <= 0:
+                return []
+            row = self._weighted_row(number)
+            query = np.zeros(self.n_features, dtype=np.float32)
+            query[row.indices] = row.data
+            return [
+                (self._keys[i], score)
+                for i, score in self._top(query, k, exclude=number)
+            ]
+
+    def match(self, fields, k=10, explain=10):
+        """Rank every live document against an outside query, such as a job description.
+
+        The query is weighted with the index's own field weights and IDF, so
+        rare terms it shares with a document count for more than common ones.
+
+        Args:
+            fields: {field: text}; pass the same text under several fields to
+                match it against all of them
+            explain: Most matched terms to report per document
+
+        Returns:
+            list: [(key, cosine similarity, [matched token, ...]), ...], best
+            first, with tokens ordered by their contribution to the score
+        """
+        features = _term_weights(fields, self.field_weights, self.n_features)
+        if not features or k <= 0:
+            return []
+        indices = np.fromiter(features, dtype=np.int64, count=len(features))
+        weights = np.array([features[i][0] for i in features], dtype=np.float32)
+
+        with self._lock:
+            weights *= self._idf[indices]
+            query = np.zeros(self.n_features, dtype=np.float32)
+            query[indices] = weights / np.linalg.norm(weights)
+            results = []
+            for number, score in self._top(query, k):
+                row = self._weighted_row(number)
+                contributions = {}
+                for index, value in zip(row.indices.tolist(), row.data.tolist()):
+                    if query[index] > 0:
+                        for term in features[index][1]:
+                            token = term.split(":", 1)[1]
+                            contributions[token] = contributions.get(
+                                token, 0.0
+                            ) + float(query[index] * value)
+                terms = sorted(contributions, key=lambda t: (-contributions[t], t))
+                results.append((self._keys[number], score, terms[:explain]))
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._rows),
+                "tombstones": len(self._keys) - len(self._rows),
+                "pending": len(self._pending),
+                "nonzeros": int(self._tf.nnz) + sum(len(r[0]) for r in self._pending),
+            }
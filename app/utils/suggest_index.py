@@ -0,0 +1,144 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+# Prefixes matching more keys than this get their top completions cached
+SCAN_LIMIT = 256
+# Completions kept per cached prefix, and so the most complete() returns
+MAX_COMPLETIONS = 20
+MAX_CACHED_PREFIXES = 4096
+
+
+def normalize_prefix(text):
+    return " ".join(str(text or "").split()).casefold()
+
+
+def _match_keys(value):
+    """The value itself plus every suffix starting at a later word.
+
+    So "learn" completes "Machine Learning" as well as "Learning Rust".
+    """
+    words = value.split(" ")
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+class SuggestIndex:
+    """Weighted prefix completion over a sorted array of match keys.
+
+    Phrases are (kind, value) pairs, such as ("skill", "python"), each with a
+    display label and a count. Matching keys sit in a sorted list, so a prefix
+    is one bisect away from its range. Narrow ranges are ranked directly.
+    Wide ones, such as single letters, keep a cached top list that is dropped
+    whenever a phrase under that prefix changes count.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._phrases = {}
+        self._top = OrderedDict()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, phrases):
+        """Index from (kind, value, label, count) rows, sorting once."""
+        index = cls()
+        for kind, value, label, count in phrases:
+            if count > 0:
+                index._phrases[(kind, value)] = {
+                    "label": label or value,
+                    "count": count,
+                }
+                index._keys.extend((key, kind, value) for key in _match_keys(value))
+        index._keys.sort()
+        return index
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def update(self, kind, value, label=None, delta=1):
+        """Change a phrase's count by delta, adding or dropping it as needed."""
+        phrase = (kind, value)
+        with self._lock:
+            entry = self._phrases.get(phrase)
+            count = (entry["count"] if entry else 0) + delta
+            if count <= 0:
+                if entry:
+                    self._remove_locked(phrase)
+                return
+            if entry:
+                entry["count"] = count
+            else:
+                self._phrases[phrase] = {"label": label or value, "count": count}
+                for key in _match_keys(value):
+                    insort(self._keys, (key, kind, value))
+            self._invalidate_locked(value)
+
+    def _remove_locked(self, phrase):
+        kind, value = phrase
+        del self._phrases[phrase]
+        for key in _match_keys(value):
+            i = bisect_left(self._keys, (key, kind, value))
+            if i < len(self._keys) and self._keys[i] == (key, kind, value):
+                del self._keys[i]
+        self._invalidate_locked(value)
+
+    def _invalidate_locked(self, value):
+        for key in _match_keys(value):
+            for end in range(1, len(key) + 1):
+                self._top.pop(key[:end], None)
+
+    def _range(self, prefix):
+        lo = bisect_left(self._keys, (prefix,))
+        hi = bisect_left(self._keys, (prefix + "\uffff",), lo)
+        return lo, hi
+
+    def _rank(self, lo, hi, limit):
+        phrases = {(kind, value) for _, kind, value in self._keys[lo:hi]}
+        return heapq.nsmallest(
+            limit,
+            phrases,
+            key=lambda p: (-self._phrases[p]["count"], p[1]),
+        )
+
+    def complete(self, prefix, limit=8):
+        """Top completions for prefix, most frequent first.
+
+        Returns:
+            list: [{"text", "kind", "count"}, ...] with at most
+            min(limit, MAX_COMPLETIONS) entries
+        """
+        prefix = normalize_prefix(prefix)
+        limit = min(limit, MAX_COMPLETIONS)
+        if not prefix or limit <= 0:
+            return []
+
+        with self._lock:
+            top = self._top.get(prefix)
+            if top is not None:
+                self._top.move_to_end(prefix)
+            else:
+                lo, hi = self._range(prefix)
+                if hi - lo <= SCAN_LIMIT:
+                    top = self._rank(lo, hi, limit)
+                else:
+                    top = self._rank(lo, hi, MAX_COMPLETIONS)
+                    self._top[prefix] = top
+                    while len(self._top) > MAX_CACHED_PREFIXES:
+                        self._top.popitem(last=False)
+            return [
+                {
+                    "text": self._phrases[p]["label"],
+                    "kind": p[0],
+                    "count": self._phrases[p]["count"],
+                }
+                for p in top[:limit]
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "phrases": len(self._phrases),
+                "keys": len(self._keys),
+                "cached_prefixes": len(self._top),
+            }
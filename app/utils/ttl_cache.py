@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    The cache lives in one worker process, so other workers only see a write
+    once their copy expires; keep the TTL short enough that this is harmless.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key, default=None):
+        """Return a live cached value (refreshing its LRU position) or default."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._counters["misses"] += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def pop(self, key):
+        """Drop one entry, e.g. after the underlying record was written."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def configure(self, maxsize=None, ttl=None):
+        """Change size/TTL limits; existing entries are dropped."""
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if ttl is not None:
+            self.ttl = ttl
+        self.clear()
+
+    def stats(self):
+        """Counters plus current size and hit rate, for the metrics endpoint."""
+        with self._lock:
+            counters = dict(self._counters)
+            lookups = counters["hits"] + counters["misses"]
+            counters.update(
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                ttl=self.ttl,
+                hit_rate=round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            )
+            return counters
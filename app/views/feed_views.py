@@ -1,10 +1,374 @@
-from flask import Blueprint, render_template, request
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    jsonify,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import login_required
 from bson import ObjectId
 from app.extensions import mongo
+from app.services.resume_service import (
+    ResumeService,
+    FEED_CARD_PROJECTION,
+    OWNERSHIP_PROJECTION,
+)
+from app.services.search_service import SearchService
+from app.services.similarity_service import SimilarityService
+from app.services.feed_cache import FeedCache
+from app.services.suggest_service import SuggestService
+from app.services.facet_service import (
+    FacetService,
+    FACETS,
+    REVIEWS_FACET,
+    normalize_facet_value,
+)
+from app.utils.compression import gzip_response
 
 feed_bp = Blueprint("feed", __name__)
 
+CARD_FIELDS = (
+    "_id",
+    "user_id",
+    "pdf_url",
+    "thumbnail_url",
+    "filename",
+    "title",
+    "summary",
+    "skills",
+    "experience_level",
+    "location",
+    "review_count",
+    "comment_count",
+)
+API_DEFAULT_LIMIT = 20
+API_MAX_LIMIT = 50
+SUGGEST_DEFAULT_LIMIT = 8
+SIMILAR_DEFAULT_LIMIT = 5
+SIMILAR_MAX_LIMIT = 20
+# Seconds clients wait before asking again while a worker's index loads
+INDEX_RETRY_AFTER = 5
+MATCH_DEFAULT_LIMIT = 20
+MATCH_MAX_LIMIT = 100
+MAX_JOB_DESCRIPTION_LENGTH = 20_000
+# Newest first, with _id breaking ties so keyset cursors never skip or repeat
+FEED_SORT = [("created_at", -1), ("_id", -1)]
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Ranked ids checked against a facet filter per $in query
+FACET_CHECK_BATCH = 1000
+
+
+def _feed_card(r):
+    """Template fields for one resume card."""
+    structured_data = r.get("structured_data", {})
+
+    # Extract skills from all categories
+    skills_list = structured_data.get("skills", [])
+    all_skills = []
+    if isinstance(skills_list, list):
+        for skill_obj in skills_list:
+            if isinstance(skill_obj, dict):
+                all_skills.append(skill_obj.get("skills", ""))
+    skills_str = ", ".join(filter(None, all_skills))
+    if len(skills_str) > 50:
+        skills_str = skills_str[:50] + "..."
+
+    # Safe extraction for experience level and location
+    experience_level = "N/A"
+    exp_list = structured_data.get("experience", [])
+    if isinstance(exp_list, list) and len(exp_list) > 0:
+        item = exp_list[0]
+        if isinstance(item, dict):
+            role = item.get("role", "")
+            company = item.get("company", "")
+            if role and company:
+                experience_level = f"{role} at {company}"
+            elif role:
+                experience_level = role
+            elif company:
+                experience_level = company
+
+    location = ""
+    edu_list = structured_data.get("education", [])
+    if isinstance(edu_list, list) and len(edu_list) > 0:
+        item = edu_list[0]
+        if isinstance(item, dict):
+            location = item.get("location", "")
+
+    if not location and isinstance(exp_list, list) and len(exp_list) > 0:
+        item = exp_list[0]
+        if isinstance(item, dict):
+            location = item.get("location", "")
+
+    return {
+        "_id": str(r.get("_id")),
+        "user_id": r.get("user_id"),
+        "pdf_url": ResumeService.build_pdf_path(str(r.get("_id")), r.get("file_id")),
+        "thumbnail_url": (
+            ResumeService.build_thumbnail_path(str(r.get("_id")), r.get("file_id"))
+            if r.get("file_id")
+            else None
+        ),
+        "filename": r.get("filename", ""),
+        "title": r.get("title", structured_data.get("name", "Untitled")),
+        "summary": structured_data.get("professional_summary", ""),
+        "skills": skills_str,
+        "experience_level": experience_level,
+        "location": location or "N/A",
+        "review_count": (r.get("review_stats") or {}).get("reviewers", 0),
+        "comment_count": (r.get("review_stats") or {}).get("highlights", 0),
+    }
+
+
+FACET_TITLES = {
+    "skill": "Skills",
+    "role": "Roles",
+    "company": "Companies",
+    "school": "Schools",
+    "location": "Locations",
+    REVIEWS_FACET: "Reviews",
+}
+REVIEW_LABELS = {"none": "No reviews yet", "some": "Reviewed"}
+
+
+def _selected_facets():
+    """Facet filters from the query string, e.g. ?skill=python&skill=go."""
+    selected = {}
+    for facet in FACETS:
+        values = {normalize_facet_value(v) for v in request.args.getlist(facet)}
+        values.discard("")
+        if values:
+            selected[facet] = sorted(values)
+    return selected
+
+
+def _facet_sidebar(query, selected):
+    """Top values per facet with their rollup counts and toggle links.
+
+    Counts are over all resumes (from facet_counts), not the current results.
+    Selected values outside the top list are still shown so they can be cleared.
+    """
+    sidebar = []
+    top_values = FeedCache.get_or_build(("facet_counts",), FacetService.top_values)
+    for facet, values in top_values.items():
+        active = selected.get(facet, [])
+        shown = {v["value"] for v in values}
+        values = values + [
+            {"value": v, "label": v, "count": None} for v in active if v not in shown
+        ]
+        options = []
+        for value in values:
+            is_active = value["value"] in active
+            toggled = dict(selected)
+            toggled[facet] = (
+                [v for v in active if v != value["value"]]
+                if is_active
+                else active + [value["value"]]
+            )
+            label = value["label"] or value["value"]
+            if facet == REVIEWS_FACET:
+                label = REVIEW_LABELS.get(value["value"], label)
+            options.append(
+                {
+                    "label": label,
+                    "count": value["count"],
+                    "active": is_active,
+                    "url": url_for("feed.feed_home", q=query or None, **toggled),
+                }
+            )
+        if options:
+            sidebar.append({"title": FACET_TITLES[facet], "options": options})
+    return sidebar
+
+
+def _facet_ranked_ids(query, selected, facet_filter):
+    """Ranked search hits that also match a facet filter, intersected from the smaller side.
+
+    When the query matches no more resumes than the rarest selected facet
+    value (per the rollup), its hits are checked against the filter with $in
+    in rank order; otherwise the filter's ids restrict the ranking.
+
+    Returns:
+        list: Every matching resume id string, best first
+    """
+    bound = FacetService.max_matches(selected) or 0
+    ranked, hits = SearchService.search(query, limit=bound, offset=0)
+    if hits <= bound:
+        keys = [key for key, _ in ranked]
+        matching = set()
+        for start in range(0, len(keys), FACET_CHECK_BATCH):
+            batch = [ObjectId(key) for key in keys[start : start + FACET_CHECK_BATCH]]
+            cursor = mongo.db.resumes.find(
+                {"$and": [facet_filter, {"_id": {"$in": batch}}]}, {"_id": 1}
+            )
+            matching.update(str(doc["_id"]) for doc in cursor)
+        return [key for key in keys if key in matching]
+
+    allowed = {
+        str(doc["_id"]) for doc in mongo.db.resumes.find(facet_filter, {"_id": 1})
+    }
+    ranked, _ = SearchService.search(query, limit=hits, offset=0, allowed=allowed)
+    return [key for key, _ in ranked]
+
+
+def _search_page(query, skip, per_page, selected=None):
+    """One page of resumes ranked by the search index, plus the match count."""
+    facet_filter = FacetService.build_filter(selected or {})
+    if facet_filter:
+        keys = _facet_ranked_ids(query, selected, facet_filter)
+        total = len(keys)
+        keys = keys[skip : skip + per_page]
+    else:
+        ranked, total = SearchService.search(query, limit=per_page, offset=skip)
+        keys = [resume_id for resume_id, _ in ranked]
+    ids = [ObjectId(resume_id) for resume_id in keys]
+    docs = {
+        doc["_id"]: doc
+        for doc in mongo.db.resumes.find({"_id": {"$in": ids}}, FEED_CARD_PROJECTION)
+    }
+    return [docs[i] for i in ids if i in docs], total
+
+
+def _encode_cursor(position):
+    """Opaque URL-safe token for a feed position."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(token):
+    """Parse a cursor token into {"o": offset} or {"t": created_at ms, "id": _id}.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if isinstance(position, dict):
+        if isinstance(position.get("o"), int) and position["o"] >= 0:
+            return {"o": position["o"]}
+        if isinstance(position.get("t"), int) and ObjectId.is_valid(position.get("id")):
+            return {"t": position["t"], "id": position["id"]}
+    raise ValueError("Invalid cursor")
+
+
+def _keyset_position(doc):
+    """Cursor position just after doc in FEED_SORT order."""
+    created_at = doc.get("created_at")
+    if not isinstance(created_at, datetime):
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return {
+        "t": (created_at - EPOCH) // timedelta(milliseconds=1),
+        "id": str(doc["_id"]),
+    }
+
+
+def _after(position):
+    """Filter for resumes that sort after a keyset position."""
+    created_at = EPOCH + timedelta(milliseconds=position["t"])
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": ObjectId(position["id"])}},
+        ]
+    }
+
+
+def _sorted_filter(query, facet_filter):
+    filters = dict(facet_filter)
+    if query:
+        filters["$text"] = {"$search": query}
+    return filters
+
+
+def _use_search_index(query):
+    return query and current_app.config.get("SEARCH_BACKEND", "index") == "index"
+
+
+def _feed_results(query, selected, skip, per_page):
+    """Cards for one feed page, the total match count and a cursor for the next page."""
+    facet_filter = FacetService.build_filter(selected)
+
+    if _use_search_index(query):
+        # Ranked by relevance and recency together
+        docs, total = _search_page(query, skip, per_page, selected)
+        end = skip + len(docs)
+        next_position = {"o": end} if end < total else None
+    else:
+        filters = _sorted_filter(query, facet_filter)
+        docs = list(
+            mongo.db.resumes.find(filters, FEED_CARD_PROJECTION)
+            .sort(FEED_SORT)
+            .skip(skip)
+            .limit(per_page)
+        )
+
+        # Get total count for pagination
+        total = mongo.db.resumes.count_documents(filters)
+        next_position = None
+        if docs and skip + len(docs) < total:
+            next_position = _keyset_position(docs[-1]) or {"o": skip + len(docs)}
+
+    return [_feed_card(r) for r in docs], total, next_position
+
+
+def _feed_api_page(query, selected, position, limit):
+    """Cards after a cursor position plus the position of the page after them.
+
+    Ranked search pages by offset; the newest-first feed uses a keyset on
+    (created_at, _id) so deep pages cost the same as the first.
+    """
+    facet_filter = FacetService.build_filter(selected)
+    position = position or {"o": 0}
+
+    if _use_search_index(query):
+        offset = position.get("o", 0)
+        docs, total = _search_page(query, offset, limit, selected)
+        end = offset + len(docs)
+        return [_feed_card(r) for r in docs], ({"o": end} if end < total else None)
+
+    filters = _sorted_filter(query, facet_filter)
+    if "t" in position:
+        filters = {"$and": [filters, _after(position)]} if filters else _after(position)
+    cursor = mongo.db.resumes.find(filters, FEED_CARD_PROJECTION).sort(FEED_SORT)
+    if position.get("o"):
+        cursor = cursor.skip(position["o"])
+    # One extra document tells us whether there is a next page
+    docs = list(cursor.limit(limit + 1))
+
+    next_position = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_position = _keyset_position(docs[-1]) or {
+            "o": position.get("o", 0) + limit
+        }
+    return [_feed_card(r) for r in docs], next_position
+
+
+def _requested_fields():
+    """Card fields named in ?fields=a,b (all of them by default); _id is always included.
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    raw = request.args.get("fields")
+    if not raw:
+        return CARD_FIELDS
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in CARD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ("_id",) + tuple(field for field in fields if field != "_id")
+
 
 @feed_bp.route("/feed")
 @login_required
@@ -15,82 +379,170 @@ def feed_home():
     query = request.args.get("q", "")
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
-
-    # Build MongoDB filter
-    filters = {}
-
-    if query:
-        filters["$text"] = {"$search": query}
-
-    # Get all resumes from MongoDB
     skip = (page - 1) * per_page
-    resumes_cursor = (
-        mongo.db.resumes.find(filters).sort("created_at", -1).skip(skip).limit(per_page)
-    )
+    selected = _selected_facets()
 
-    resumes = []
-    for r in resumes_cursor:
-        structured_data = r.get("structured_data", {})
-
-        # Extract skills from all categories
-        skills_list = structured_data.get("skills", [])
-        all_skills = []
-        if isinstance(skills_list, list):
-            for skill_obj in skills_list:
-                if isinstance(skill_obj, dict):
-                    all_skills.append(skill_obj.get("skills", ""))
-        skills_str = ", ".join(filter(None, all_skills))
-        if len(skills_str) > 50:
-            skills_str = skills_str[:50] + "..."
-
-        # Safe extraction for experience level and location
-        experience_level = "N/A"
-        exp_list = structured_data.get("experience", [])
-        if isinstance(exp_list, list) and len(exp_list) > 0:
-            item = exp_list[0]
-            if isinstance(item, dict):
-                role = item.get("role", "")
-                company = item.get("company", "")
-                if role and company:
-                    experience_level = f"{role} at {company}"
-                elif role:
-                    experience_level = role
-                elif company:
-                    experience_level = company
-
-        location = ""
-        edu_list = structured_data.get("education", [])
-        if isinstance(edu_list, list) and len(edu_list) > 0:
-            item = edu_list[0]
-            if isinstance(item, dict):
-                location = item.get("location", "")
-
-        if not location and isinstance(exp_list, list) and len(exp_list) > 0:
-            item = exp_list[0]
-            if isinstance(item, dict):
-                location = item.get("location", "")
-
-        resumes.append(
-            {
-                "_id": str(r.get("_id")),
-                "user_id": r.get("user_id"),
-                "filename": r.get("filename", ""),
-                "title": r.get("title", structured_data.get("name", "Untitled")),
-                "summary": structured_data.get("professional_summary", ""),
-                "skills": skills_str,
-                "experience_level": experience_level,
-                "location": location or "N/A",
-            }
+    loading = _search_index_loading(query)
+    if loading:
+        flash("Search is warming up, try again in a few seconds.")
+        resumes, total, next_position = [], 0, None
+    else:
+        resumes, total, next_position = FeedCache.get_or_build(
+            FeedCache.key(query, selected, page, per_page),
+            lambda: _feed_results(query, selected, skip, per_page),
         )
 
-    # Get total count for pagination
-    total = mongo.db.resumes.count_documents(filters)
-
-    return render_template(
+    html = render_template(
         "feed.html",
         resumes=resumes,
         query=query,
         page=page,
         per_page=per_page,
         total=total,
+        selected_facets=selected,
+        facet_sidebar=_facet_sidebar(query, selected),
+        feed_api_url=(
+            None
+            if loading
+            else url_for("feed.feed_api", q=query or None, limit=per_page, **selected)
+        ),
+        next_cursor=_encode_cursor(next_position) if next_position else None,
+    )
+    if loading:
+        return html, 503, {"Retry-After": str(INDEX_RETRY_AFTER)}
+    return html
+
+
+@feed_bp.route("/api/feed")
+@login_required
+def feed_api():
+    """Feed cards as compact JSON for infinite scroll.
+
+    Query parameters are those of /feed (q and facet filters) plus
+    cursor (the next_cursor of the previous response), limit and fields.
+    """
+    query = request.args.get("q", "")
+    limit = request.args.get("limit", API_DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), API_MAX_LIMIT)
+    cursor = request.args.get("cursor") or None
+    try:
+        fields = _requested_fields()
+        position = _decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    selected = _selected_facets()
+    if _search_index_loading(query):
+        return _index_building("Search is warming up, try again shortly")
+
+    cards, next_position = FeedCache.get_or_build(
+        FeedCache.key(query, selected, ("cursor", cursor), limit),
+        lambda: _feed_api_page(query, selected, position, limit),
     )
+
+    body = json.dumps(
+        {
+            "items": [{field: card[field] for field in fields} for card in cards],
+            "next_cursor": _encode_cursor(next_position) if next_position else None,
+        },
+        separators=(",", ":"),
+        default=str,
+    )
+    return gzip_response(current_app.response_class(body, mimetype="application/json"))
+
+
+@feed_bp.route("/api/feed/suggest")
+@login_required
+def feed_suggest():
+    """Completions for a partly typed skill, role, company or school."""
+    prefix = request.args.get("prefix", "")
+    limit = request.args.get("limit", SUGGEST_DEFAULT_LIMIT, type=int)
+    response = jsonify({"suggestions": SuggestService.suggest(prefix, limit)})
+    # Lets the browser reuse completions while the user backspaces and retypes
+    response.cache_control.private = True
+    response.cache_control.max_age = 60
+    return response
+
+
+@feed_bp.route("/api/resumes/<resume_id>/similar")
+@login_required
+def similar_resumes(resume_id):
+    """Cards for the resumes most like this one, with their cosine similarity."""
+    limit = request.args.get("limit", SIMILAR_DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), SIMILAR_MAX_LIMIT)
+    try:
+        fields = _requested_fields()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    matches = SimilarityService.similar(resume_id, limit)
+    if matches is None:
+        return _index_building()
+    if (
+        not matches
+        and ResumeService.find_resume(resume_id, OWNERSHIP_PROJECTION) is None
+    ):
+        return jsonify({"error": "Resume not found"}), 404
+
+    return jsonify({"items": _scored_cards(matches, fields)})
+
+
+@feed_bp.route("/api/resumes/match", methods=["POST"])
+@login_required
+def match_resumes():
+    """Rank every resume against a pasted job description.
+
+    Takes JSON {"job_description": str, "limit": int} and answers with the
+    best matches, each carrying its score and the terms it matched on.
+    """
+    data = request.get_json(silent=True) or {}
+    job_description = data.get("job_description")
+    if not isinstance(job_description, str) or not job_description.strip():
+        return jsonify({"error": "job_description is required"}), 400
+    if len(job_description) > MAX_JOB_DESCRIPTION_LENGTH:
+        return jsonify({"error": "job_description is too long"}), 400
+    try:
+        limit = int(data.get("limit", MATCH_DEFAULT_LIMIT))
+        fields = _requested_fields()
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    limit = min(max(limit, 1), MATCH_MAX_LIMIT)
+
+    matches = SimilarityService.match(job_description, limit)
+    if matches is None:
+        return _index_building()
+    cards = _scored_cards([(match_id, score) for match_id, score, _ in matches], fields)
+    terms = {match_id: matched for match_id, _, matched in matches}
+    for card in cards:
+        card["matched_terms"] = terms[card["_id"]]
+    return jsonify({"items": cards})
+
+
+def _index_building(message="Recommendations are warming up, try again shortly"):
+    """503 while this worker's similarity or search index is still loading."""
+    response = jsonify({"error": message})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(INDEX_RETRY_AFTER)
+    return response
+
+
+def _search_index_loading(query):
+    """True if a search needs this worker's index and it isn't loaded yet."""
+    return _use_search_index(query) and SearchService.index() is None
+
+
+def _scored_cards(matches, fields):
+    """Feed cards for (resume_id, score) pairs, in order, with score and link."""
+    ids = [ObjectId(match_id) for match_id, _ in matches]
+    docs = {
+        str(doc["_id"]): doc
+        for doc in mongo.db.resumes.find({"_id": {"$in": ids}}, FEED_CARD_PROJECTION)
+    }
+    items = []
+    for match_id, score in matches:
+        if match_id in docs:
+            card = _feed_card(docs[match_id])
+            item = {field: card[field] for field in fields}
+            item["score"] = round(score, 4)
+            item["url"] = url_for("resume.resume_feedback", resume_id=match_id)
+            items.append(item)
+    return items
@@ -0,0 +1,37 @@
+from flask import Blueprint, jsonify
+from flask_login import login_required
+from app.services.user_service import UserService
+from app.services.blob_storage import BlobStorage
+from app.services.search_service import SearchService
+from app.services.feed_cache import FeedCache
+from app.services.suggest_service import SuggestService
+from app.services.similarity_service import SimilarityService
+from app.utils.pdf_optimizer import optimizer_stats
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/api/metrics", methods=["GET"])
+@login_required
+def get_metrics():
+    """Report in-process cache counters for this worker."""
+    blob_cache = BlobStorage.cache()
+    search_index = SearchService.loaded_index()
+    suggest_index = SuggestService.loaded_index()
+    similarity_index = SimilarityService.loaded_index()
+    return (
+        jsonify(
+            {
+                "user_cache": UserService.user_cache_stats(),
+                "blob_cache": blob_cache.stats() if blob_cache else None,
+                "pdf_optimizer": optimizer_stats(),
+                "search_index": search_index.stats() if search_index else None,
+                "feed_cache": FeedCache.stats(),
+                "suggest_index": suggest_index.stats() if suggest_index else None,
+                "similarity_index": (
+                    similarity_index.stats() if similarity_index else None
+                ),
+            }
+        ),
+        200,
+    )
@@ -7,13 +7,19 @@ from flask import (
     flash,
     session,
     current_app,
-    send_file,
 )
 from flask_login import current_user
 from app.utils.pdf_parser import parse_resume_pdf
 from app.utils.latex_filler import fill_latex_template
 from app.utils.pdf_generator import compile_latex_to_pdf_bytes
-from app.services.resume_service import ResumeService
+from app.utils.pdf_streaming import send_stored_file
+from app.services.resume_service import (
+    ResumeService,
+    OWNERSHIP_PROJECTION,
+    PDF_POINTER_PROJECTION,
+    EDIT_PROJECTION,
+)
+from app.services.blob_storage import BlobStorage
 import os
 import io
 
@@ -364,39 +370,28 @@ def resume_form():
                 )
 
             current_resume_id = session.get("current_resume_id")
+
+            # If user uploaded a PDF, set it as the default in the same write
+            # They can still change to a template on the next page
+            uploaded_pdf_file_id = session.get("uploaded_pdf_file_id")
+            uploaded_pdf_filename = session.get("uploaded_pdf_filename")
+            extra_fields = None
+            if uploaded_pdf_file_id:
+                extra_fields = ResumeService.uploaded_pdf_fields(
+                    uploaded_pdf_file_id, uploaded_pdf_filename
+                )
+
             resume_id = ResumeService.save_resume_structured_data(
                 structured_data=structured_data,
                 user_id=user_id,
                 title=resume_title,
                 resume_id=current_resume_id,
+                extra_fields=extra_fields,
             )
 
             # Store resume_id in session for template selection
             session["current_resume_id"] = resume_id
 
-            # If user uploaded a PDF, set it as the default
-            # They can still change to a template on the next page
-            uploaded_pdf_file_id = session.get("uploaded_pdf_file_id")
-            uploaded_pdf_filename = session.get("uploaded_pdf_filename")
-
-            if uploaded_pdf_file_id:
-                from bson import ObjectId
-                from app.extensions import mongo
-
-                mongo.db.resumes.update_one(
-                    {"_id": ObjectId(resume_id)},
-                    {
-                        "$set": {
-                            "file_id": ObjectId(uploaded_pdf_file_id),
-                            "filename": uploaded_pdf_filename,
-                            "content_type": "application/pdf",
-                            "template_id": "uploaded",
-                            "template_name": "Uploaded PDF",
-                            "resume_path": f"/resume/{resume_id}/pdf",
-                        }
-                    },
-                )
-
             flash(
                 "Resume saved successfully! Please choose a template or use your uploaded PDF."
             )
@@ -436,16 +431,12 @@ def upload_resume():
 
         if file and file.filename.lower().endswith(".pdf"):
             try:
-                from gridfs import GridFS
-                from app.extensions import mongo
-
                 # Read the PDF content once
                 file.stream.seek(0)
                 pdf_content = file.read()
 
-                # Store the PDF in GridFS
-                fs = GridFS(mongo.db)
-                uploaded_pdf_file_id = fs.put(
+                # Store the PDF in blob storage
+                uploaded_pdf_file_id = ResumeService.store_file(
                     pdf_content,
                     filename=file.filename,
                     content_type=file.mimetype or "application/pdf",
@@ -507,10 +498,7 @@ def select_template():
             flash("Resume data not found. Please fill out the form again.")
             return redirect(url_for("resume_form.resume_form"))
 
-        from gridfs import GridFS
-        from app.extensions import mongo
         from datetime import datetime
-        from bson import ObjectId
 
         # Check if user chose to use their uploaded PDF
         if template_id == "uploaded_pdf":
@@ -526,18 +514,11 @@ def select_template():
 
             try:
                 # Update resume document to use the uploaded PDF as the final resume
-                mongo.db.resumes.update_one(
-                    {"_id": ObjectId(resume_id)},
-                    {
-                        "$set": {
-                            "file_id": ObjectId(uploaded_pdf_file_id),
-                            "filename": uploaded_pdf_filename,
-                            "content_type": "application/pdf",
-                            "template_id": "uploaded",
-                            "template_name": "Uploaded PDF",
-                            "resume_path": f"/resume/{resume_id}/pdf",
-                        }
-                    },
+                ResumeService.update_resume(
+                    resume_id,
+                    ResumeService.uploaded_pdf_fields(
+                        uploaded_pdf_file_id, uploaded_pdf_filename, resume_id
+                    ),
                 )
 
                 # Clear the uploaded PDF from session since it's now associated
@@ -600,37 +581,33 @@ def select_template():
                 flash(f"Error compiling PDF: {error_message[:200]}")
                 return redirect(url_for("resume_form.select_template"))
 
-            # Save LaTeX and PDF to GridFS
+            # Save LaTeX and PDF to blob storage
             from datetime import timezone
 
-            fs = GridFS(mongo.db)
-
             # Save LaTeX file
             latex_bytes = filled_latex.encode("utf-8")
-            latex_file_id = fs.put(
+            latex_file_id = ResumeService.store_file(
                 latex_bytes,
                 filename=f"resume_{resume_id}_{template_id}.tex",
                 content_type="text/x-latex",
             )
 
             # Save PDF file
-            pdf_file_id = fs.put(
+            pdf_file_id = ResumeService.store_file(
                 pdf_bytes,
                 filename=f"resume_{resume_id}_{template_id}.pdf",
                 content_type="application/pdf",
             )
 
             # Update resume document with PREVIEW fields
-            mongo.db.resumes.update_one(
-                {"_id": ObjectId(resume_id)},
+            ResumeService.update_resume(
+                resume_id,
                 {
-                    "$set": {
-                        "preview_file_id": pdf_file_id,
-                        "preview_latex_file_id": latex_file_id,
-                        "preview_template_id": template_id,
-                        "preview_template_name": template["name"],
-                        "preview_generated_at": datetime.now(timezone.utc),
-                    }
+                    "preview_file_id": pdf_file_id,
+                    "preview_latex_file_id": latex_file_id,
+                    "preview_template_id": template_id,
+                    "preview_template_name": template["name"],
+                    "preview_generated_at": datetime.now(timezone.utc),
                 },
             )
 
@@ -677,20 +654,16 @@ def edit_resume(resume_id):
         flash("Please log in to edit your resume.")
         return redirect(url_for("auth.login"))
 
-    from bson import ObjectId
-    from app.extensions import mongo
-    from app.services.resume_service import ResumeService
-
     try:
-        # Get structured data from MongoDB
-        structured_data = ResumeService.get_resume_structured_data(resume_id)
+        # Structured data, title and owner come back in one projected read
+        resume_doc = ResumeService.find_resume(resume_id, EDIT_PROJECTION)
+        structured_data = resume_doc.get("structured_data") if resume_doc else None
         if not structured_data:
             flash("Resume data not found.")
             return redirect(url_for("resume_form.resume_form"))
 
         # Check if user owns this resume
-        resume_doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
-        if not resume_doc or str(resume_doc.get("user_id")) != str(current_user.id):
+        if str(resume_doc.get("user_id")) != str(current_user.id):
             flash("You do not have permission to edit this resume.")
             return redirect(url_for("resume_form.resume_form"))
 
@@ -722,14 +695,9 @@ def preview_resume(resume_id):
         flash("Please log in to view your resume.")
         return redirect(url_for("auth.login"))
 
-    from app.services.resume_service import ResumeService
-    from bson import ObjectId
-    from gridfs import GridFS
-    from app.extensions import mongo
-
     try:
         # Get resume document
-        resume_doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        resume_doc = ResumeService.find_resume(resume_id, PDF_POINTER_PROJECTION)
         if not resume_doc:
             flash("Resume not found.")
             return redirect(url_for("resume_form.resume_form"))
@@ -752,12 +720,16 @@ def preview_resume(resume_id):
         if mode == "preview":
             # In preview mode, we might look for preview_template_name
             template_name = resume_doc.get("preview_template_name", template_name)
+            file_id = resume_doc.get("preview_file_id") or file_id
 
         return render_template(
             "resume_preview.html",
             resume_id=resume_id,
             template_name=template_name,
             mode=mode,
+            pdf_url=url_for(
+                "resume.get_resume_pdf_file", resume_id=resume_id, mode=mode, v=file_id
+            ),
         )
 
     except Exception as e:
@@ -776,13 +748,11 @@ def save_resume_selection(resume_id):
         flash("Please log in to save your resume.")
         return redirect(url_for("auth.login"))
 
-    from bson import ObjectId
-    from app.extensions import mongo
     from datetime import datetime, timezone
 
     try:
         # Get resume document
-        resume_doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        resume_doc = ResumeService.find_resume(resume_id, PDF_POINTER_PROJECTION)
         if not resume_doc:
             flash("Resume not found.")
             return redirect(url_for("resume_form.resume_form"))
@@ -815,17 +785,15 @@ def save_resume_selection(resume_id):
             update_data["latex_generated_at"] = resume_doc.get("preview_generated_at")
 
         # Clear preview fields
-        unset_data = {
-            "preview_file_id": "",
-            "preview_latex_file_id": "",
-            "preview_template_id": "",
-            "preview_template_name": "",
-            "preview_generated_at": "",
-        }
+        unset_data = [
+            "preview_file_id",
+            "preview_latex_file_id",
+            "preview_template_id",
+            "preview_template_name",
+            "preview_generated_at",
+        ]
 
-        mongo.db.resumes.update_one(
-            {"_id": ObjectId(resume_id)}, {"$set": update_data, "$unset": unset_data}
-        )
+        ResumeService.update_resume(resume_id, update_data, unset_data)
 
         flash("Resume saved successfully!")
         return redirect(url_for("resume_form.preview_resume", resume_id=resume_id))
@@ -848,13 +816,9 @@ def download_resume_pdf(resume_id):
         flash("Please log in to download your resume.")
         return redirect(url_for("auth.login"))
 
-    from bson import ObjectId
-    from gridfs import GridFS
-    from app.extensions import mongo
-
     try:
         # Get resume document
-        resume_doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        resume_doc = ResumeService.find_resume(resume_id, PDF_POINTER_PROJECTION)
         if not resume_doc:
             flash("Resume not found.")
             return redirect(url_for("resume_form.resume_form"))
@@ -864,15 +828,12 @@ def download_resume_pdf(resume_id):
             flash("You do not have permission to download this resume.")
             return redirect(url_for("resume_form.resume_form"))
 
-        # Get PDF from GridFS
-        file_id = resume_doc.get("file_id")
-        if not file_id:
+        # Get PDF from blob storage
+        pdf_file = BlobStorage.get_cached(resume_doc.get("file_id"))
+        if not pdf_file:
             flash("PDF not yet generated for this resume.")
             return redirect(url_for("resume_form.resume_form"))
 
-        fs = GridFS(mongo.db)
-        pdf_file = fs.get(file_id)
-
         # Get resume title for filename
         resume_title = resume_doc.get("title", "resume")
         # Sanitize filename
@@ -881,9 +842,9 @@ def download_resume_pdf(resume_id):
         ).rstrip()
         filename = f"{safe_title}.pdf" if safe_title else "resume.pdf"
 
-        # Serve PDF for download
-        return send_file(
-            io.BytesIO(pdf_file.read()),
+        # Stream the PDF for download straight from storage
+        return send_stored_file(
+            pdf_file,
             mimetype="application/pdf",
             as_attachment=True,
             download_name=filename,
@@ -905,13 +866,9 @@ def set_default_resume(resume_id):
         flash("Please log in to set your default resume.")
         return redirect(url_for("auth.login"))
 
-    from app.services.resume_service import ResumeService
-    from bson import ObjectId
-    from app.extensions import mongo
-
     try:
         # Get resume document
-        resume_doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        resume_doc = ResumeService.find_resume(resume_id, OWNERSHIP_PROJECTION)
         if not resume_doc:
             flash("Resume not found.")
             return redirect(url_for("resume_form.resume_form"))
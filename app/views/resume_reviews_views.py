@@ -1,10 +1,32 @@
-from flask import Blueprint, render_template, flash, current_app
+import json
+import time
+from flask import (
+    Blueprint,
+    Response,
+    render_template,
+    flash,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 from flask_login import login_required, current_user
-from app.services.resume_service import ResumeService
+from app.services.resume_service import (
+    ResumeService,
+    OWNERSHIP_PROJECTION,
+    REVIEWS_PAGE_SIZE,
+)
+from app.services.review_events import ReviewEvents
 from app.extensions import mongo
 
 resume_reviews_bp = Blueprint("resume_reviews", __name__)
 
+MAX_REVIEWS_PAGE_SIZE = 50
+# Comment lines keep proxies from closing an idle event stream
+EVENT_HEARTBEAT_SECONDS = 15
+# How long the browser waits before reopening a closed stream
+EVENT_RETRY_MS = 3000
+
 
 @resume_reviews_bp.route("/resume-reviews")
 @login_required
@@ -57,3 +79,94 @@ def resume_reviews_home():
             resume_entries=[],
             current_resume_id="",
         )
+
+
+def _owned_resume(resume_id):
+    resume_doc = ResumeService.find_resume(resume_id, OWNERSHIP_PROJECTION)
+    if not resume_doc or str(resume_doc.get("user_id")) != str(current_user.id):
+        return None
+    return resume_doc
+
+
+@resume_reviews_bp.route("/api/resumes/<resume_id>/reviews")
+@login_required
+def get_resume_reviews(resume_id):
+    """One page of the reviews on one of the current user's resumes."""
+    if not _owned_resume(resume_id):
+        return jsonify({"error": "Resume not found"}), 404
+
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = request.args.get("limit", REVIEWS_PAGE_SIZE, type=int)
+    limit = min(max(limit, 1), MAX_REVIEWS_PAGE_SIZE)
+    reviews, next_offset = ResumeService.get_reviews_page(resume_id, offset, limit)
+    return jsonify({"reviews": reviews, "next_offset": next_offset})
+
+
+@resume_reviews_bp.route("/api/resumes/<resume_id>/reviews/changes")
+@login_required
+def get_resume_review_changes(resume_id):
+    """Reviews on one of the current user's resumes written after ?since=<version>."""
+    if not _owned_resume(resume_id):
+        return jsonify({"error": "Resume not found"}), 404
+
+    since = max(request.args.get("since", 0, type=int), 0)
+    reviews, version = ResumeService.get_review_changes(resume_id, since)
+    return jsonify({"reviews": reviews, "version": version})
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def _review_event_stream(user_id, poll_interval, max_seconds):
+    """Yield a "review" event whenever one of the user's resumes changes version.
+
+    The first pass reports every resume, so a reconnecting page catches up
+    on anything it missed. The stream ends after max_seconds and the
+    browser reopens it after EVENT_RETRY_MS.
+    """
+    yield f"retry: {EVENT_RETRY_MS}\n\n"
+    known = {}
+    now = time.monotonic()
+    deadline = now + max_seconds
+    last_sent = now
+    generation = ReviewEvents.generation()
+    while True:
+        for resume_id, state in ReviewEvents.versions(user_id).items():
+            if known.get(resume_id) != state["version"]:
+                known[resume_id] = state["version"]
+                last_sent = time.monotonic()
+                yield _sse("review", {"resume_id": resume_id, **state})
+        now = time.monotonic()
+        if now >= deadline:
+            return
+        if now - last_sent >= EVENT_HEARTBEAT_SECONDS:
+            last_sent = now
+            yield ": keepalive\n\n"
+        generation = ReviewEvents.wait(
+            generation, min(poll_interval, deadline - now, EVENT_HEARTBEAT_SECONDS)
+        )
+
+
+@resume_reviews_bp.route("/api/resume-reviews/events")
+@login_required
+def resume_review_events():
+    """Server-Sent Events announcing new review versions on the user's resumes."""
+    if not ReviewEvents.open_stream(
+        current_app.config.get("REVIEW_EVENTS_MAX_STREAMS", 8)
+    ):
+        # 204 tells EventSource not to reconnect; the page still works,
+        # just without live updates
+        return Response(status=204)
+    stream = _review_event_stream(
+        str(current_user.id),
+        current_app.config.get("REVIEW_EVENTS_POLL_INTERVAL", 2.0),
+        current_app.config.get("REVIEW_EVENTS_MAX_SECONDS", 300),
+    )
+    response = Response(
+        stream_with_context(stream),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(ReviewEvents.close_stream)
+    return response
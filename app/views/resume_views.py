@@ -7,11 +7,13 @@ from flask import (
     request,
     flash,
     url_for,
-    send_file,
 )
 from flask_login import current_user, login_required
 from app.services.resume_service import ResumeService
 from app.services.user_service import UserService
+from app.services.text_layer_service import TextLayerService
+from app.services.thumbnail_service import ThumbnailService
+from app.utils.pdf_streaming import send_stored_file
 
 resume_bp = Blueprint("resume", __name__)
 
@@ -40,7 +42,11 @@ def resume_feedback(resume_id):
     return render_template(
         "resume_feedback.html",
         document_id=resume_id,
-        pdf_url=url_for("resume.get_resume_pdf_file", resume_id=resume_id),
+        pdf_url=url_for(
+            "resume.get_resume_pdf_file", resume_id=resume_id, v=str(_file._id)
+        ),
+        text_layer_url=ResumeService.build_text_layer_path(resume_id, _file._id),
+        similar_url=url_for("feed.similar_resumes", resume_id=resume_id),
         page_title=f"Resume Feedback - {doc.get('filename', 'Resume')}",
         resume_creator_name=resume_creator_name,
         resume_title=doc.get("title") or doc.get("filename", "Resume"),
@@ -78,23 +84,92 @@ def save_highlights():
     reviewer_id = str(current_user.id)
     reviewer_name = f"{current_user.first_name} {current_user.last_name}"
 
-    ResumeService.save_highlights(document_id, highlights, reviewer_id, reviewer_name)
+    try:
+        ResumeService.save_highlights(
+            document_id, highlights, reviewer_id, reviewer_name
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify({"status": "success"}), 200
 
 
+@resume_bp.route("/api/highlights", methods=["PATCH"])
+@login_required
+def patch_highlights():
+    """Apply incremental add/update/delete operations to the reviewer's highlights."""
+    data = request.get_json(silent=True) or {}
+    document_id = data.get("documentId")
+    operations = data.get("operations")
+
+    if not document_id or not operations:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    reviewer_id = str(current_user.id)
+    reviewer_name = f"{current_user.first_name} {current_user.last_name}"
+
+    try:
+        applied = ResumeService.apply_highlight_patch(
+            document_id, operations, reviewer_id, reviewer_name
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"status": "success", "applied": applied}), 200
+
+
 @resume_bp.route("/resume/<resume_id>/pdf")
 def get_resume_pdf_file(resume_id):
-    """Stream the stored PDF from MongoDB for viewing/downloading."""
+    """Stream the stored PDF from MongoDB for viewing/downloading.
+
+    URLs carrying ?v=<file_id> name one immutable PDF and are cached as such;
+    unversioned URLs must be revalidated, which is answered from the ETag.
+    """
     is_preview = request.args.get("mode") == "preview"
     doc, file_obj = ResumeService.get_resume_pdf(resume_id, is_preview=is_preview)
 
     if not file_obj:
         return jsonify({"error": "Resume not found"}), 404
 
-    return send_file(
+    return send_stored_file(
         file_obj,
         mimetype=doc.get("content_type", "application/pdf"),
         download_name=doc.get("filename", "resume.pdf"),
         as_attachment=False,
-        conditional=True,
+        immutable=request.args.get("v") == str(file_obj._id),
+    )
+
+
+@resume_bp.route("/resume/<resume_id>/thumbnail.png")
+def get_resume_thumbnail(resume_id):
+    """Serve the page-1 PNG used on feed cards.
+
+    The URL is versioned by the PDF's file id, so a matching ?v= response is
+    immutable; a new upload or compile changes the URL.
+    """
+    doc, thumbnail = ThumbnailService.get_current(resume_id)
+    if not thumbnail:
+        return jsonify({"error": "Thumbnail not available"}), 404
+
+    return send_stored_file(
+        thumbnail,
+        mimetype="image/png",
+        immutable=request.args.get("v") == str(doc.get("thumbnail_source_id")),
+    )
+
+
+@resume_bp.route("/resume/<resume_id>/text-layer.json")
+def get_resume_text_layer(resume_id):
+    """Serve the precomputed text items and page geometry for the viewer.
+
+    Versioned by the PDF's file id like the thumbnail, so a matching ?v=
+    response is immutable.
+    """
+    doc, text_layer = TextLayerService.get_current(resume_id)
+    if not text_layer:
+        return jsonify({"error": "Text layer not available"}), 404
+
+    return send_stored_file(
+        text_layer,
+        mimetype="application/json",
+        immutable=request.args.get("v") == str(doc.get("text_layer_source_id")),
     )
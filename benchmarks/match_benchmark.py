@@ -0,0 +1,63 @@
+"""Time job-description matching as the number of resumes grows.
+
+    python benchmarks/match_benchmark.py [--sizes 25000,50000,100000] [--queries 50]
+
+Builds a synthetic SimilarityIndex at each size and prints per-query latency
+for SimilarityIndex.match(), which should grow linearly with the resume count.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.similarity_service import SIMILARITY_WEIGHTS  # noqa: E402
+from app.utils.similarity_index import SimilarityIndex  # noqa: E402
+from similarity_benchmark import (  # noqa: E402
+    ROLES,
+    SKILLS,
+    WORDS,
+    percentile,
+    synthetic_fields,
+)
+
+
+def job_description(rng):
+    """A few hundred words of prose naming a role and a dozen skills."""
+    words = rng.choices(WORDS, k=300) + rng.sample(SKILLS, 12) + [rng.choice(ROLES)]
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="25000,50000,100000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    for size in [int(size) for size in args.sizes.split(",")]:
+        index = SimilarityIndex.build(
+            ((str(i), synthetic_fields(rng), 0.0) for i in range(size)),
+            SIMILARITY_WEIGHTS,
+        )
+        latencies = []
+        for _ in range(args.queries):
+            text = job_description(rng)
+            start = time.perf_counter()
+            index.match({field: text for field in SIMILARITY_WEIGHTS}, 20)
+            latencies.append((time.perf_counter() - start) * 1000)
+        p50 = percentile(latencies, 0.5)
+        print(
+            f"{size:>8} resumes: match(k=20) p50 {p50:.1f}ms  "
+            f"p95 {percentile(latencies, 0.95):.1f}ms  "
+            f"({p50 / size * 1e6:.1f}ns per resume)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Time the similar-resumes index on a synthetic corpus.
+
+    python benchmarks/similarity_benchmark.py [--resumes 100000] [--queries 500]
+
+Prints build time, matrix size and per-query latency percentiles for
+SimilarityIndex.similar(), plus the cost of incremental writes.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.similarity_service import SIMILARITY_WEIGHTS  # noqa: E402
+from app.utils.similarity_index import SimilarityIndex  # noqa: E402
+
+SKILLS = [f"skill{i}" for i in range(2000)]
+ROLES = [
+    f"{level} {title}"
+    for level in ("junior", "senior", "lead", "staff")
+    for title in ("engineer", "analyst", "designer", "manager", "scientist")
+]
+WORDS = [f"word{i}" for i in range(20000)]
+
+
+def synthetic_fields(rng):
+    return {
+        "skills": ", ".join(rng.sample(SKILLS, rng.randint(5, 25))),
+        "roles": " ".join(rng.choice(ROLES) for _ in range(rng.randint(1, 4))),
+        "text": " ".join(rng.choices(WORDS, k=rng.randint(80, 250))),
+    }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    index = SimilarityIndex.build(
+        ((str(i), synthetic_fields(rng), 0.0) for i in range(args.resumes)),
+        SIMILARITY_WEIGHTS,
+    )
+    print(f"build: {time.perf_counter() - start:.1f}s for {len(index)} resumes")
+    print(f"stats: {index.stats()}")
+
+    latencies = []
+    for _ in range(args.queries):
+        key = str(rng.randrange(args.resumes))
+        start = time.perf_counter()
+        index.similar(key, 10)
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(
+        f"similar(k=10): p50 {percentile(latencies, 0.5):.2f}ms  "
+        f"p95 {percentile(latencies, 0.95):.2f}ms  "
+        f"max {max(latencies):.2f}ms"
+    )
+
+    start = time.perf_counter()
+    for i in range(args.writes):
+        index.add(str(rng.randrange(args.resumes)), synthetic_fields(rng))
+    elapsed = time.perf_counter() - start
+    print(
+        f"add: {elapsed / args.writes * 1000:.2f}ms per write on average "
+        f"(including merges), {args.writes} writes"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,11 @@ if [ "$debug" = "true" ]; then
     exec flask run --host=0.0.0.0 --port=8000 --debug
 else
     echo "Starting Flask in production mode with Gunicorn..."
-    exec gunicorn --bind 0.0.0.0:8000 run:app
+    # Threaded workers: an open live-updates stream on /resume-reviews holds
+    # one thread, not a whole worker
+    exec gunicorn --bind 0.0.0.0:8000 \
+        --worker-class gthread \
+        --workers "${GUNICORN_WORKERS:-2}" \
+        --threads "${GUNICORN_THREADS:-16}" \
+        run:app
 fi
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Tests for pluggable blob storage backends and copying between them."""
+
+import hashlib
+import pytest
+import mongomock
+import mongomock.gridfs
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from app import create_app
+from app.commands import copy_blobs_command
+from app.extensions import mongo
+from app.services.blob_backends import (
+    GridFSBackend,
+    LocalBackend,
+    S3Backend,
+    _PositionedBlob,
+)
+from app.services.blob_storage import BlobStorage, create_backend
+from app.services.storage_gc_service import StorageGCService
+
+mongomock.gridfs.enable_gridfs_integration()
+
+PDF_BYTES = b"%PDF-1.4 " + bytes(range(256)) * 20
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a test app whose blobs live in a temporary directory."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["BLOB_STORAGE_BACKEND"] = "local"
+        app.config["BLOB_STORAGE_PATH"] = str(tmp_path / "blobs")
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def s3_backend():
+    """An S3 backend against moto's in-memory S3."""
+    boto3 = pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="resumes")
+        yield S3Backend("resumes", prefix="blobs/", client=client)
+
+
+def check_round_trip(backend):
+    file_id = backend.put(PDF_BYTES, "résumé.pdf", "application/pdf")
+    blob = backend.get(file_id)
+
+    assert blob._id == file_id
+    assert blob.length == len(PDF_BYTES)
+    assert blob.filename == "résumé.pdf"
+    assert blob.content_type == "application/pdf"
+    assert blob.metadata["md5"] == hashlib.md5(PDF_BYTES).hexdigest()
+    assert blob.read() == PDF_BYTES
+    blob.seek(100)
+    assert blob.read(10) == PDF_BYTES[100:110]
+    assert blob.tell() == 110
+
+    backend.delete(file_id)
+    assert backend.get(file_id) is None
+
+
+class TestPositionedBlob:
+    def test_subclasses_must_read_ranges(self):
+        class Unreadable(_PositionedBlob):
+            pass
+
+        with pytest.raises(TypeError):
+            Unreadable(ObjectId(), "a.pdf", "application/pdf", 1, None, None)
+
+
+class TestLocalBackend:
+    def test_round_trip(self, tmp_path):
+        check_round_trip(LocalBackend(str(tmp_path)))
+
+    def test_missing_and_invalid_ids(self, tmp_path):
+        backend = LocalBackend(str(tmp_path))
+
+        assert backend.get(ObjectId()) is None
+        assert backend.get("not-an-id") is None
+
+    def test_iter_files_respects_upload_date(self, tmp_path):
+        backend = LocalBackend(str(tmp_path))
+        old = backend.put(
+            b"old",
+            "old.pdf",
+            "application/pdf",
+            upload_date=datetime.now(timezone.utc) - timedelta(days=3),
+        )
+        backend.put(b"new", "new.pdf", "application/pdf")
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+        assert list(backend.iter_files(uploaded_before=cutoff)) == [(old, 3)]
+        assert len(list(backend.iter_files())) == 2
+
+
+class TestS3Backend:
+    def test_round_trip(self, s3_backend):
+        check_round_trip(s3_backend)
+
+    def test_keys_use_prefix(self, s3_backend):
+        file_id = s3_backend.put(b"data", "a.pdf", "application/pdf")
+
+        keys = s3_backend.client.list_objects_v2(Bucket="resumes")["Contents"]
+        assert [item["Key"] for item in keys] == [f"blobs/{file_id}"]
+        assert list(s3_backend.iter_files()) == [(file_id, 4)]
+
+    def test_iter_files_uses_stored_upload_date(self, s3_backend):
+        # As BlobStorage.copy writes it: LastModified is now, the upload is old
+        old = s3_backend.put(
+            b"old",
+            "old.pdf",
+            "application/pdf",
+            upload_date=datetime.now(timezone.utc) - timedelta(days=3),
+        )
+        s3_backend.put(b"new", "new.pdf", "application/pdf")
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+        assert list(s3_backend.iter_files(uploaded_before=cutoff)) == [(old, 3)]
+
+    def test_delete_many(self, s3_backend):
+        ids = [s3_backend.put(b"x", "x.pdf", "application/pdf") for _ in range(3)]
+
+        s3_backend.delete_many(ids)
+
+        assert list(s3_backend.iter_files()) == []
+
+
+class TestConfiguredBackend:
+    def test_backend_follows_config(self, app):
+        assert isinstance(BlobStorage.backend(), LocalBackend)
+
+    def test_unknown_backend(self, app):
+        with pytest.raises(ValueError):
+            create_backend("ftp", app.config)
+
+    def test_s3_requires_bucket(self, app):
+        with pytest.raises(ValueError):
+            create_backend("s3", {"S3_BUCKET": None})
+
+    def test_pdf_served_from_local_backend(self, app):
+        file_id = BlobStorage.put(PDF_BYTES, "local.pdf", "application/pdf")
+        resume_id = mongo.db.resumes.insert_one(
+            {"file_id": file_id, "filename": "local.pdf"}
+        ).inserted_id
+
+        with app.test_client() as client:
+            full = client.get(f"/resume/{resume_id}/pdf")
+            partial = client.get(
+                f"/resume/{resume_id}/pdf", headers={"Range": "bytes=10-19"}
+            )
+
+        assert full.data == PDF_BYTES
+        assert partial.status_code == 206
+        assert partial.data == PDF_BYTES[10:20]
+        assert mongo.db["fs.files"].count_documents({}) == 0
+
+    def test_gc_sweeps_configured_backend(self, app):
+        kept = BlobStorage.put(b"kept", "kept.pdf", "application/pdf")
+        orphan = BlobStorage.put(b"orphan", "orphan.pdf", "application/pdf")
+        mongo.db.resumes.insert_one({"file_id": kept})
+
+        later = datetime.now(timezone.utc) + timedelta(days=2)
+        report = StorageGCService.collect(now=later, batch_pause=0)
+
+        assert report["deleted_files"] == 1
+        assert BlobStorage.get(orphan) is None
+        assert BlobStorage.get(kept) is not None
+
+
+class TestCopy:
+    def test_copy_keeps_ids_and_skips_existing(self, app, tmp_path):
+        source = GridFSBackend(inline_threshold=1024)
+        small = source.put(b"small", "s.pdf", "application/pdf")
+        large = source.put(PDF_BYTES, "l.pdf", "application/pdf")
+        destination = LocalBackend(str(tmp_path / "copy"))
+        destination.put(b"small", "s.pdf", "application/pdf", file_id=small)
+
+        report = BlobStorage.copy(source, destination)
+
+        assert report["copied_files"] == 1
+        assert report["skipped_files"] == 1
+        assert report["copied_bytes"] == len(PDF_BYTES)
+        copied = destination.get(large)
+        assert copied.read() == PDF_BYTES
+        assert copied.metadata["md5"] == hashlib.md5(PDF_BYTES).hexdigest()
+
+    def test_copy_to_s3_and_delete_source(self, app, s3_backend):
+        source = GridFSBackend()
+        file_id = source.put(PDF_BYTES, "cv.pdf", "application/pdf")
+
+        report = BlobStorage.copy(source, s3_backend, delete_source=True)
+
+        assert report["copied_files"] == 1
+        assert source.get(file_id) is None
+        assert s3_backend.get(file_id).read() == PDF_BYTES
+
+    def test_cli_copies_gridfs_to_local(self, app):
+        file_id = GridFSBackend().put(PDF_BYTES, "cv.pdf", "application/pdf")
+
+        result = app.test_cli_runner().invoke(copy_blobs_command, ["gridfs", "local"])
+
+        assert result.exit_code == 0
+        assert f"Copied 1 file(s), {len(PDF_BYTES)} bytes" in result.output
+        assert BlobStorage.get(file_id).read() == PDF_BYTES
+
+    def test_cli_dry_run(self, app):
+        GridFSBackend().put(PDF_BYTES, "cv.pdf", "application/pdf")
+
+        result = app.test_cli_runner().invoke(
+            copy_blobs_command, ["gridfs", "local", "--dry-run"]
+        )
+
+        assert result.exit_code == 0
+        assert "Would copy 1 file(s)" in result.output
+        assert list(BlobStorage.backend().iter_files()) == []
@@ -0,0 +1,251 @@
+"""Tests for the node-local read-through blob cache."""
+
+import os
+import threading
+import time
+import pytest
+import mongomock
+import mongomock.gridfs
+from unittest.mock import patch
+from bson import ObjectId
+from app import create_app
+from app.extensions import mongo
+from app.services.blob_cache import DiskBlobCache
+from app.services.blob_storage import BlobStorage
+
+mongomock.gridfs.enable_gridfs_integration()
+
+PDF_BYTES = b"%PDF-1.4 " + bytes(range(256)) * 8
+
+
+class FakeBlob:
+    def __init__(self, file_id, data):
+        self._id = file_id
+        self._data = data
+        self._position = 0
+        self.length = len(data)
+        self.filename = "fake.pdf"
+        self.content_type = "application/pdf"
+        self.upload_date = None
+        self.metadata = {"md5": "abc"}
+
+    def seek(self, position, whence=0):
+        self._position = position
+
+    def read(self, size=-1):
+        stop = self.length if size < 0 else self._position + size
+        data = self._data[self._position : stop]
+        self._position += len(data)
+        return data
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskBlobCache(str(tmp_path / "cache"), max_bytes=1000)
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a test app with the blob cache enabled."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["BLOB_CACHE_DIR"] = str(tmp_path / "app-cache")
+        app.config["BLOB_CACHE_MAX_BYTES"] = 1024 * 1024
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+class TestDiskBlobCache:
+    def test_miss_then_hit(self, cache):
+        file_id = ObjectId()
+        fetches = []
+
+        def fetch(fid):
+            fetches.append(fid)
+            return FakeBlob(fid, b"x" * 100)
+
+        first = cache.get(file_id, fetch).read()
+        second = cache.get(file_id, fetch)
+
+        assert fetches == [file_id]
+        assert first == second.read() == b"x" * 100
+        assert second.metadata == {"md5": "abc"}
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["bytes_served_from_cache"] == 200
+
+    def test_ranged_reads_from_memory_map(self, cache):
+        file_id = ObjectId()
+        cache.get(file_id, lambda fid: FakeBlob(fid, bytes(range(200)))).read()
+
+        blob = cache.get(file_id, lambda fid: None)
+        blob.seek(50)
+
+        assert blob.read(10) == bytes(range(50, 60))
+        blob.close()
+
+    def test_lru_eviction_respects_budget(self, cache):
+        ids = [ObjectId() for _ in range(3)]
+        cache.get(ids[0], lambda fid: FakeBlob(fid, b"a" * 400)).read()
+        cache.get(ids[1], lambda fid: FakeBlob(fid, b"b" * 400)).read()
+        # Touch the first so the second becomes least recently used
+        cache.get(ids[0], lambda fid: None)
+        cache.get(ids[2], lambda fid: FakeBlob(fid, b"c" * 400)).read()
+
+        stats = cache.stats()
+        assert stats["size_bytes"] == 800
+        assert stats["evictions"] == 1
+        assert cache.get(ids[1], lambda fid: None) is None
+        assert cache.get(ids[0], lambda fid: None) is not None
+
+    def test_oversized_blobs_bypass_the_cache(self, cache):
+        blob = cache.get(ObjectId(), lambda fid: FakeBlob(fid, b"z" * 5000))
+
+        assert blob.read() == b"z" * 5000
+        assert cache.stats()["entries"] == 0
+
+    def test_missing_blob(self, cache):
+        assert cache.get(ObjectId(), lambda fid: None) is None
+
+    def test_concurrent_misses_share_one_copy(self, cache):
+        file_id = ObjectId()
+        copies = []
+
+        class SlowBlob(FakeBlob):
+            def read(self, size=-1):
+                if self._position == 0:
+                    copies.append(self)
+                    time.sleep(0.05)
+                return super().read(size)
+
+        def slow_fetch(fid):
+            return SlowBlob(fid, b"s" * 100)
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get(file_id, slow_fetch).read())
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(copies) == 1
+        assert results == [b"s" * 100] * 5
+        assert cache.stats()["fetches"] == 1
+
+    def test_misses_copy_only_when_read(self, cache):
+        blob = cache.get(ObjectId(), lambda fid: FakeBlob(fid, b"x" * 100))
+
+        assert blob.metadata == {"md5": "abc"}
+        assert cache.stats()["entries"] == 0
+        blob.read()
+        assert cache.stats()["entries"] == 1
+
+    def test_blob_evicted_after_lookup_is_still_readable(self, cache):
+        file_id = ObjectId()
+        cache.get(file_id, lambda fid: FakeBlob(fid, b"e" * 100)).read()
+        blob = cache.get(file_id, lambda fid: None)
+
+        cache.clear()
+
+        assert blob.read() == b"e" * 100
+        blob.close()
+
+    def test_blob_evicted_before_open_falls_back_to_backend(self, cache):
+        file_id = ObjectId()
+        cache.get(file_id, lambda fid: FakeBlob(fid, b"e" * 100)).read()
+        # Another worker evicts the data file, leaving this worker's index stale
+        os.remove(os.path.join(cache.directory, str(file_id)))
+
+        blob = cache.get(file_id, lambda fid: FakeBlob(fid, b"e" * 100))
+
+        assert blob.read() == b"e" * 100
+        assert cache.stats()["misses"] == 2
+
+    def test_index_survives_restart(self, tmp_path):
+        directory = str(tmp_path / "cache")
+        file_id = ObjectId()
+        DiskBlobCache(directory, 1000).get(
+            file_id, lambda f: FakeBlob(f, b"p" * 10)
+        ).read()
+
+        reopened = DiskBlobCache(directory, 1000)
+
+        assert reopened.stats()["size_bytes"] == 10
+        assert reopened.get(file_id, lambda fid: None).read() == b"p" * 10
+
+
+class TestServing:
+    def test_second_view_is_served_from_cache(self, app):
+        file_id = BlobStorage.put(PDF_BYTES, "cv.pdf", "application/pdf")
+        resume_id = mongo.db.resumes.insert_one(
+            {"file_id": file_id, "filename": "cv.pdf"}
+        ).inserted_id
+
+        with app.test_client() as client:
+            first = client.get(f"/resume/{resume_id}/pdf")
+            with patch.object(BlobStorage, "get", side_effect=AssertionError):
+                second = client.get(f"/resume/{resume_id}/pdf")
+                partial = client.get(
+                    f"/resume/{resume_id}/pdf", headers={"Range": "bytes=5-14"}
+                )
+
+        assert first.data == second.data == PDF_BYTES
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert partial.status_code == 206
+        assert partial.data == PDF_BYTES[5:15]
+        stats = BlobStorage.cache().stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        # The first view streams the copy it just wrote to the cache too
+        assert stats["bytes_served_from_cache"] == 2 * len(PDF_BYTES) + 10
+
+    def test_revalidation_does_not_fill_the_cache(self, app):
+        file_id = BlobStorage.put(PDF_BYTES, "cv.pdf", "application/pdf")
+        resume_id = mongo.db.resumes.insert_one(
+            {"file_id": file_id, "filename": "cv.pdf"}
+        ).inserted_id
+
+        with app.test_client() as client:
+            etag = client.get(f"/resume/{resume_id}/pdf").headers["ETag"]
+            BlobStorage.cache().clear()
+            response = client.get(
+                f"/resume/{resume_id}/pdf", headers={"If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert BlobStorage.cache().stats()["entries"] == 0
+
+    def test_cache_disabled_without_directory(self, app):
+        app.config["BLOB_CACHE_DIR"] = None
+        app.extensions.pop("blob_cache", None)
+
+        assert BlobStorage.cache() is None
+
+    def test_metrics_include_blob_cache(self, app):
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "c@example.com",
+                    "password": "password123",
+                    "first_name": "C",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "c@example.com", "password": "password123"}
+            )
+            response = client.get("/api/metrics")
+
+        assert response.get_json()["blob_cache"]["max_bytes"] == 1024 * 1024
+        assert os.path.isdir(app.config["BLOB_CACHE_DIR"])
@@ -0,0 +1,193 @@
+"""Tests for tiered blob storage (inline documents vs GridFS)."""
+
+import hashlib
+import pytest
+import mongomock
+import mongomock.gridfs
+from collections import Counter
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+from gridfs import GridFS
+from app import create_app
+from app.commands import migrate_small_blobs_command
+from app.extensions import mongo
+from app.services.blob_backends import BLOBS_COLLECTION, InlineBlob
+from app.services.blob_storage import BlobStorage
+from app.services.resume_service import ResumeService
+from app.services.storage_gc_service import StorageGCService
+
+mongomock.gridfs.enable_gridfs_integration()
+
+SMALL = b"%PDF-1.4 " + b"s" * 100
+LARGE = b"%PDF-1.4 " + b"L" * 5000
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance with a small inline threshold."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["BLOB_INLINE_THRESHOLD"] = 1024
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def queries():
+    """Count find_one calls per collection."""
+    counts = Counter()
+    original = mongomock.collection.Collection.find_one
+
+    def counted(self, *args, **kwargs):
+        counts[self.name] += 1
+        return original(self, *args, **kwargs)
+
+    with patch.object(mongomock.collection.Collection, "find_one", counted):
+        yield counts
+
+
+class TestPut:
+    def test_small_blob_is_inline(self, app):
+        file_id = BlobStorage.put(SMALL, "small.pdf", "application/pdf")
+
+        doc = mongo.db[BLOBS_COLLECTION].find_one({"_id": file_id})
+        assert bytes(doc["data"]) == SMALL
+        assert doc["metadata"]["md5"] == hashlib.md5(SMALL).hexdigest()
+        assert mongo.db["fs.files"].count_documents({}) == 0
+
+    def test_large_blob_goes_to_gridfs(self, app):
+        file_id = BlobStorage.put(LARGE, "large.pdf", "application/pdf")
+
+        assert mongo.db[BLOBS_COLLECTION].count_documents({}) == 0
+        assert GridFS(mongo.db).get(file_id).read() == LARGE
+
+
+class TestGet:
+    def test_reads_either_tier(self, app):
+        small_id = BlobStorage.put(SMALL, "small.pdf", "application/pdf")
+        large_id = BlobStorage.put(LARGE, "large.pdf", "application/pdf")
+
+        small = BlobStorage.get(small_id)
+        large = BlobStorage.get(large_id)
+
+        assert isinstance(small, InlineBlob)
+        assert small.read() == SMALL
+        assert small.length == len(SMALL)
+        assert small.content_type == "application/pdf"
+        assert large.read() == LARGE
+
+    def test_inline_blob_is_seekable(self, app):
+        blob = BlobStorage.get(BlobStorage.put(SMALL, "s.pdf", "application/pdf"))
+
+        blob.seek(4)
+        assert blob.read(4) == SMALL[4:8]
+        assert blob.tell() == 8
+
+    def test_missing_blob_is_none(self, app):
+        from bson import ObjectId
+
+        assert BlobStorage.get(ObjectId()) is None
+        assert BlobStorage.get(None) is None
+
+    def test_inline_pdf_is_one_query(self, app, queries):
+        file_id = ResumeService.store_file(SMALL, "s.pdf", "application/pdf")
+        resume_id = mongo.db.resumes.insert_one({"file_id": file_id}).inserted_id
+        queries.clear()
+
+        doc, file_obj = ResumeService.get_resume_pdf(str(resume_id))
+
+        assert file_obj.read() == SMALL
+        assert queries == {"resumes": 1, BLOBS_COLLECTION: 1}
+
+    def test_delete_removes_either_tier(self, app):
+        small_id = BlobStorage.put(SMALL, "small.pdf", "application/pdf")
+        large_id = BlobStorage.put(LARGE, "large.pdf", "application/pdf")
+
+        BlobStorage.delete(small_id)
+        BlobStorage.delete(large_id)
+
+        assert BlobStorage.get(small_id) is None
+        assert BlobStorage.get(large_id) is None
+
+
+class TestServing:
+    def test_inline_pdf_serves_ranges(self, app):
+        file_id = BlobStorage.put(SMALL, "small.pdf", "application/pdf")
+        resume_id = mongo.db.resumes.insert_one(
+            {"file_id": file_id, "filename": "small.pdf"}
+        ).inserted_id
+
+        with app.test_client() as client:
+            full = client.get(f"/resume/{resume_id}/pdf")
+            partial = client.get(
+                f"/resume/{resume_id}/pdf", headers={"Range": "bytes=0-7"}
+            )
+
+        assert full.data == SMALL
+        assert full.headers["ETag"] == f'"{file_id}-{hashlib.md5(SMALL).hexdigest()}"'
+        assert partial.status_code == 206
+        assert partial.data == SMALL[:8]
+
+
+class TestMigration:
+    def test_moves_small_files_and_keeps_ids(self, app):
+        fs = GridFS(mongo.db)
+        small_id = fs.put(SMALL, filename="old.pdf", content_type="application/pdf")
+        large_id = fs.put(LARGE, filename="big.pdf")
+
+        report = BlobStorage.migrate_small_files()
+
+        assert report["migrated_files"] == 1
+        assert report["migrated_bytes"] == len(SMALL)
+        assert not fs.exists(small_id)
+        assert fs.exists(large_id)
+        moved = BlobStorage.get(small_id)
+        assert isinstance(moved, InlineBlob)
+        assert moved.read() == SMALL
+        assert moved.filename == "old.pdf"
+
+    def test_dry_run_moves_nothing(self, app):
+        GridFS(mongo.db).put(SMALL, filename="old.pdf")
+
+        report = BlobStorage.migrate_small_files(dry_run=True)
+
+        assert report["candidate_files"] == 1
+        assert report["migrated_files"] == 0
+        assert mongo.db[BLOBS_COLLECTION].count_documents({}) == 0
+
+    def test_rerun_after_interruption(self, app):
+        fs = GridFS(mongo.db)
+        file_id = fs.put(SMALL, filename="old.pdf")
+        # Simulate a run that copied the blob but died before deleting from GridFS
+        mongo.db[BLOBS_COLLECTION].insert_one({"_id": file_id, "data": SMALL})
+
+        report = BlobStorage.migrate_small_files()
+
+        assert report["migrated_files"] == 1
+        assert not fs.exists(file_id)
+        assert BlobStorage.get(file_id).read() == SMALL
+
+    def test_cli(self, app):
+        GridFS(mongo.db).put(SMALL, filename="old.pdf")
+
+        result = app.test_cli_runner().invoke(migrate_small_blobs_command, [])
+
+        assert result.exit_code == 0
+        assert f"Moved 1 file(s), {len(SMALL)} bytes." in result.output
+
+
+class TestGarbageCollection:
+    def test_orphaned_inline_blobs_are_collected(self, app):
+        kept = BlobStorage.put(SMALL, "kept.pdf", "application/pdf")
+        orphan = BlobStorage.put(SMALL, "orphan.pdf", "application/pdf")
+        mongo.db.resumes.insert_one({"file_id": kept})
+
+        later = datetime.now(timezone.utc) + timedelta(days=2)
+        report = StorageGCService.collect(now=later)
+
+        assert report["deleted_files"] == 1
+        assert BlobStorage.get(orphan) is None
+        assert BlobStorage.get(kept) is not None
@@ -0,0 +1,277 @@
+"""Tests for feed facets and the facet_counts rollup."""
+
+import pytest
+import mongomock
+from io import BytesIO
+from unittest.mock import patch
+from werkzeug.datastructures import FileStorage
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.facet_service import (
+    FacetService,
+    FACET_COUNTS_COLLECTION,
+    extract_facets,
+    normalize_facet_value,
+)
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["SEARCH_BUILD"] = "sync"
+        app.config["PDF_DERIVATIVES"] = "off"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+def structured(name, skills="", company="Acme", school="MIT", location="Boston, MA"):
+    return {
+        "name": name,
+        "skills": [{"category": "Languages", "skills": skills}],
+        "experience": [{"role": "Engineer", "company": company, "location": location}],
+        "education": [{"institution": school, "location": location}],
+    }
+
+
+def counts():
+    return {
+        doc["_id"]: doc["count"]
+        for doc in mongo.db[FACET_COUNTS_COLLECTION].find()
+        if doc["count"]
+    }
+
+
+def login(client):
+    client.post(
+        "/signup",
+        data={
+            "email": "f@example.com",
+            "password": "password123",
+            "first_name": "F",
+            "last_name": "U",
+        },
+    )
+    client.post("/login", data={"email": "f@example.com", "password": "password123"})
+
+
+class TestExtractFacets:
+    def test_values_are_normalised_with_display_labels(self):
+        facets = extract_facets(
+            structured("A", skills="Python,  python ; Go/SQL", company=" Acme Corp. ")
+        )
+
+        assert facets["skill"] == {"python": "Python", "go": "Go", "sql": "SQL"}
+        assert facets["role"] == {"engineer": "Engineer"}
+        assert facets["company"] == {"acme corp": "Acme Corp"}
+        assert facets["school"] == {"mit": "MIT"}
+        # Experience and education share the location facet
+        assert facets["location"] == {"boston, ma": "Boston, MA"}
+
+    def test_missing_or_malformed_data(self):
+        assert extract_facets(None)["skill"] == {}
+        assert extract_facets({"skills": "Python", "experience": ["x"]}) == {
+            "skill": {},
+            "role": {},
+            "company": {},
+            "school": {},
+            "location": {},
+        }
+
+    def test_normalize_facet_value(self):
+        assert normalize_facet_value("  Node.JS ") == "node.js"
+
+
+class TestFacetRollup:
+    def test_insert_counts_every_value(self, app):
+        ResumeService.save_resume_structured_data(structured("A", skills="Python, Go"))
+        ResumeService.save_resume_structured_data(structured("B", skills="Python"))
+
+        assert counts() == {
+            "skill:python": 2,
+            "skill:go": 1,
+            "role:engineer": 2,
+            "company:acme": 2,
+            "school:mit": 2,
+            "location:boston, ma": 2,
+            "reviews:none": 2,
+        }
+
+    def test_update_moves_counts_to_new_values(self, app):
+        resume_id = ResumeService.save_resume_structured_data(
+            structured("A", skills="Python, Go")
+        )
+
+        ResumeService.save_resume_structured_data(
+            structured("A", skills="Python, Rust", company="Initech"),
+            resume_id=resume_id,
+        )
+
+        result = counts()
+        assert result["skill:python"] == 1
+        assert result["skill:rust"] == 1
+        assert result["company:initech"] == 1
+        assert "skill:go" not in result
+        assert "company:acme" not in result
+        doc = mongo.db.resumes.find_one()
+        assert doc["facets"]["skill"] == ["python", "rust"]
+        assert doc["facets"]["reviews"] == ["none"]
+
+    def test_uploaded_pdf_counts_as_unreviewed(self, app):
+        upload = FileStorage(
+            stream=BytesIO(b"%PDF-1.4 upload"),
+            filename="upload.pdf",
+            content_type="application/pdf",
+        )
+
+        ResumeService.save_resume_pdf(upload, title="T")
+
+        assert counts() == {"reviews:none": 1}
+
+    def test_first_review_moves_resume_to_reviewed(self, app):
+        resume_id = ResumeService.save_resume_structured_data(structured("A"))
+        highlight = {"id": "hl_1", "text": "x"}
+
+        for _ in range(2):
+            ResumeService.apply_highlight_patch(
+                resume_id,
+                [{"op": "add", "page": 1, "highlight": highlight}],
+                reviewer_id="r1",
+            )
+
+        result = counts()
+        assert result["reviews:some"] == 1
+        assert "reviews:none" not in result
+
+    def test_empty_highlights_do_not_count_as_a_review(self, app):
+        resume_id = ResumeService.save_resume_structured_data(structured("A"))
+
+        ResumeService.save_highlights(resume_id, {}, reviewer_id="r1")
+
+        assert counts()["reviews:none"] == 1
+
+    def test_top_values_orders_by_count(self, app):
+        ResumeService.save_resume_structured_data(structured("A", skills="Go, SQL"))
+        ResumeService.save_resume_structured_data(structured("B", skills="Go"))
+
+        top = FacetService.top_values(limit=1)
+
+        assert top["skill"] == [{"value": "go", "label": "Go", "count": 2}]
+        assert top["reviews"][0]["value"] == "none"
+
+    def test_rebuild_recomputes_from_resumes(self, app):
+        first = ResumeService.save_resume_structured_data(structured("A", skills="Go"))
+        mongo.db.resumes.insert_one({"structured_data": structured("B", skills="Go")})
+        mongo.db.highlights.insert_many(
+            [
+                {"document_id": first, "highlights": {"1": [{"id": "hl_1"}]}},
+                {"document_id": "other", "highlights": {}},
+            ]
+        )
+        mongo.db[FACET_COUNTS_COLLECTION].update_one(
+            {"_id": "skill:go"}, {"$set": {"count": 40}}
+        )
+
+        result = app.test_cli_runner().invoke(args=["rebuild-facets"])
+
+        assert "for 2 resume(s)" in result.output
+        assert counts()["skill:go"] == 2
+        assert counts()["reviews:some"] == 1
+        assert counts()["reviews:none"] == 1
+
+
+class TestFeedFacets:
+    def test_facet_filter_combines_with_search(self, app):
+        ResumeService.save_resume_structured_data(
+            structured("Ada", skills="Python", school="MIT"), title="Ada resume"
+        )
+        ResumeService.save_resume_structured_data(
+            structured("Grace", skills="Python", school="Yale"), title="Grace resume"
+        )
+        ResumeService.save_resume_structured_data(
+            structured("Alan", skills="Go", school="MIT"), title="Alan resume"
+        )
+
+        with app.test_client() as client:
+            login(client)
+            filtered = client.get("/feed?school=MIT").data.decode()
+            combined = client.get("/feed?q=python&school=mit").data.decode()
+
+        assert "Ada resume" in filtered and "Alan resume" in filtered
+        assert "Grace resume" not in filtered
+        assert "Ada resume" in combined
+        assert "Alan resume" not in combined and "Grace resume" not in combined
+
+    def test_narrow_searches_check_hits_against_the_filter(self, app):
+        for name, school in (("Ada", "MIT"), ("Alan", "MIT"), ("Grace", "Yale")):
+            ResumeService.save_resume_structured_data(
+                structured(name, skills="Python"), title=f"{name} resume"
+            )
+            ResumeService.save_resume_structured_data(
+                structured(f"{name} Two", skills="Go", school=school)
+            )
+        ResumeService.save_resume_structured_data(
+            structured("Linus", skills="Kubernetes", school="MIT"),
+            title="Linus resume",
+        )
+        find = mongo.db.resumes.find
+        filters = []
+
+        def recording_find(filter=None, *args, **kwargs):
+            filters.append(filter)
+            return find(filter, *args, **kwargs)
+
+        with app.test_client() as client:
+            login(client)
+            with patch.object(mongo.db.resumes, "find", side_effect=recording_find):
+                html = client.get("/feed?q=kubernetes&school=mit").data.decode()
+
+        assert "Linus resume" in html
+        # The single hit was checked by id, not every MIT resume listed
+        assert {"facets.school": {"$all": ["mit"]}} not in filters
+
+    def test_broad_searches_rank_within_the_filter(self, app):
+        for name, school in (("Ada", "MIT"), ("Grace", "Yale"), ("Alan", "Yale")):
+            ResumeService.save_resume_structured_data(
+                structured(name, skills="Python", school=school),
+                title=f"{name} resume",
+            )
+
+        with app.test_client() as client:
+            login(client)
+            html = client.get("/feed?q=python&school=mit").data.decode()
+
+        assert "Ada resume" in html
+        assert "Grace resume" not in html and "Alan resume" not in html
+
+    def test_max_matches_uses_the_rarest_value(self, app):
+        ResumeService.save_resume_structured_data(structured("A", skills="Go, SQL"))
+        ResumeService.save_resume_structured_data(structured("B", skills="Go"))
+
+        assert FacetService.max_matches({"skill": ["go", "sql"]}) == 1
+        assert FacetService.max_matches({"skill": ["rust"]}) == 0
+        assert FacetService.max_matches({}) is None
+
+    def test_sidebar_shows_counts_and_toggles(self, app):
+        ResumeService.save_resume_structured_data(
+            structured("Ada", skills="Python"), title="Ada resume"
+        )
+        ResumeService.save_resume_structured_data(
+            structured("Alan", skills="Python, Go"), title="Alan resume"
+        )
+
+        with app.test_client() as client:
+            login(client)
+            html = client.get("/feed?skill=go").data.decode()
+
+        assert "No reviews yet" in html
+        assert '<span class="facet-count">2</span>' in html
+        # Clicking the active value clears it; clicking another adds to it
+        assert 'href="/feed"' in html
+        assert "skill=go&amp;skill=python" in html
+        assert '<input type="hidden" name="skill" value="go">' in html
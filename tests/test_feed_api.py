@@ -0,0 +1,152 @@
+"""Tests for the /api/feed JSON endpoint and its cursors."""
+
+import gzip
+import json
+import pytest
+import mongomock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.utils.compression import gzip_response
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["SEARCH_BUILD"] = "sync"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        client.post(
+            "/signup",
+            data={
+                "email": "a@example.com",
+                "password": "password123",
+                "first_name": "A",
+                "last_name": "U",
+            },
+        )
+        client.post(
+            "/login", data={"email": "a@example.com", "password": "password123"}
+        )
+        yield client
+
+
+def insert_resumes(count, skills="Python", same_time=False):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ids = []
+    for i in range(count):
+        created_at = start if same_time else start + timedelta(minutes=i)
+        ids.append(
+            str(
+                mongo.db.resumes.insert_one(
+                    {
+                        "title": f"Resume {i}",
+                        "created_at": created_at,
+                        "structured_data": {
+                            "skills": [{"category": "Languages", "skills": skills}],
+                            "professional_summary": "x" * 200,
+                        },
+                    }
+                ).inserted_id
+            )
+        )
+    # Newest first, ties broken by _id
+    return list(reversed(ids))
+
+
+def read_all(client, url):
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        data = response.get_json()
+        ids.extend(item["_id"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if not cursor:
+            return ids, pages
+
+
+class TestFeedApi:
+    def test_cursor_walks_every_resume_once(self, app, client):
+        expected = insert_resumes(7)
+
+        ids, pages = read_all(client, "/api/feed?limit=3")
+
+        assert ids == expected
+        assert pages == 3
+
+    def test_keyset_handles_identical_timestamps(self, app, client):
+        expected = insert_resumes(5, same_time=True)
+
+        ids, _ = read_all(client, "/api/feed?limit=2")
+
+        assert ids == expected
+
+    def test_search_results_page_by_offset(self, app, client):
+        insert_resumes(4, skills="Python")
+        insert_resumes(2, skills="Cobol")
+
+        ids, pages = read_all(client, "/api/feed?q=python&limit=3")
+
+        assert len(set(ids)) == 4
+        assert pages == 2
+
+    def test_first_page_of_feed_links_to_the_api(self, app, client):
+        expected = insert_resumes(5)
+
+        html = client.get("/feed?per_page=2").data.decode()
+        cursor = html.split("window.feedNextCursor = ")[1].split(";")[0].strip('"')
+        data = client.get(f"/api/feed?limit=2&cursor={cursor}").get_json()
+
+        assert "window.feedApiUrl" in html
+        assert [item["_id"] for item in data["items"]] == expected[2:4]
+
+    def test_field_selection(self, app, client):
+        insert_resumes(1)
+
+        data = client.get("/api/feed?fields=title,thumbnail_url").get_json()
+
+        assert set(data["items"][0]) == {"_id", "title", "thumbnail_url"}
+        # No PDF, so no thumbnail for the client to request
+        assert data["items"][0]["thumbnail_url"] is None
+
+    def test_bad_requests(self, app, client):
+        assert client.get("/api/feed?fields=password").status_code == 400
+        assert client.get("/api/feed?cursor=not-a-cursor").status_code == 400
+
+    def test_responses_are_gzipped_when_accepted(self, app, client):
+        insert_resumes(20)
+
+        plain = client.get("/api/feed")
+        compressed = client.get("/api/feed", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in plain.headers
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["Vary"]
+        body = gzip.decompress(compressed.data)
+        assert json.loads(body) == plain.get_json()
+        assert len(compressed.data) < len(body)
+
+    def test_requires_login(self, app):
+        with app.test_client() as client:
+            assert client.get("/api/feed").status_code == 302
+
+
+class TestGzipResponse:
+    def test_small_bodies_are_left_alone(self, app):
+        with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+            response = gzip_response(app.response_class("{}"))
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_data() == b"{}"
@@ -0,0 +1,142 @@
+"""Tests for the feed result cache and its generation-based invalidation."""
+
+import pytest
+import mongomock
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.feed_cache import (
+    FeedCache,
+    FEED_STATE_COLLECTION,
+    GENERATION_ID,
+    normalize_query,
+)
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "off"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        client.post(
+            "/signup",
+            data={
+                "email": "c@example.com",
+                "password": "password123",
+                "first_name": "C",
+                "last_name": "U",
+            },
+        )
+        client.post(
+            "/login", data={"email": "c@example.com", "password": "password123"}
+        )
+        FeedCache.configure()
+        yield client
+
+
+def save(title, **structured_data):
+    return ResumeService.save_resume_structured_data(structured_data, title=title)
+
+
+def other_worker_writes():
+    mongo.db[FEED_STATE_COLLECTION].update_one(
+        {"_id": GENERATION_ID}, {"$inc": {"value": 1}}, upsert=True
+    )
+
+
+class TestKeys:
+    def test_query_and_filters_are_normalised(self):
+        assert FeedCache.key(" Python  Go", {"skill": ["b", "a"]}, 1, 20) == (
+            FeedCache.key("python go", {"skill": ["a", "b"]}, 1, 20)
+        )
+        assert FeedCache.key("python", {}, 1, 20) != FeedCache.key("python", {}, 2, 20)
+
+    def test_trailing_space_is_kept(self):
+        # It turns off prefix matching on the last word, so results differ
+        assert normalize_query("Java ") == "java "
+        assert normalize_query("   ") == ""
+
+
+class TestFeedCache:
+    def test_repeat_requests_are_served_from_cache(self, app, client):
+        save("Ada resume")
+
+        client.get("/feed")
+        with patch.object(
+            mongo.db.resumes, "find", wraps=mongo.db.resumes.find
+        ) as find:
+            html = client.get("/feed").data.decode()
+
+        assert "Ada resume" in html
+        find.assert_not_called()
+        stats = FeedCache.stats()
+        assert stats["hits"] >= 1
+        assert stats["size"] >= 1
+
+    def test_resume_writes_invalidate_cached_pages(self, app, client):
+        save("Ada resume")
+        client.get("/feed")
+
+        save("Grace resume")
+        html = client.get("/feed").data.decode()
+
+        assert "Grace resume" in html
+        assert FeedCache.stats()["stale"] >= 1
+
+    def test_other_workers_writes_are_seen_after_polling(self, app, client):
+        FeedCache.configure(poll_interval=60)
+        client.get("/feed")
+        mongo.db.resumes.insert_one({"title": "Grace resume"})
+        other_worker_writes()
+
+        assert "Grace resume" not in client.get("/feed").data.decode()
+
+        FeedCache.configure(poll_interval=0)
+        assert "Grace resume" in client.get("/feed").data.decode()
+
+    def test_only_feed_fields_bump_the_generation(self, app):
+        resume_id = save("Ada resume")
+        generation = FeedCache.generation()
+
+        ResumeService.update_resume(resume_id, {"preview_template_id": "jake"})
+        assert FeedCache.generation() == generation
+
+        ResumeService.update_resume(resume_id, {"title": "Renamed"})
+        assert FeedCache.generation() != generation
+
+    def test_first_review_bumps_the_generation(self, app):
+        resume_id = save("Ada resume")
+        generation = FeedCache.generation()
+
+        ResumeService.save_highlights(resume_id, {"1": [{"id": "h"}]}, "r1")
+
+        assert FeedCache.generation() != generation
+
+    def test_size_zero_disables_the_cache(self, app, client):
+        FeedCache.configure(maxsize=0)
+        client.get("/feed")
+        client.get("/feed")
+
+        assert FeedCache.stats()["hits"] == 0
+
+    def test_metrics_report_hit_age(self, app, client):
+        client.get("/feed")
+        client.get("/feed")
+
+        stats = client.get("/api/metrics").get_json()["feed_cache"]
+
+        assert stats["hits"] >= 1
+        assert stats["mean_hit_age"] >= 0
+        assert "max_hit_age" in stats
@@ -15,6 +15,7 @@ def client():
     with patch("flask_pymongo.PyMongo.init_app"):
         app = create_app()
         app.config["TESTING"] = True
+        app.config["SEARCH_BUILD"] = "sync"
         app.config["WTF_CSRF_ENABLED"] = False
 
         mongo.db = mongomock.MongoClient().db
@@ -422,3 +423,63 @@ class TestResumeViews:
         )
         assert response.status_code == 200
         assert b"success" in response.data
+
+    def test_post_highlights_rejects_invalid_pages(self, client):
+        """Test POST /api/highlights rejects page keys that are not page numbers."""
+        create_test_user(client)
+
+        for highlights in ({"a.b": []}, {"$inc": []}, {"0": []}, ["1"]):
+            response = client.post(
+                "/api/highlights",
+                json={"documentId": "test_doc_123", "highlights": highlights},
+            )
+            assert response.status_code == 400
+        assert mongo.db.highlights.count_documents({}) == 0
+
+    def test_patch_highlights_requires_login(self, client):
+        """Test PATCH /api/highlights requires authentication."""
+        response = client.patch("/api/highlights", json={})
+        assert response.status_code == 302
+
+    def test_patch_highlights_missing_fields(self, client):
+        """Test PATCH /api/highlights with missing fields."""
+        create_test_user(client)
+        response = client.patch("/api/highlights", json={"documentId": "doc"})
+        assert response.status_code == 400
+
+    def test_patch_highlights_rejects_invalid_operation(self, client):
+        """Test PATCH /api/highlights with a malformed operation."""
+        create_test_user(client)
+        response = client.patch(
+            "/api/highlights",
+            json={"documentId": "doc", "operations": [{"op": "add", "page": 1}]},
+        )
+        assert response.status_code == 400
+
+    def test_patch_highlights_round_trip(self, client):
+        """Test add, update and delete through PATCH, read back through GET."""
+        create_test_user(client)
+        highlight = {"id": "hl1", "comment": "Good", "text": "Test", "rects": []}
+
+        for operations in (
+            [{"op": "add", "page": 1, "highlight": highlight}],
+            [{"op": "add", "page": 2, "highlight": {**highlight, "id": "hl2"}}],
+            [
+                {
+                    "op": "update",
+                    "page": 1,
+                    "id": "hl1",
+                    "changes": {"comment": "Better"},
+                }
+            ],
+            [{"op": "delete", "page": 2, "id": "hl2"}],
+        ):
+            response = client.patch(
+                "/api/highlights",
+                json={"documentId": "test_doc_123", "operations": operations},
+            )
+            assert response.status_code == 200
+            assert response.get_json()["applied"] == 1
+
+        response = client.get("/api/highlights?documentId=test_doc_123")
+        assert response.get_json() == {"1": [{**highlight, "comment": "Better"}]}
@@ -0,0 +1,215 @@
+"""Tests for the request-scoped identity map."""
+
+import pytest
+import mongomock
+import mongomock.gridfs
+from collections import Counter
+from unittest.mock import patch
+from bson import ObjectId
+from gridfs import GridFS
+from app import create_app
+from app.extensions import mongo
+from app.services import identity_map
+from app.services.resume_service import ResumeService, EDIT_PROJECTION
+from app.services.user_service import UserService
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        mongo.db = mongomock.MongoClient().db
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def find_one_calls():
+    """Count find_one calls per collection on mongomock."""
+    counts = Counter()
+    original = mongomock.collection.Collection.find_one
+
+    def counted(self, *args, **kwargs):
+        counts[self.name] += 1
+        return original(self, *args, **kwargs)
+
+    with patch.object(mongomock.collection.Collection, "find_one", counted):
+        yield counts
+
+
+def login(client):
+    client.post(
+        "/signup",
+        data={
+            "email": "test@example.com",
+            "password": "password123",
+            "first_name": "Test",
+            "last_name": "User",
+        },
+    )
+    client.post("/login", data={"email": "test@example.com", "password": "password123"})
+    return str(mongo.db.users.find_one({"email": "test@example.com"})["_id"])
+
+
+def create_resume(user_id):
+    file_id = GridFS(mongo.db).put(b"%PDF-1.4", filename="test.pdf")
+    result = mongo.db.resumes.insert_one(
+        {
+            "user_id": user_id,
+            "title": "Mapped Resume",
+            "filename": "test.pdf",
+            "file_id": file_id,
+            "structured_data": {"name": "Test User"},
+        }
+    )
+    return str(result.inserted_id)
+
+
+class TestFetchOne:
+    def test_repeated_reads_hit_the_map(self, app, find_one_calls):
+        resume_id = ObjectId(create_resume("u1"))
+
+        with app.test_request_context():
+            first = identity_map.fetch_one("resumes", resume_id, {"user_id": 1})
+            second = identity_map.fetch_one("resumes", resume_id, {"user_id": 1})
+            counters = identity_map.stats()
+
+        assert first["user_id"] == second["user_id"] == "u1"
+        assert find_one_calls["resumes"] == 1
+        assert counters == {"hits": 1, "misses": 1}
+
+    def test_wider_projection_refetches_and_merges(self, app, find_one_calls):
+        resume_id = ObjectId(create_resume("u1"))
+
+        with app.test_request_context():
+            identity_map.fetch_one("resumes", resume_id, {"user_id": 1})
+            wide = identity_map.fetch_one("resumes", resume_id, EDIT_PROJECTION)
+            narrow = identity_map.fetch_one("resumes", resume_id, {"title": 1})
+
+        assert wide["structured_data"] == {"name": "Test User"}
+        assert narrow["title"] == "Mapped Resume"
+        assert find_one_calls["resumes"] == 2
+
+    def test_missing_documents_are_remembered(self, app, find_one_calls):
+        with app.test_request_context():
+            missing = ObjectId()
+            assert identity_map.fetch_one("resumes", missing) is None
+            assert identity_map.fetch_one("resumes", missing) is None
+
+        assert find_one_calls["resumes"] == 1
+
+    def test_returned_documents_are_copies(self, app):
+        resume_id = ObjectId(create_resume("u1"))
+
+        with app.test_request_context():
+            identity_map.fetch_one("resumes", resume_id)["title"] = "Mutated"
+            doc = identity_map.fetch_one("resumes", resume_id)
+
+        assert doc["title"] == "Mapped Resume"
+
+    def test_no_caching_outside_a_request(self, app, find_one_calls):
+        resume_id = ObjectId(create_resume("u1"))
+
+        with app.app_context():
+            identity_map.fetch_one("resumes", resume_id)
+            identity_map.fetch_one("resumes", resume_id)
+
+        assert find_one_calls["resumes"] == 2
+
+    def test_map_does_not_outlive_the_request(self, app, find_one_calls):
+        resume_id = ObjectId(create_resume("u1"))
+
+        for _ in range(2):
+            with app.test_request_context():
+                identity_map.fetch_one("resumes", resume_id)
+
+        assert find_one_calls["resumes"] == 2
+
+
+class TestInvalidation:
+    def test_update_resume_invalidates(self, app):
+        resume_id = create_resume("u1")
+
+        with app.test_request_context():
+            ResumeService.find_resume(resume_id, {"title": 1})
+            ResumeService.update_resume(resume_id, {"title": "Renamed"})
+            doc = ResumeService.find_resume(resume_id, {"title": 1})
+
+        assert doc["title"] == "Renamed"
+
+    def test_update_resume_unsets_fields(self, app):
+        resume_id = create_resume("u1")
+
+        with app.test_request_context():
+            ResumeService.update_resume(resume_id, unset_fields=["title"])
+            doc = ResumeService.find_resume(resume_id, {"title": 1})
+
+        assert "title" not in doc
+
+    def test_structured_data_save_invalidates(self, app):
+        resume_id = create_resume("u1")
+
+        with app.test_request_context():
+            ResumeService.find_resume(resume_id, EDIT_PROJECTION)
+            ResumeService.save_resume_structured_data(
+                {"name": "New Name"}, title="T", resume_id=resume_id
+            )
+            doc = ResumeService.find_resume(resume_id, EDIT_PROJECTION)
+
+        assert doc["structured_data"] == {"name": "New Name"}
+
+    def test_current_resume_pointer_invalidates_user(self, app):
+        user_id = mongo.db.users.insert_one({"email": "a@b.c"}).inserted_id
+
+        with app.test_request_context():
+            identity_map.fetch_one("users", user_id)
+            ResumeService.set_current_resume_for_user(str(user_id), "r1")
+            user = identity_map.fetch_one("users", user_id)
+
+        assert user["current_resume_id"] == "r1"
+
+
+class TestRequests:
+    def test_feedback_page_loads_owner_once(self, client, find_one_calls):
+        user_id = login(client)
+        resume_id = create_resume(user_id)
+        find_one_calls.clear()
+
+        response = client.get(f"/resume/feedback/{resume_id}")
+
+        assert response.status_code == 200
+        # flask-login's user loader and the owner lookup share one read
+        assert find_one_calls["users"] == 1
+
+    def test_edit_reads_resume_once(self, client, find_one_calls):
+        user_id = login(client)
+        resume_id = create_resume(user_id)
+        find_one_calls.clear()
+
+        response = client.get(f"/resume/{resume_id}/edit")
+
+        assert response.status_code == 200
+        assert find_one_calls["resumes"] == 1
+
+    def test_debug_header_reports_stats(self, app, client):
+        user_id = login(client)
+        resume_id = create_resume(user_id)
+        # Without the process-wide user cache, the owner lookup hits the map
+        UserService.configure_user_cache(maxsize=0)
+
+        app.debug = True
+        debug_response = client.get(f"/resume/feedback/{resume_id}")
+        app.debug = False
+        plain_response = client.get(f"/resume/feedback/{resume_id}")
+
+        assert debug_response.headers["X-Identity-Map"] == "hits=1; misses=2"
+        assert "X-Identity-Map" not in plain_response.headers
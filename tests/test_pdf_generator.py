@@ -1,10 +1,21 @@
 """Tests for the PDF generator module."""
 
 import pytest
+import hashlib
 import os
+import shutil
 import tempfile
 from unittest.mock import patch, MagicMock
-from app.utils.pdf_generator import compile_latex_to_pdf, compile_latex_to_pdf_bytes
+from app.utils.latex_filler import fill_latex_template
+from app.utils.pdf_generator import (
+    SOURCE_DATE_EPOCH,
+    compile_latex_to_pdf,
+    compile_latex_to_pdf_bytes,
+)
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "app", "static", "templates"
+)
 
 
 class TestCompileLatexToPdf:
@@ -139,3 +150,63 @@ class TestCompileLatexToPdfBytes:
 
             # Function should return failure since PDF won't be created
             assert not success or result is None
+
+
+class TestReproducibleBuilds:
+    """pdflatex runs with pinned timestamps and no random document ID."""
+
+    def test_pdflatex_gets_fixed_source_date_epoch(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout="", stderr="")
+
+            compile_latex_to_pdf_bytes(
+                "\\documentclass{article}\\begin{document}Test\\end{document}"
+            )
+
+        for call in mock_run.call_args_list:
+            env = call.kwargs["env"]
+            assert env["SOURCE_DATE_EPOCH"] == SOURCE_DATE_EPOCH
+            # \\today must keep using the real date
+            assert env.get("FORCE_SOURCE_DATE") == os.environ.get("FORCE_SOURCE_DATE")
+
+    def test_source_suppresses_trailer_id_and_dates(self):
+        written = []
+
+        def capture_source(args, **kwargs):
+            with open(args[-1], encoding="utf-8") as f:
+                written.append(f.read())
+            return MagicMock(stdout="", stderr="")
+
+        with patch("subprocess.run", side_effect=capture_source):
+            compile_latex_to_pdf(
+                "\\documentclass{article}\\begin{document}Test\\end{document}"
+            )
+
+        first_line, rest = written[0].split("\n", 1)
+        assert "\\pdftrailerid{}" in first_line
+        assert "\\pdfinfoomitdate=1" in first_line
+        assert "\\pdfsuppressptexinfo=-1" in first_line
+        assert rest.startswith("\\documentclass{article}")
+
+    @pytest.mark.skipif(shutil.which("pdflatex") is None, reason="needs pdflatex")
+    def test_same_structured_data_compiles_to_identical_bytes(self):
+        structured_data = {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": "jane@example.com",
+            "education": [
+                {
+                    "school": "Test University",
+                    "degree": "BS Computer Science",
+                    "end_date": "2024-05",
+                }
+            ],
+        }
+        template_path = os.path.join(TEMPLATE_DIR, "jake", "template.tex")
+        latex = fill_latex_template(structured_data, "jake", template_path)
+
+        first, success, error = compile_latex_to_pdf_bytes(latex)
+        assert success, error
+        second, _, _ = compile_latex_to_pdf_bytes(latex)
+
+        assert hashlib.sha256(first).digest() == hashlib.sha256(second).digest()
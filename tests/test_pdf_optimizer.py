@@ -0,0 +1,191 @@
+"""Tests for qpdf post-processing of stored PDFs."""
+
+import io
+import pytest
+import mongomock
+import mongomock.gridfs
+from subprocess import TimeoutExpired
+from unittest.mock import patch, MagicMock
+from pypdf import PdfWriter
+from app import create_app
+from app.extensions import mongo
+from app.services.blob_storage import BlobStorage
+from app.services.resume_service import ResumeService
+from app.utils import pdf_optimizer
+from app.utils.pdf_optimizer import optimize_pdf, optimizer_stats
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+def blank_pdf(pages=1, padding=0):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    if padding:
+        writer.add_metadata({"/Padding": "x" * padding})
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def fake_qpdf(output, returncode=0):
+    """Stand in for qpdf by writing the given bytes to its output path."""
+
+    def run(args, **kwargs):
+        with open(args[-1], "wb") as f:
+            f.write(output)
+        return MagicMock(returncode=returncode, stdout="", stderr="")
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    with patch.dict(
+        pdf_optimizer._stats,
+        {"optimized": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0},
+    ):
+        yield
+
+
+@pytest.fixture
+def app():
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_OPTIMIZE"] = True
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+class TestOptimizePdf:
+    def test_runs_qpdf_linearize_with_object_streams(self):
+        original = blank_pdf(padding=500)
+        optimized = blank_pdf()
+
+        with patch("subprocess.run", side_effect=fake_qpdf(optimized)) as mock_run:
+            data, success, error = optimize_pdf(original)
+
+        args = mock_run.call_args[0][0]
+        assert args[0] == "qpdf"
+        assert "--linearize" in args
+        assert "--object-streams=generate" in args
+        assert success, error
+        assert data == optimized
+        stats = optimizer_stats()
+        assert stats["optimized"] == 1
+        assert stats["bytes_saved"] == len(original) - len(optimized)
+
+    def test_warnings_exit_code_is_accepted(self):
+        optimized = blank_pdf()
+
+        with patch("subprocess.run", side_effect=fake_qpdf(optimized, returncode=3)):
+            data, success, _ = optimize_pdf(blank_pdf(padding=100))
+
+        assert success
+        assert data == optimized
+
+    def test_page_count_mismatch_keeps_original(self):
+        original = blank_pdf(pages=2)
+
+        with patch("subprocess.run", side_effect=fake_qpdf(blank_pdf(pages=1))):
+            data, success, error = optimize_pdf(original)
+
+        assert not success
+        assert data == original
+        assert "page count" in error
+        assert optimizer_stats()["failed"] == 1
+
+    def test_unreadable_output_keeps_original(self):
+        original = blank_pdf()
+
+        with patch("subprocess.run", side_effect=fake_qpdf(b"garbage")):
+            data, success, _ = optimize_pdf(original)
+
+        assert not success
+        assert data == original
+
+    def test_qpdf_failure_keeps_original(self):
+        original = blank_pdf()
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=2, stdout="", stderr="bad")
+            data, success, error = optimize_pdf(original)
+
+        assert not success
+        assert data == original
+        assert "bad" in error
+
+    def test_missing_binary(self):
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            data, success, error = optimize_pdf(b"%PDF")
+
+        assert data == b"%PDF"
+        assert "not installed" in error
+
+    def test_timeout(self):
+        with patch(
+            "subprocess.run", side_effect=TimeoutExpired(cmd="qpdf", timeout=30)
+        ):
+            data, success, error = optimize_pdf(b"%PDF")
+
+        assert not success
+        assert "timed out" in error
+
+
+class TestStoreFile:
+    def test_pdfs_are_optimized_before_storing(self, app):
+        optimized = blank_pdf()
+
+        with patch("subprocess.run", side_effect=fake_qpdf(optimized)):
+            file_id = ResumeService.store_file(
+                blank_pdf(padding=500), "cv.pdf", "application/pdf"
+            )
+
+        assert BlobStorage.get(file_id).read() == optimized
+
+    def test_latex_is_stored_as_is(self, app):
+        with patch("subprocess.run") as mock_run:
+            file_id = ResumeService.store_file(
+                b"\\documentclass", "cv.tex", "text/x-latex"
+            )
+
+        mock_run.assert_not_called()
+        assert BlobStorage.get(file_id).read() == b"\\documentclass"
+
+    def test_can_be_disabled(self, app):
+        app.config["PDF_OPTIMIZE"] = False
+        original = blank_pdf()
+
+        with patch("subprocess.run") as mock_run:
+            file_id = ResumeService.store_file(original, "cv.pdf", "application/pdf")
+
+        mock_run.assert_not_called()
+        assert BlobStorage.get(file_id).read() == original
+
+    def test_metrics_report_savings(self, app):
+        with patch("subprocess.run", side_effect=fake_qpdf(blank_pdf())):
+            ResumeService.store_file(
+                blank_pdf(padding=500), "cv.pdf", "application/pdf"
+            )
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "o@example.com",
+                    "password": "password123",
+                    "first_name": "O",
+                    "last_name": "P",
+                },
+            )
+            client.post(
+                "/login", data={"email": "o@example.com", "password": "password123"}
+            )
+            response = client.get("/api/metrics")
+
+        stats = response.get_json()["pdf_optimizer"]
+        assert stats["optimized"] == 1
+        assert stats["bytes_saved"] > 0
@@ -0,0 +1,308 @@
+"""Tests for range-capable, cacheable PDF streaming from GridFS."""
+
+import re
+import hashlib
+import pytest
+import mongomock
+import mongomock.gridfs
+from unittest.mock import patch
+from bson import ObjectId
+from datetime import datetime, timezone
+from gridfs import GridFS
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+
+mongomock.gridfs.enable_gridfs_integration()
+
+# Spans several GridFS chunks so ranges cross chunk boundaries
+PDF_BYTES = bytes(range(256)) * 40
+CHUNK_SIZE = 1024
+
+
+@pytest.fixture
+def client():
+    """Create and configure a test client."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+
+        mongo.db = mongomock.MongoClient().db
+
+        with app.test_client() as client:
+            yield client
+
+
+def login(client):
+    client.post(
+        "/signup",
+        data={
+            "email": "test@example.com",
+            "password": "password123",
+            "first_name": "Test",
+            "last_name": "User",
+        },
+    )
+    client.post("/login", data={"email": "test@example.com", "password": "password123"})
+    return str(mongo.db.users.find_one({"email": "test@example.com"})["_id"])
+
+
+def create_resume(user_id=None):
+    fs = GridFS(mongo.db)
+    file_id = fs.put(PDF_BYTES, filename="test.pdf", chunk_size=CHUNK_SIZE)
+    result = mongo.db.resumes.insert_one(
+        {
+            "user_id": user_id,
+            "title": "Range Resume",
+            "filename": "test.pdf",
+            "content_type": "application/pdf",
+            "file_id": file_id,
+            "created_at": datetime.now(timezone.utc),
+        }
+    )
+    return str(result.inserted_id)
+
+
+class TestFullResponse:
+    def test_full_body_advertises_ranges(self, client):
+        resume_id = create_resume()
+
+        response = client.get(f"/resume/{resume_id}/pdf")
+
+        assert response.status_code == 200
+        assert response.data == PDF_BYTES
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["Content-Length"] == str(len(PDF_BYTES))
+        assert "Last-Modified" in response.headers
+        assert response.headers["Content-Disposition"].startswith("inline")
+
+
+class TestSingleRange:
+    def test_range_within_one_chunk(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": "bytes=10-99"}
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[10:100]
+        assert response.headers["Content-Range"] == f"bytes 10-99/{len(PDF_BYTES)}"
+        assert response.headers["Content-Length"] == "90"
+
+    def test_range_across_chunk_boundaries(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": "bytes=1000-3100"}
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[1000:3101]
+
+    def test_open_ended_range(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": "bytes=9000-"}
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[9000:]
+
+    def test_suffix_range(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": "bytes=-500"}
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[-500:]
+
+    def test_range_past_end_is_clamped(self, client):
+        resume_id = create_resume()
+        length = len(PDF_BYTES)
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf",
+            headers={"Range": f"bytes={length - 10}-{length + 100}"},
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[-10:]
+
+    def test_unsatisfiable_range(self, client):
+        resume_id = create_resume()
+        length = len(PDF_BYTES)
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": f"bytes={length}-"}
+        )
+
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == f"bytes */{length}"
+
+    def test_stale_if_range_returns_full_body(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf",
+            headers={
+                "Range": "bytes=0-9",
+                "If-Range": "Wed, 01 Jan 2020 00:00:00 GMT",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.data == PDF_BYTES
+
+
+class TestMultipleRanges:
+    def test_multipart_byteranges(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf",
+            headers={"Range": "bytes=0-9,2000-2049,-5"},
+        )
+
+        assert response.status_code == 206
+        content_type = response.headers["Content-Type"]
+        assert content_type.startswith("multipart/byteranges")
+        boundary = content_type.split("boundary=")[1]
+        assert response.headers["Content-Length"] == str(len(response.data))
+
+        parts = response.data.split(f"--{boundary}".encode())[1:-1]
+        bodies = [part.split(b"\r\n\r\n", 1)[1][:-2] for part in parts]
+        ranges = [
+            re.search(rb"Content-Range: bytes (\d+)-(\d+)/", part).groups()
+            for part in parts
+        ]
+
+        assert bodies == [PDF_BYTES[0:10], PDF_BYTES[2000:2050], PDF_BYTES[-5:]]
+        assert ranges[1] == (b"2000", b"2049")
+
+    def test_adjacent_ranges_are_merged(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": "bytes=0-99,100-199"}
+        )
+
+        assert response.status_code == 206
+        assert response.headers["Content-Type"] == "application/pdf"
+        assert response.data == PDF_BYTES[0:200]
+
+    def test_overlapping_ranges_fall_back_to_full_body(self, client):
+        resume_id = create_resume()
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"Range": "bytes=0-99,50-199"}
+        )
+
+        assert response.status_code == 200
+        assert response.data == PDF_BYTES
+
+
+class TestDownloadRoute:
+    def test_download_streams_ranges(self, client):
+        user_id = login(client)
+        resume_id = create_resume(user_id)
+
+        full = client.get(f"/resume/{resume_id}/pdf/download")
+        partial = client.get(
+            f"/resume/{resume_id}/pdf/download", headers={"Range": "bytes=100-199"}
+        )
+
+        assert full.status_code == 200
+        assert full.data == PDF_BYTES
+        assert full.headers["Content-Disposition"].startswith("attachment")
+        assert 'filename="Range Resume.pdf"' in full.headers["Content-Disposition"]
+        assert partial.status_code == 206
+        assert partial.data == PDF_BYTES[100:200]
+
+
+class TestCaching:
+    def test_etag_derived_from_file_id_and_md5(self, client):
+        with client.application.app_context():
+            file_id = ResumeService.store_file(
+                PDF_BYTES, filename="test.pdf", content_type="application/pdf"
+            )
+        result = mongo.db.resumes.insert_one({"file_id": file_id, "filename": "t.pdf"})
+
+        response = client.get(f"/resume/{result.inserted_id}/pdf")
+
+        assert (
+            response.headers["ETag"]
+            == f'"{file_id}-{hashlib.md5(PDF_BYTES).hexdigest()}"'
+        )
+
+    def test_if_none_match_returns_304_without_reading_chunks(self, client):
+        resume_id = create_resume()
+        etag = client.get(f"/resume/{resume_id}/pdf").headers["ETag"]
+
+        with patch("gridfs.GridOut.read", side_effect=AssertionError("chunk read")):
+            response = client.get(
+                f"/resume/{resume_id}/pdf", headers={"If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+    def test_changed_file_fails_revalidation(self, client):
+        resume_id = create_resume()
+        etag = client.get(f"/resume/{resume_id}/pdf").headers["ETag"]
+        new_file_id = GridFS(mongo.db).put(b"%PDF-1.4 new", filename="new.pdf")
+        mongo.db.resumes.update_one(
+            {"_id": ObjectId(resume_id)}, {"$set": {"file_id": new_file_id}}
+        )
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.data == b"%PDF-1.4 new"
+
+    def test_versioned_url_is_immutable(self, client):
+        resume_id = create_resume()
+        file_id = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})["file_id"]
+
+        versioned = client.get(f"/resume/{resume_id}/pdf?v={file_id}")
+        stale = client.get(f"/resume/{resume_id}/pdf?v={ObjectId()}")
+        plain = client.get(f"/resume/{resume_id}/pdf")
+
+        assert (
+            versioned.headers["Cache-Control"] == "private, max-age=31536000, immutable"
+        )
+        assert stale.headers["Cache-Control"] == "private, no-cache"
+        assert plain.headers["Cache-Control"] == "private, no-cache"
+
+    def test_if_range_with_matching_etag_serves_range(self, client):
+        resume_id = create_resume()
+        etag = client.get(f"/resume/{resume_id}/pdf").headers["ETag"]
+
+        response = client.get(
+            f"/resume/{resume_id}/pdf",
+            headers={"Range": "bytes=0-9", "If-Range": etag},
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[:10]
+
+    def test_pages_link_to_versioned_urls(self, client):
+        user_id = login(client)
+        resume_id = create_resume(user_id)
+        file_id = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})["file_id"]
+
+        feedback = client.get(f"/resume/feedback/{resume_id}")
+        feed = client.get("/feed")
+        with client.application.app_context():
+            entries = ResumeService.get_user_resumes(user_id)
+
+        versioned = f"/resume/{resume_id}/pdf?v={file_id}"
+        assert versioned.encode() in feedback.data
+        assert versioned.encode() in feed.data
+        assert entries[0]["resume_path"] == versioned
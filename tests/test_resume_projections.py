@@ -0,0 +1,137 @@
+"""Tests that resume read paths only pull projected documents."""
+
+import pytest
+import mongomock
+import mongomock.gridfs
+from unittest.mock import patch
+from bson import ObjectId
+from datetime import datetime, timezone
+from gridfs import GridFS
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+@pytest.fixture
+def client():
+    """Create and configure a test client."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+
+        mongo.db = mongomock.MongoClient().db
+
+        with app.test_client() as client:
+            yield client
+
+
+@pytest.fixture
+def unprojected_reads():
+    """Record every read on the resumes collection made without a projection."""
+    calls = []
+    original_find_one = mongomock.collection.Collection.find_one
+    original_find = mongomock.collection.Collection.find
+
+    def _record(collection, args, kwargs):
+        projection = args[1] if len(args) > 1 else kwargs.get("projection")
+        if collection.name == "resumes" and not projection:
+            calls.append(args[0] if args else kwargs.get("filter"))
+
+    def find_one(self, *args, **kwargs):
+        _record(self, args, kwargs)
+        return original_find_one(self, *args, **kwargs)
+
+    def find(self, *args, **kwargs):
+        _record(self, args, kwargs)
+        return original_find(self, *args, **kwargs)
+
+    with patch.object(
+        mongomock.collection.Collection, "find_one", find_one
+    ), patch.object(mongomock.collection.Collection, "find", find):
+        yield calls
+
+
+def login(client):
+    client.post(
+        "/signup",
+        data={
+            "email": "test@example.com",
+            "password": "password123",
+            "first_name": "Test",
+            "last_name": "User",
+        },
+    )
+    client.post("/login", data={"email": "test@example.com", "password": "password123"})
+    return str(mongo.db.users.find_one({"email": "test@example.com"})["_id"])
+
+
+def create_resume(user_id):
+    fs = GridFS(mongo.db)
+    file_id = fs.put(b"%PDF-1.4 test", filename="test.pdf")
+    preview_id = fs.put(b"%PDF-1.4 preview", filename="preview.pdf")
+    result = mongo.db.resumes.insert_one(
+        {
+            "user_id": user_id,
+            "title": "Projected Resume",
+            "filename": "test.pdf",
+            "content_type": "application/pdf",
+            "file_id": file_id,
+            "preview_file_id": preview_id,
+            "preview_template_id": "jake",
+            "preview_template_name": "Jake Template",
+            "created_at": datetime.now(timezone.utc),
+            "structured_data": {
+                "first_name": "Test",
+                "education": [{"institution": "Test School"}],
+            },
+        }
+    )
+    return str(result.inserted_id)
+
+
+class TestProjectedReads:
+    """Every view that touches resumes must read through a projection."""
+
+    def test_views_only_read_projected_documents(self, client, unprojected_reads):
+        user_id = login(client)
+        resume_id = create_resume(user_id)
+
+        responses = [
+            client.get("/feed"),
+            client.get("/resume-reviews"),
+            client.get(f"/resume/feedback/{resume_id}"),
+            client.get(f"/resume/{resume_id}/pdf"),
+            client.get(f"/resume/{resume_id}/pdf?mode=preview"),
+            client.get(f"/resume/{resume_id}/edit"),
+            client.get(f"/resume/{resume_id}/preview"),
+            client.get(f"/resume/{resume_id}/pdf/download"),
+            client.post(f"/resume/{resume_id}/set-default"),
+            client.post(f"/resume/{resume_id}/save"),
+        ]
+
+        assert all(r.status_code in (200, 302) for r in responses)
+        assert unprojected_reads == []
+
+    def test_service_reads_are_projected(self, client, unprojected_reads):
+        with client.application.app_context():
+            user_id = str(ObjectId())
+            resume_id = create_resume(user_id)
+
+            ResumeService.get_user_resumes(user_id)
+            ResumeService.get_resume_by_id(ObjectId(resume_id))
+            ResumeService.get_resume_pdf(resume_id)
+            ResumeService.get_resume_structured_data(resume_id)
+
+        assert unprojected_reads == []
+
+    def test_pdf_pointer_read_excludes_structured_data(self, client):
+        with client.application.app_context():
+            resume_id = create_resume(str(ObjectId()))
+
+            doc, file_obj = ResumeService.get_resume_pdf(resume_id)
+
+        assert file_obj is not None
+        assert "structured_data" not in doc
+        assert doc["title"] == "Projected Resume"
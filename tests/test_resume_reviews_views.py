@@ -89,11 +89,11 @@ class TestResumeReviewsRoute:
         # newest resume should be selected by default
         assert b"Second Resume" in response.data or b"resume2.pdf" in response.data
 
-    def test_resume_reviews_passes_reviews_to_template(self, client):
-        """Test that reviews are retrieved and passed to the template."""
+    def test_resume_reviews_passes_review_counts_to_template(self, client):
+        """Test that the page carries review counts, not the reviews themselves."""
         user_id = create_test_user(client)
 
-        # add resume
+        # add resume with the counters review writes keep up to date
         mongo.db.resumes.insert_one(
             {
                 "_id": "resume_1",
@@ -101,6 +101,7 @@ class TestResumeReviewsRoute:
                 "resume_path": "/static/pdf/resume1.pdf",
                 "title": "Test Resume",
                 "created_at": "2024-01-15",
+                "review_stats": {"reviewers": 2, "highlights": 2},
             }
         )
 
@@ -146,8 +147,10 @@ class TestResumeReviewsRoute:
 
         response = client.get("/resume-reviews")
         assert response.status_code == 200
-        # check reviewer names appear in the page
-        assert b"Alice Chen" in response.data or b"reviewer" in response.data.lower()
+        assert b'"review_count": 2' in response.data
+        # highlights are fetched per resume through the reviews API
+        assert b"Alice Chen" not in response.data
+        assert b"Great work!" not in response.data
 
     def test_resume_reviews_only_shows_user_resumes(self, client):
         """Test that users can only see their own resumes."""
@@ -203,3 +206,57 @@ class TestResumeReviewsRoute:
 
         # response should include the PDF viewer elements
         assert b"pdf" in response.data.lower()
+
+
+class TestResumeReviewsApi:
+    """Tests for /api/resumes/<resume_id>/reviews"""
+
+    def insert_reviews(self, resume_id, count):
+        mongo.db.highlights.insert_many(
+            [
+                {
+                    "document_id": resume_id,
+                    "reviewer_id": f"reviewer_{i}",
+                    "reviewer_name": f"Reviewer {i}",
+                    "first_highlight_created_at": f"2024-01-{i + 1:02d}",
+                    "highlights": {"1": [{"id": f"hl_{i}", "comment": "Nice"}]},
+                }
+                for i in range(count)
+            ]
+        )
+
+    def test_pages_through_reviews_in_order(self, client):
+        user_id = create_test_user(client)
+        resume_id = str(
+            mongo.db.resumes.insert_one(
+                {"user_id": user_id, "title": "Mine", "created_at": "2024-01-15"}
+            ).inserted_id
+        )
+        self.insert_reviews(resume_id, 5)
+
+        first = client.get(f"/api/resumes/{resume_id}/reviews?limit=3").get_json()
+        second = client.get(
+            f"/api/resumes/{resume_id}/reviews?limit=3&offset={first['next_offset']}"
+        ).get_json()
+
+        names = [r["reviewer_name"] for r in first["reviews"] + second["reviews"]]
+        assert names == [f"Reviewer {i}" for i in range(5)]
+        assert first["next_offset"] == 3
+        assert second["next_offset"] is None
+        assert first["reviews"][0] == {
+            "reviewer_id": "reviewer_0",
+            "reviewer_name": "Reviewer 0",
+            "highlights": {"1": [{"id": "hl_0", "comment": "Nice"}]},
+        }
+
+    def test_other_users_resumes_are_not_found(self, client):
+        create_test_user(client)
+        resume_id = str(
+            mongo.db.resumes.insert_one({"user_id": str(ObjectId())}).inserted_id
+        )
+        self.insert_reviews(resume_id, 1)
+
+        response = client.get(f"/api/resumes/{resume_id}/reviews")
+
+        assert response.status_code == 404
+        assert client.get("/api/resumes/not-an-id/reviews").status_code == 404
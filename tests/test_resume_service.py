@@ -4,6 +4,7 @@ import pytest
 import mongomock
 from unittest.mock import patch
 from bson import ObjectId
+from datetime import datetime
 from app import create_app
 from app.extensions import mongo
 from app.services.resume_service import ResumeService
@@ -253,6 +254,40 @@ class TestGetAllReviews:
             assert reviews[0]["reviewer_name"] == "Test Reviewer"
 
 
+class TestGetReviewsPage:
+    """Tests for ResumeService.get_reviews_page()"""
+
+    def test_pages_follow_first_highlight_order(self, app, clean_db):
+        with app.app_context():
+            mongo.db.highlights.insert_many(
+                [
+                    {
+                        "document_id": "resume_1",
+                        "reviewer_name": name,
+                        "first_highlight_created_at": created_at,
+                        "highlights": {},
+                    }
+                    for name, created_at in [
+                        ("Late", "2024-03-01"),
+                        ("Early", "2024-01-01"),
+                        ("Middle", "2024-02-01"),
+                    ]
+                ]
+            )
+
+            first, next_offset = ResumeService.get_reviews_page("resume_1", limit=2)
+            rest, last_offset = ResumeService.get_reviews_page(
+                "resume_1", offset=next_offset, limit=2
+            )
+
+            assert [r["reviewer_name"] for r in first + rest] == [
+                "Early",
+                "Middle",
+                "Late",
+            ]
+            assert (next_offset, last_offset) == (2, None)
+
+
 class TestGetHighlights:
     """Tests for ResumeService.get_highlights()"""
 
@@ -518,6 +553,150 @@ class TestSaveHighlights:
             assert saved_rects[1]["width"] == 180.0
 
 
+class TestApplyHighlightPatch:
+    """Tests for ResumeService.apply_highlight_patch()"""
+
+    def _highlight(self, highlight_id, created_at="2024-01-15T10:00:00Z"):
+        return {
+            "id": highlight_id,
+            "comment": "Nice",
+            "text": "Experience",
+            "rects": [{"x": 1, "y": 2, "width": 3, "height": 4}],
+            "created_at": created_at,
+        }
+
+    def test_add_creates_reviewer_document(self, app, clean_db):
+        with app.app_context():
+            applied = ResumeService.apply_highlight_patch(
+                "resume_1",
+                [{"op": "add", "page": 1, "highlight": self._highlight("hl_1")}],
+                reviewer_id="reviewer_1",
+                reviewer_name="Alice Chen",
+            )
+
+            saved = mongo.db.highlights.find_one({"document_id": "resume_1"})
+            assert applied == 1
+            assert saved["reviewer_id"] == "reviewer_1"
+            assert saved["reviewer_name"] == "Alice Chen"
+            assert saved["highlights"]["1"][0]["id"] == "hl_1"
+            assert saved["first_highlight_created_at"] == datetime(2024, 1, 15, 10, 0)
+
+    def test_add_keeps_earliest_timestamp(self, app, clean_db):
+        with app.app_context():
+            ResumeService.apply_highlight_patch(
+                "resume_1",
+                [
+                    {
+                        "op": "add",
+                        "page": 1,
+                        "highlight": self._highlight("hl_1", "2024-02-01T00:00:00Z"),
+                    },
+                    {
+                        "op": "add",
+                        "page": 2,
+                        "highlight": self._highlight("hl_2", "2024-01-01T00:00:00Z"),
+                    },
+                    {
+                        "op": "add",
+                        "page": 2,
+                        "highlight": self._highlight("hl_3", "2024-03-01T00:00:00Z"),
+                    },
+                ],
+                reviewer_id="reviewer_1",
+            )
+
+            saved = mongo.db.highlights.find_one({"document_id": "resume_1"})
+            assert saved["first_highlight_created_at"] == datetime(2024, 1, 1)
+            assert [h["id"] for h in saved["highlights"]["2"]] == ["hl_2", "hl_3"]
+
+    def test_update_changes_only_target_highlight(self, app, clean_db):
+        with app.app_context():
+            ResumeService.save_highlights(
+                "resume_1",
+                {"1": [self._highlight("hl_1"), self._highlight("hl_2")]},
+                reviewer_id="reviewer_1",
+            )
+
+            applied = ResumeService.apply_highlight_patch(
+                "resume_1",
+                [
+                    {
+                        "op": "update",
+                        "page": "1",
+                        "id": "hl_2",
+                        "changes": {"comment": "Edited", "id": "ignored"},
+                    }
+                ],
+                reviewer_id="reviewer_1",
+            )
+
+            highlights = ResumeService.get_highlights("resume_1", "reviewer_1")
+            assert applied == 1
+            assert highlights["1"][0]["comment"] == "Nice"
+            assert highlights["1"][1]["comment"] == "Edited"
+            assert highlights["1"][1]["id"] == "hl_2"
+
+    def test_delete_removes_highlight_and_empty_page(self, app, clean_db):
+        with app.app_context():
+            ResumeService.save_highlights(
+                "resume_1",
+                {"1": [self._highlight("hl_1")], "2": [self._highlight("hl_2")]},
+                reviewer_id="reviewer_1",
+            )
+
+            ResumeService.apply_highlight_patch(
+                "resume_1",
+                [{"op": "delete", "page": 2, "id": "hl_2"}],
+                reviewer_id="reviewer_1",
+            )
+
+            # Reads assemble the same {page: [...]} shape as wholesale saves
+            assert ResumeService.get_highlights("resume_1", "reviewer_1") == {
+                "1": [self._highlight("hl_1")]
+            }
+            reviews = ResumeService.get_all_reviews("resume_1")
+            assert list(reviews[0]["highlights"].keys()) == ["1"]
+
+    def test_patch_only_touches_own_reviewer_document(self, app, clean_db):
+        with app.app_context():
+            ResumeService.save_highlights(
+                "resume_1", {"1": [self._highlight("hl_1")]}, reviewer_id="reviewer_1"
+            )
+
+            applied = ResumeService.apply_highlight_patch(
+                "resume_1",
+                [{"op": "delete", "page": 1, "id": "hl_1"}],
+                reviewer_id="reviewer_2",
+            )
+
+            assert applied == 0
+            assert ResumeService.get_highlights("resume_1", "reviewer_1") == {
+                "1": [self._highlight("hl_1")]
+            }
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "add", "page": 1, "highlight": {"comment": "no id"}},
+            {"op": "add", "page": "1.$", "highlight": {"id": "hl_1"}},
+            {"op": "add", "page": 0, "highlight": {"id": "hl_1"}},
+            {"op": "update", "page": 1, "id": "hl_1", "changes": {"bogus": 1}},
+            {"op": "delete", "page": 1},
+            {"op": "replace", "page": 1, "id": "hl_1"},
+        ],
+    )
+    def test_invalid_operations_write_nothing(self, app, clean_db, operation):
+        with app.app_context():
+            valid = {"op": "add", "page": 1, "highlight": self._highlight("hl_1")}
+
+            with pytest.raises(ValueError):
+                ResumeService.apply_highlight_patch(
+                    "resume_1", [valid, operation], reviewer_id="reviewer_1"
+                )
+
+            assert mongo.db.highlights.count_documents({}) == 0
+
+
 class TestGetResumePdf:
     """Tests for ResumeService.get_resume_pdf()"""
 
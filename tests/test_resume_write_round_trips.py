@@ -0,0 +1,230 @@
+"""Round-trip counts for ResumeService write paths."""
+
+import pytest
+import mongomock
+import mongomock.gridfs
+from collections import Counter
+from io import BytesIO
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from werkzeug.datastructures import FileStorage
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.blob_backends import BLOBS_COLLECTION
+from app.services.facet_service import FACET_COUNTS_COLLECTION
+from app.services.feed_cache import FEED_STATE_COLLECTION
+
+mongomock.gridfs.enable_gridfs_integration()
+
+# Collection methods that each cost one server round trip
+COUNTED_METHODS = (
+    "find_one",
+    "find",
+    "insert_one",
+    "insert_many",
+    "update_one",
+    "update_many",
+    "replace_one",
+    "delete_one",
+    "delete_many",
+    "count_documents",
+    "find_one_and_update",
+)
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        # Derivatives read the resume from a worker thread; keep them out of the counts
+        app.config["PDF_DERIVATIVES"] = "off"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def round_trips():
+    """Count calls per (collection, method) on mongomock collections.
+
+    Blob traffic lands on blobs or fs.files/fs.chunks, facet rollup traffic
+    on facet_counts and feed cache invalidation on feed_state;
+    document_round_trips() filters these out so tests can assert on
+    document writes alone.
+    """
+    counts = Counter()
+    # mongomock implements some methods on top of others; count the outer call only
+    depth = [0]
+    patches = []
+    for name in COUNTED_METHODS:
+        original = getattr(mongomock.collection.Collection, name)
+
+        def counted(self, *args, _name=name, _original=original, **kwargs):
+            if not depth[0]:
+                counts[(self.name, _name)] += 1
+            depth[0] += 1
+            try:
+                return _original(self, *args, **kwargs)
+            finally:
+                depth[0] -= 1
+
+        patches.append(patch.object(mongomock.collection.Collection, name, counted))
+
+    for p in patches:
+        p.start()
+    yield counts
+    for p in patches:
+        p.stop()
+
+
+def document_round_trips(counts):
+    """Round trips excluding blob storage, facet rollup and feed cache collections."""
+    return {
+        key: value
+        for key, value in counts.items()
+        if not key[0].startswith("fs.")
+        and key[0]
+        not in (BLOBS_COLLECTION, FACET_COUNTS_COLLECTION, FEED_STATE_COLLECTION)
+    }
+
+
+def facet_round_trips(counts):
+    return {
+        key: value for key, value in counts.items() if key[0] == FACET_COUNTS_COLLECTION
+    }
+
+
+def make_user():
+    user_id = ObjectId()
+    mongo.db.users.insert_one({"_id": user_id, "email": "u@example.com"})
+    return str(user_id)
+
+
+class TestSaveResumePdf:
+    def test_single_insert_and_pointer_update(self, app, round_trips):
+        user_id = make_user()
+        round_trips.clear()
+        upload = FileStorage(
+            stream=BytesIO(b"%PDF-1.4 upload"),
+            filename="upload.pdf",
+            content_type="application/pdf",
+        )
+
+        resume_id = ResumeService.save_resume_pdf(upload, user_id=user_id, title="T")
+
+        assert document_round_trips(round_trips) == {
+            ("resumes", "insert_one"): 1,
+            ("users", "update_one"): 1,
+        }
+        doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        assert doc["resume_path"] == f"/resume/{resume_id}/pdf"
+        assert mongo.db.users.find_one()["current_resume_id"] == resume_id
+
+
+class TestSaveResumeStructuredData:
+    def test_new_resume_with_upload_is_one_insert(self, app, round_trips):
+        user_id = make_user()
+        file_id = ObjectId()
+        round_trips.clear()
+
+        resume_id = ResumeService.save_resume_structured_data(
+            {"first_name": "A"},
+            user_id=user_id,
+            title="T",
+            extra_fields=ResumeService.uploaded_pdf_fields(file_id, "cv.pdf"),
+        )
+
+        assert document_round_trips(round_trips) == {
+            ("resumes", "insert_one"): 1,
+            ("users", "update_one"): 1,
+        }
+        doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        assert doc["file_id"] == file_id
+        assert doc["template_id"] == "uploaded"
+        assert doc["resume_path"] == f"/resume/{resume_id}/pdf"
+
+    def test_update_leaves_unchanged_pointer(self, app, round_trips):
+        user_id = make_user()
+        resume_id = ResumeService.save_resume_structured_data(
+            {"first_name": "A"}, user_id=user_id
+        )
+        round_trips.clear()
+
+        ResumeService.save_resume_structured_data(
+            {"first_name": "B"}, user_id=user_id, resume_id=resume_id
+        )
+
+        # One write that also returns the old facet values for the rollup, and
+        # a pointer write that Mongo skips because it already names the resume
+        assert document_round_trips(round_trips) == {
+            ("resumes", "find_one_and_update"): 1,
+            ("users", "update_one"): 1,
+        }
+        assert not ResumeService.set_current_resume_for_user(user_id, resume_id)
+
+    def test_pointer_moved_by_another_worker_is_restored(self, app):
+        user_id = make_user()
+        first = ResumeService.save_resume_structured_data({}, user_id=user_id)
+        second = ResumeService.save_resume_structured_data({}, user_id=user_id)
+        assert mongo.db.users.find_one()["current_resume_id"] == second
+
+        ResumeService.save_resume_structured_data({}, user_id=user_id, resume_id=first)
+
+        assert mongo.db.users.find_one()["current_resume_id"] == first
+
+    def test_facet_rollup_cost_does_not_grow_with_values(self, app, round_trips):
+        skills = [{"category": "Languages", "skills": "Python, Go, Rust, SQL"}]
+        resume_id = ResumeService.save_resume_structured_data({"skills": skills})
+        round_trips.clear()
+
+        skills = [{"category": "Languages", "skills": "Python, Java, Kotlin, C"}]
+        ResumeService.save_resume_structured_data(
+            {"skills": skills}, resume_id=resume_id
+        )
+
+        # Existing counters move with one update_many per direction; only
+        # never-seen values need their own upsert
+        assert facet_round_trips(round_trips) == {
+            ("facet_counts", "update_many"): 1,
+            ("facet_counts", "find"): 1,
+            ("facet_counts", "update_one"): 3,
+        }
+
+    def test_update_moves_changed_pointer(self, app, round_trips):
+        user_id = make_user()
+        first = ResumeService.save_resume_structured_data({}, user_id=user_id)
+        second = ResumeService.save_resume_structured_data({}, user_id=user_id)
+        round_trips.clear()
+
+        ResumeService.save_resume_structured_data({}, user_id=user_id, resume_id=first)
+
+        assert round_trips[("users", "update_one")] == 1
+        assert mongo.db.users.find_one()["current_resume_id"] == first
+
+
+class TestTransactions:
+    def test_writes_share_a_session_on_replica_sets(self, app):
+        session = MagicMock()
+        client = MagicMock()
+        client.topology_description.topology_type_name = "ReplicaSetWithPrimary"
+        client.start_session.return_value.__enter__.return_value = session
+        user_id = make_user()
+
+        with patch.object(mongo, "cx", client, create=True), patch.object(
+            mongo.db.resumes, "insert_one"
+        ) as insert_one, patch.object(mongo.db.users, "update_one") as update_one:
+            ResumeService.save_resume_structured_data({}, user_id=user_id)
+
+        session.start_transaction.assert_called_once()
+        assert insert_one.call_args.kwargs["session"] is session
+        assert update_one.call_args.kwargs["session"] is session
+
+    def test_standalone_writes_have_no_session(self, app):
+        with patch.object(mongo.db.resumes, "insert_one") as insert_one:
+            ResumeService.save_resume_structured_data({})
+
+        assert "session" not in insert_one.call_args.kwargs
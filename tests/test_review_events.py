@@ -0,0 +1,217 @@
+"""Tests for review versions, review deltas and the review event stream."""
+
+import json
+import threading
+import pytest
+import mongomock
+from bson import ObjectId
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.review_events import ReviewEvents
+from app.services.review_stats_service import ReviewStatsService
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "off"
+        app.config["REVIEW_EVENTS_POLL_INTERVAL"] = 0.05
+        app.config["REVIEW_EVENTS_MAX_SECONDS"] = 5
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        client.post(
+            "/signup",
+            data={
+                "email": "o@example.com",
+                "password": "password123",
+                "first_name": "O",
+                "last_name": "U",
+            },
+        )
+        client.post(
+            "/login", data={"email": "o@example.com", "password": "password123"}
+        )
+        yield client
+
+
+@pytest.fixture
+def resume_id(app, client):
+    user_id = str(mongo.db.users.find_one({"email": "o@example.com"})["_id"])
+    return str(mongo.db.resumes.insert_one({"user_id": user_id}).inserted_id)
+
+
+def highlight(highlight_id):
+    return {"id": highlight_id, "comment": "Nice"}
+
+
+def version(resume_id):
+    return mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})["review_version"]
+
+
+def events(chunks):
+    """Decode the "review" events in a list of SSE chunks."""
+    found = []
+    for chunk in chunks:
+        for block in chunk.decode().split("\n\n"):
+            lines = dict(
+                line.split(": ", 1) for line in block.splitlines() if ": " in line
+            )
+            if lines.get("event") == "review":
+                found.append(json.loads(lines["data"]))
+    return found
+
+
+class TestReviewVersions:
+    def test_every_highlights_write_bumps_the_version(self, app, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        ResumeService.apply_highlight_patch(
+            resume_id, [{"op": "add", "page": 1, "highlight": highlight("b")}], "r2"
+        )
+        ResumeService.apply_highlight_patch(
+            resume_id,
+            [{"op": "update", "page": 1, "id": "b", "changes": {"comment": "x"}}],
+            "r2",
+        )
+
+        assert version(resume_id) == 3
+        docs = list(mongo.db.highlights.find())
+        assert {doc["reviewer_id"]: doc["version"] for doc in docs} == {
+            "r1": 1,
+            "r2": 3,
+        }
+        assert not any("version_token" in doc for doc in docs)
+
+    def test_patches_that_change_nothing_publish_nothing(self, app, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        generation = ReviewEvents.generation()
+
+        applied = ResumeService.apply_highlight_patch(
+            resume_id, [{"op": "delete", "page": 1, "id": "missing"}], "r1"
+        )
+
+        assert applied == 0
+        assert version(resume_id) == 1
+        assert ReviewEvents.generation() == generation
+
+    def test_writes_in_flight_are_not_missed(self, app, resume_id):
+        seen = []
+        next_version = ReviewStatsService.next_version
+
+        def read_then_publish(document_id):
+            # A reader between the highlights write and its version
+            seen.append(ResumeService.get_review_changes(resume_id, 0))
+            return next_version(document_id)
+
+        with patch.object(
+            ReviewStatsService, "next_version", side_effect=read_then_publish
+        ):
+            ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+
+        reviews, since = seen[0]
+        assert since == 0
+        assert [r["reviewer_id"] for r in reviews] == ["r1"]
+        # Asking again from that version still returns the write
+        assert ResumeService.get_review_changes(resume_id, since)[1] == 1
+
+    def test_changes_since_a_version(self, app, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        ResumeService.save_highlights(resume_id, {"2": [highlight("b")]}, "r2")
+        ResumeService.save_highlights(resume_id, {"1": [highlight("c")]}, "r1")
+
+        reviews, latest = ResumeService.get_review_changes(resume_id, 1)
+
+        assert [r["reviewer_id"] for r in reviews] == ["r2", "r1"]
+        assert reviews[1]["highlights"] == {"1": [highlight("c")]}
+        assert latest == 3
+        assert ResumeService.get_review_changes(resume_id, 3) == ([], 3)
+
+    def test_writes_wake_waiting_listeners(self, app, resume_id):
+        generation = ReviewEvents.generation()
+        woken = []
+        listener = threading.Thread(
+            target=lambda: woken.append(ReviewEvents.wait(generation, 5))
+        )
+        listener.start()
+
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        listener.join(timeout=5)
+
+        assert woken and woken[0] > generation
+
+
+class TestReviewChangesEndpoint:
+    def test_returns_reviews_written_since(self, client, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        ResumeService.save_highlights(resume_id, {"1": [highlight("b")]}, "r2")
+
+        data = client.get(
+            f"/api/resumes/{resume_id}/reviews/changes?since=1"
+        ).get_json()
+
+        assert data["version"] == 2
+        assert [r["reviewer_id"] for r in data["reviews"]] == ["r2"]
+
+    def test_only_the_owner_sees_changes(self, client):
+        other = str(mongo.db.resumes.insert_one({"user_id": "someone"}).inserted_id)
+
+        response = client.get(f"/api/resumes/{other}/reviews/changes?since=0")
+
+        assert response.status_code == 404
+
+
+class TestReviewEventStream:
+    def test_reports_current_versions_then_changes(self, client, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+
+        response = client.get("/api/resume-reviews/events", buffered=False)
+        chunks = iter(response.response)
+        first = [next(chunks), next(chunks)]
+
+        ResumeService.save_highlights(resume_id, {"1": [highlight("b")]}, "r2")
+        later = [next(chunks)]
+        response.close()
+
+        assert response.mimetype == "text/event-stream"
+        assert first[0].startswith(b"retry:")
+        assert events(first) == [{"resume_id": resume_id, "version": 1, "reviewers": 1}]
+        assert events(later) == [{"resume_id": resume_id, "version": 2, "reviewers": 2}]
+
+    def test_stream_ends_after_max_seconds(self, app, client, resume_id):
+        app.config["REVIEW_EVENTS_MAX_SECONDS"] = 0.1
+
+        with client.get("/api/resume-reviews/events") as response:
+            body = response.get_data()
+
+        assert events([body]) == [
+            {"resume_id": resume_id, "version": 0, "reviewers": 0}
+        ]
+
+    def test_streams_per_worker_are_capped(self, app, client, resume_id):
+        app.config["REVIEW_EVENTS_MAX_SECONDS"] = 0.1
+        app.config["REVIEW_EVENTS_MAX_STREAMS"] = 0
+
+        response = client.get("/api/resume-reviews/events")
+
+        # No content: EventSource gives up instead of reconnecting
+        assert response.status_code == 204
+        app.config["REVIEW_EVENTS_MAX_STREAMS"] = 1
+        # A closed stream frees its slot
+        for _ in range(2):
+            with client.get("/api/resume-reviews/events") as response:
+                assert response.status_code == 200
+
+    def test_requires_login(self, app):
+        with app.test_client() as client:
+            assert client.get("/api/resume-reviews/events").status_code == 302
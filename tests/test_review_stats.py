@@ -0,0 +1,215 @@
+"""Tests for per-resume review counters."""
+
+import pytest
+import mongomock
+from datetime import datetime
+from bson import ObjectId
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.services.feed_cache import FeedCache
+from app.services.resume_service import ResumeService
+from app.services.review_stats_service import ReviewStatsService, empty_stats
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "off"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def resume_id(app):
+    return str(mongo.db.resumes.insert_one({"title": "Mine"}).inserted_id)
+
+
+def highlight(highlight_id, created_at="2024-01-15T10:00:00Z"):
+    return {"id": highlight_id, "comment": "Nice", "created_at": created_at}
+
+
+def stats(resume_id):
+    doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+    return ReviewStatsService.summary(doc)
+
+
+class TestCountersOnWrite:
+    def test_wholesale_saves_apply_deltas(self, app, resume_id):
+        ResumeService.save_highlights(
+            resume_id, {"1": [highlight("a"), highlight("b")]}, "r1"
+        )
+        ResumeService.save_highlights(resume_id, {"2": [highlight("c")]}, "r2")
+        ResumeService.save_highlights(
+            resume_id, {"1": [highlight("a")], "3": [highlight("d")]}, "r1"
+        )
+
+        result = stats(resume_id)
+        assert result["reviewers"] == 2
+        assert result["highlights"] == 3
+        assert result["pages"] == {"1": 1, "2": 1, "3": 1}
+        assert isinstance(result["last_reviewed_at"], datetime)
+
+    def test_patches_apply_deltas(self, app, resume_id):
+        ResumeService.apply_highlight_patch(
+            resume_id,
+            [
+                {"op": "add", "page": 1, "highlight": highlight("a")},
+                {"op": "add", "page": 2, "highlight": highlight("b")},
+            ],
+            "r1",
+        )
+        ResumeService.apply_highlight_patch(
+            resume_id,
+            [
+                {"op": "delete", "page": 1, "id": "a"},
+                # Nothing to delete, so nothing is counted
+                {"op": "delete", "page": 2, "id": "missing"},
+                {"op": "update", "page": 2, "id": "b", "changes": {"comment": "x"}},
+            ],
+            "r1",
+        )
+
+        result = stats(resume_id)
+        assert result["reviewers"] == 1
+        assert result["highlights"] == 1
+        assert result["pages"] == {"2": 1}
+
+    def test_counters_match_a_reconcile(self, app, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        ResumeService.apply_highlight_patch(
+            resume_id,
+            [{"op": "add", "page": 1, "highlight": highlight("b")}],
+            "r2",
+        )
+
+        report = ReviewStatsService.reconcile()
+
+        assert report == {"resumes": 1, "corrected": 0}
+
+
+class TestReconcile:
+    def test_backfills_from_highlights(self, app, resume_id):
+        untouched = mongo.db.resumes.insert_one({"title": "Unreviewed"}).inserted_id
+        mongo.db.highlights.insert_many(
+            [
+                {
+                    "document_id": resume_id,
+                    "reviewer_id": "r1",
+                    "highlights": {
+                        "1": [highlight("a", "2024-02-01T00:00:00Z")],
+                        "2": [],
+                    },
+                },
+                {
+                    "document_id": resume_id,
+                    "reviewer_id": "r2",
+                    "highlights": {"1": [highlight("b", "2024-03-01T12:00:00Z")]},
+                },
+            ]
+        )
+
+        report = ReviewStatsService.reconcile()
+
+        assert report == {"resumes": 2, "corrected": 1}
+        assert stats(resume_id) == {
+            "reviewers": 2,
+            "highlights": 2,
+            "pages": {"1": 2},
+            "last_reviewed_at": datetime(2024, 3, 1, 12, 0),
+        }
+        assert "review_stats" not in mongo.db.resumes.find_one({"_id": untouched})
+
+    def test_corrects_drifted_counters(self, app, resume_id):
+        ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+        mongo.db.resumes.update_one(
+            {"_id": ObjectId(resume_id)}, {"$inc": {"review_stats.highlights": 5}}
+        )
+
+        assert ReviewStatsService.reconcile()["corrected"] == 1
+        assert stats(resume_id)["highlights"] == 1
+
+    def test_missing_stats_read_as_zero(self):
+        assert ReviewStatsService.summary({}) == empty_stats()
+
+
+class TestReaders:
+    def test_feed_cards_and_reviews_page_read_the_counters(self, app):
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "r@example.com",
+                    "password": "password123",
+                    "first_name": "R",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "r@example.com", "password": "password123"}
+            )
+            user_id = str(mongo.db.users.find_one({"email": "r@example.com"})["_id"])
+            resume_id = str(
+                mongo.db.resumes.insert_one(
+                    {"user_id": user_id, "title": "Mine", "created_at": datetime.now()}
+                ).inserted_id
+            )
+            ResumeService.save_highlights(
+                resume_id, {"1": [highlight("a"), highlight("b")]}, "r1"
+            )
+
+            with patch.object(
+                mongo.db.highlights, "aggregate", side_effect=AssertionError
+            ):
+                feed = client.get("/api/feed?fields=review_count,comment_count")
+                page = client.get("/resume-reviews")
+
+        assert feed.get_json()["items"][0] == {
+            "_id": resume_id,
+            "review_count": 1,
+            "comment_count": 2,
+        }
+        assert b'"review_count": 1' in page.data
+
+    def test_cached_feed_pages_pick_up_new_reviews(self, app):
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "r@example.com",
+                    "password": "password123",
+                    "first_name": "R",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "r@example.com", "password": "password123"}
+            )
+            resume_id = str(
+                mongo.db.resumes.insert_one(
+                    {"title": "Mine", "created_at": datetime.now()}
+                ).inserted_id
+            )
+            url = "/api/feed?fields=review_count,comment_count"
+            before = client.get(url).get_json()["items"][0]
+
+            ResumeService.save_highlights(resume_id, {"1": [highlight("a")]}, "r1")
+            after = client.get(url).get_json()["items"][0]
+
+        assert before["review_count"] == 0
+        assert after["review_count"] == after["comment_count"] == 1
+
+    def test_reconcile_invalidates_cached_feed_pages(self, app, resume_id):
+        mongo.db.resumes.update_one(
+            {"_id": ObjectId(resume_id)}, {"$set": {"review_stats.highlights": 5}}
+        )
+        generation = FeedCache.generation()
+
+        ReviewStatsService.reconcile()
+
+        assert FeedCache.generation() != generation
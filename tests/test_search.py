@@ -0,0 +1,345 @@
+"""Tests for the in-process BM25 feed search."""
+
+import json
+import os
+import threading
+import pytest
+import mongomock
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.search_service import SearchService, search_fields
+from app.utils.search_index import SearchIndex, edit_distance, tokenize
+
+
+def make_index():
+    index = SearchIndex({"name": 3.0, "text": 1.0})
+    index.add("a", {"name": "Ada Lovelace", "text": "python machine learning"}, 100)
+    index.add("b", {"name": "Grace Hopper", "text": "java compilers python"}, 200)
+    index.add("c", {"name": "Alan Turing", "text": "javascript react frontend"}, 300)
+    return index
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a test app with a search snapshot in a temp directory."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["SEARCH_BUILD"] = "sync"
+        app.config["SEARCH_SNAPSHOT_PATH"] = str(tmp_path / "search.json")
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+def insert_resume(name, skills="", role="", created_at=None, **fields):
+    doc = {
+        "title": f"{name} resume",
+        "created_at": created_at or datetime.now(timezone.utc),
+        "structured_data": {
+            "name": name,
+            "skills": [{"category": "Languages", "skills": skills}],
+            "experience": [{"role": role, "company": "Acme", "bullets": ["Shipped"]}],
+        },
+        **fields,
+    }
+    return str(mongo.db.resumes.insert_one(doc).inserted_id)
+
+
+def join_build_threads():
+    for thread in threading.enumerate():
+        if thread.name == "search-build":
+            thread.join(5)
+
+
+def login(client):
+    client.post(
+        "/signup",
+        data={
+            "email": "s@example.com",
+            "password": "password123",
+            "first_name": "S",
+            "last_name": "U",
+        },
+    )
+    client.post("/login", data={"email": "s@example.com", "password": "password123"})
+
+
+class TestSearchIndex:
+    def test_tokenize_keeps_technical_terms(self):
+        assert tokenize("C++, C# and Node.js!") == ["c++", "c#", "and", "node.js"]
+
+    def test_edit_distance_is_bounded(self):
+        assert edit_distance("pythn", "python", 1) == 1
+        assert edit_distance("pyhton", "python", 1) == 1
+        assert edit_distance("python", "pascal", 1) == 2
+
+    def test_bm25_ranks_field_weighted_matches_first(self):
+        index = make_index()
+        index.add("d", {"name": "Python Jones", "text": "ruby"}, 50)
+
+        results, total = index.search("python ")
+
+        assert total == 3
+        # A name match outweighs the same term in body text
+        assert results[0][0] == "d"
+
+    def test_all_tokens_must_match(self):
+        results, total = make_index().search("python java ")
+
+        assert total == 1
+        assert results[0][0] == "b"
+
+    def test_prefix_matches_last_token(self):
+        results, _ = make_index().search("javas")
+
+        assert [key for key, _ in results] == ["c"]
+
+    def test_trailing_space_disables_prefix(self):
+        assert make_index().search("javasc ")[1] == 0
+
+    def test_typos_fall_back_to_fuzzy_matches(self):
+        results, total = make_index().search("pyhton ")
+
+        assert total == 2
+        assert {key for key, _ in results} == {"a", "b"}
+
+    def test_recency_breaks_ties(self):
+        index = SearchIndex()
+        index.add("old", {"text": "python"}, timestamp=0)
+        index.add("new", {"text": "python"}, timestamp=86400 * 60)
+
+        results, _ = index.search(
+            "python ", now=86400 * 60, recency_weight=0.5, half_life_days=30
+        )
+
+        assert [key for key, _ in results] == ["new", "old"]
+
+    def test_reindex_and_remove(self):
+        index = make_index()
+        index.add("a", {"name": "Ada Lovelace", "text": "rust"})
+        index.remove("c")
+
+        assert index.search("python ")[1] == 1
+        assert index.search("rust ")[1] == 1
+        assert index.search("react ")[1] == 0
+        assert index.stats()["tombstones"] == 2
+
+        index.compact()
+
+        assert index.stats()["tombstones"] == 0
+        assert index.search("rust ")[0][0][0] == "a"
+
+    def test_pagination(self):
+        index = SearchIndex()
+        for i in range(5):
+            index.add(str(i), {"text": "python " * (i + 1)})
+
+        first, total = index.search("python ", limit=2)
+        second, _ = index.search("python ", limit=2, offset=2)
+
+        assert total == 5
+        assert len(first) == len(second) == 2
+        assert not {k for k, _ in first} & {k for k, _ in second}
+
+    def test_snapshot_round_trip(self):
+        index = make_index()
+        index.remove("b")
+
+        restored = SearchIndex.from_snapshot(index.to_snapshot())
+
+        assert len(restored) == 2
+        assert restored.watermark == index.watermark
+        assert restored.search("javas") == index.search("javas")
+        assert restored.search("pyhton ")[1] == 1
+
+    def test_stale_snapshot_is_ignored(self):
+        assert SearchIndex.from_snapshot({"version": -1}) is None
+
+
+class TestSearchFields:
+    def test_structured_data_is_split_into_weighted_fields(self):
+        fields = search_fields(
+            {
+                "title": "My CV",
+                "structured_data": {
+                    "first_name": "Ada",
+                    "last_name": "Lovelace",
+                    "experience": [
+                        {"role": "Engineer", "company": "Acme", "bullets": ["Built"]}
+                    ],
+                    "projects": [{"title": "Engine", "bullets": ["Designed"]}],
+                    "education": [{"institution": "Cambridge", "degree": "Maths"}],
+                    "skills": [{"category": "Languages", "skills": "Python"}],
+                },
+            }
+        )
+
+        assert "Ada" in fields["name"] and "Lovelace" in fields["name"]
+        assert fields["roles"] == "Engineer"
+        assert "Acme" in fields["organizations"]
+        assert "Cambridge" in fields["organizations"]
+        assert "Python" in fields["skills"]
+        for word in ("Built", "Engine", "Designed", "Maths"):
+            assert word in fields["text"]
+
+    def test_uploaded_pdf_without_structured_data(self):
+        fields = search_fields({"filename": "cv.pdf"})
+
+        assert fields["title"] == "cv.pdf"
+
+
+class TestSearchService:
+    def test_builds_from_resumes_and_writes_snapshot(self, app):
+        resume_id = insert_resume("Ada Lovelace", skills="Python")
+
+        results, total = SearchService.search("python")
+
+        assert total == 1
+        assert results[0][0] == resume_id
+        assert os.path.exists(app.config["SEARCH_SNAPSHOT_PATH"])
+
+    def test_new_worker_starts_from_snapshot_and_catches_up(self, app):
+        old = insert_resume(
+            "Ada", skills="Python", created_at=datetime.now(timezone.utc) - timedelta(1)
+        )
+        SearchService.index()
+        app.extensions.pop("search_index")
+        new = insert_resume("Grace", skills="Python")
+
+        with patch.object(SearchService, "build", side_effect=AssertionError):
+            results, total = SearchService.search("python")
+
+        assert total == 2
+        assert {key for key, _ in results} == {old, new}
+
+    def test_saving_structured_data_updates_loaded_index(self, app):
+        SearchService.index()
+
+        resume_id = ResumeService.save_resume_structured_data(
+            {"name": "Linus", "skills": [{"category": "Tools", "skills": "Kubernetes"}]}
+        )
+
+        assert SearchService.search("kubernetes")[0][0][0] == resume_id
+
+    def test_writes_do_not_load_the_index(self, app):
+        ResumeService.save_resume_structured_data({"name": "Linus"})
+
+        assert SearchService.loaded_index() is None
+
+    def test_other_workers_writes_are_synced(self, app):
+        app.config["SEARCH_SYNC_INTERVAL"] = 0
+        SearchService.index()
+
+        # Written directly, as another worker would
+        resume_id = insert_resume("Grace", skills="Cobol")
+
+        assert SearchService.search("cobol")[0][0][0] == resume_id
+
+    def test_other_workers_edits_are_synced(self, app):
+        resume_id = insert_resume(
+            "Ada", created_at=datetime.now(timezone.utc) - timedelta(1)
+        )
+        SearchService.index()
+        app.config["SEARCH_SYNC_INTERVAL"] = 0
+
+        # A title edit leaves created_at alone; updated_at carries it over
+        with patch.object(SearchService, "index_resume"):
+            ResumeService.update_resume(resume_id, {"title": "Compiler engineer"})
+
+        assert SearchService.search("compiler")[0][0][0] == resume_id
+
+    def test_other_workers_deletes_are_synced(self, app):
+        kept = insert_resume("Ada", skills="Python")
+        deleted = insert_resume("Grace", skills="Python")
+        SearchService.index()
+        app.config["SEARCH_SYNC_INTERVAL"] = 0
+
+        mongo.db.resumes.delete_one({"_id": ObjectId(deleted)})
+
+        results, total = SearchService.search("python")
+        assert total == 1
+        assert results[0][0] == kept
+
+    def test_snapshot_is_json(self, app):
+        insert_resume("Ada Lovelace", skills="Python")
+
+        SearchService.index()
+
+        with open(app.config["SEARCH_SNAPSHOT_PATH"]) as f:
+            assert json.load(f)["keys"]
+
+    def test_background_load_answers_none_until_ready(self, app):
+        app.config["SEARCH_BUILD"] = "async"
+        resume_id = insert_resume("Ada Lovelace", skills="Python")
+        release = threading.Event()
+        build = SearchService.build
+
+        def slow_build():
+            release.wait(5)
+            return build()
+
+        with patch.object(SearchService, "build", side_effect=slow_build):
+            assert SearchService.search("python") is None
+            release.set()
+            join_build_threads()
+
+        assert SearchService.search("python")[0][0][0] == resume_id
+
+    def test_failed_background_load_is_retried(self, app):
+        app.config["SEARCH_BUILD"] = "async"
+
+        with patch.object(SearchService, "build", side_effect=RuntimeError):
+            assert SearchService.index() is None
+            join_build_threads()
+
+        assert "search_index" not in app.extensions
+
+
+class TestFeedSearch:
+    def test_feed_ranks_search_results(self, app):
+        insert_resume("Ada Lovelace", skills="Python", role="Engineer")
+        insert_resume("Grace Hopper", skills="Cobol", role="Admiral")
+
+        with app.test_client() as client:
+            login(client)
+            response = client.get("/feed?q=pythn")
+
+        html = response.data.decode()
+        assert response.status_code == 200
+        assert "Ada Lovelace resume" in html
+        assert "Grace Hopper resume" not in html
+
+    def test_feed_answers_503_while_the_index_loads(self, app):
+        app.config["SEARCH_BUILD"] = "async"
+        release = threading.Event()
+        build = SearchService.build
+
+        def slow_build():
+            release.wait(5)
+            return build()
+
+        with app.test_client() as client:
+            login(client)
+            with patch.object(SearchService, "build", side_effect=slow_build):
+                page = client.get("/feed?q=python")
+                api = client.get("/api/feed?q=python")
+                release.set()
+                join_build_threads()
+
+        assert page.status_code == api.status_code == 503
+        assert page.headers["Retry-After"] == api.headers["Retry-After"]
+        assert "warming up" in page.data.decode()
+
+    def test_build_command_writes_snapshot(self, app):
+        insert_resume("Ada Lovelace", skills="Python")
+
+        result = app.test_cli_runner().invoke(args=["build-search-index"])
+
+        assert "Indexed 1 resume(s)" in result.output
+        assert os.path.exists(app.config["SEARCH_SNAPSHOT_PATH"])
@@ -0,0 +1,294 @@
+"""Tests for similar-resume recommendations."""
+
+import threading
+import pytest
+import mongomock
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.similarity_service import SimilarityService, SIMILARITY_WEIGHTS
+from app.utils import similarity_index
+from app.utils.similarity_index import SimilarityIndex, hashed_features
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "off"
+        app.config["SIMILAR_BUILD"] = "sync"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+def fields(skills="", roles="", text=""):
+    return {"skills": skills, "roles": roles, "text": text}
+
+
+def resume(skills="", role="", summary=""):
+    return {
+        "skills": [{"category": "Languages", "skills": skills}],
+        "experience": [{"role": role, "company": "Acme"}],
+        "professional_summary": summary,
+    }
+
+
+def make_index():
+    return SimilarityIndex.build(
+        [
+            ("py-data", fields("Python, Pandas, SQL", "Data Engineer"), 1.0),
+            ("py-ml", fields("Python, PyTorch, SQL", "ML Engineer"), 2.0),
+            ("py-web", fields("Python, Django", "Backend Developer"), 3.0),
+            ("design", fields("Figma, Sketch", "Product Designer"), 4.0),
+        ],
+        SIMILARITY_WEIGHTS,
+    )
+
+
+def keys(results):
+    return [key for key, _ in results]
+
+
+class TestHashedFeatures:
+    def test_fields_are_namespaced_and_sublinear(self):
+        indices, values = hashed_features(
+            fields(skills="python", text="python python"), SIMILARITY_WEIGHTS
+        )
+
+        assert len(indices) == 2
+        assert list(indices) == sorted(indices)
+        # skills weight 3 for one mention; text weight 1 * (1 + ln 2)
+        assert sorted(values.tolist()) == pytest.approx([1.6931, 3.0], abs=1e-4)
+
+
+class TestSimilarityIndex:
+    def test_nearest_neighbours_by_cosine(self):
+        results = make_index().similar("py-data", k=3)
+
+        assert keys(results) == ["py-ml", "py-web"]
+        assert 0 < results[1][1] < results[0][1] < 1
+
+    def test_unknown_key(self):
+        assert make_index().similar("missing") == []
+
+    def test_incremental_add_and_reindex(self):
+        index = make_index()
+
+        index.add("py-data-2", fields("Python, Pandas, SQL", "Data Engineer"), 5.0)
+        index.add("py-web", fields("Figma, Sketch", "Product Designer"))
+
+        assert keys(index.similar("py-data", k=1)) == ["py-data-2"]
+        assert keys(index.similar("design", k=1)) == ["py-web"]
+        assert index.watermark == 5.0
+        assert len(index) == 5
+
+    def test_removed_documents_are_not_recommended(self):
+        index = make_index()
+
+        index.remove("py-ml")
+
+        assert "py-ml" not in keys(index.similar("py-data"))
+        assert index.similar("py-ml") == []
+
+    def test_merge_and_compaction(self, monkeypatch):
+        monkeypatch.setattr(similarity_index, "MERGE_THRESHOLD", 4)
+        index = make_index()
+
+        for i in range(8):
+            index.add(f"extra-{i}", fields("Go, Kubernetes", "SRE"))
+        index.remove("design")
+        for i in range(4):
+            index.add(f"extra-{i}", fields("Go, Kubernetes", "SRE"))
+
+        stats = index.stats()
+        assert stats["pending"] == 0
+        assert stats["documents"] == 11
+        assert stats["tombstones"] == 0
+        assert set(keys(index.similar("extra-0", k=20))) == {
+            f"extra-{i}" for i in range(1, 8)
+        }
+        assert keys(index.similar("py-data", k=1)) == ["py-ml"]
+
+    def test_match_ranks_documents_against_a_query(self):
+        results = make_index().match(
+            fields(
+                skills="We need Python and PyTorch",
+                roles="We need Python and PyTorch",
+                text="We need Python and PyTorch",
+            ),
+            k=2,
+        )
+
+        assert [key for key, _, _ in results] == ["py-ml", "py-web"]
+        # PyTorch is rarer than Python, so it explains more of the match
+        assert results[0][2] == ["pytorch", "python"]
+        assert results[1][2] == ["python"]
+
+    def test_match_scores_in_chunks(self, monkeypatch):
+        index = make_index()
+        expected = index.match(fields(skills="python sql"), k=3)
+
+        monkeypatch.setattr(similarity_index, "SCORE_CHUNK_ROWS", 1)
+
+        assert index.match(fields(skills="python sql"), k=3) == expected
+        assert index.match(fields(skills="cobol"), k=3) == []
+
+
+class TestSimilarityService:
+    def test_writes_update_a_loaded_index(self, app):
+        first = ResumeService.save_resume_structured_data(
+            resume("Python, Pandas", "Data Engineer")
+        )
+        SimilarityService.index()
+
+        second = ResumeService.save_resume_structured_data(
+            resume("Python, Pandas", "Data Analyst")
+        )
+        third = ResumeService.save_resume_structured_data(resume("Figma", "Designer"))
+
+        # Only the "Languages" skill category links the designer to the others
+        assert keys(SimilarityService.similar(first)) == [str(second), str(third)]
+
+    def test_other_workers_writes_arrive_on_sync(self, app):
+        app.config["SIMILAR_SYNC_INTERVAL"] = 0
+        first = ResumeService.save_resume_structured_data(resume("Rust, Tokio"))
+        SimilarityService.index()
+
+        with patch.object(SimilarityService, "index_resume"):
+            second = ResumeService.save_resume_structured_data(resume("Rust, Tokio"))
+
+        assert keys(SimilarityService.similar(first)) == [str(second)]
+
+    def test_background_build_answers_none_until_ready(self, app):
+        app.config["SIMILAR_BUILD"] = "async"
+        first = ResumeService.save_resume_structured_data(resume("Go, gRPC"))
+        second = ResumeService.save_resume_structured_data(resume("Go, gRPC"))
+        release = threading.Event()
+        build = SimilarityService.build
+
+        def slow_build():
+            release.wait(5)
+            return build()
+
+        with patch.object(SimilarityService, "build", side_effect=slow_build):
+            assert SimilarityService.similar(first) is None
+            assert SimilarityService.match("Go developer") is None
+            release.set()
+            for thread in threading.enumerate():
+                if thread.name == "similarity-build":
+                    thread.join(5)
+
+        assert keys(SimilarityService.similar(first)) == [str(second)]
+
+    def test_failed_background_build_is_retried(self, app):
+        app.config["SIMILAR_BUILD"] = "async"
+
+        with patch.object(SimilarityService, "build", side_effect=RuntimeError):
+            assert SimilarityService.index() is None
+            for thread in threading.enumerate():
+                if thread.name == "similarity-build":
+                    thread.join(5)
+
+        assert "similarity_index" not in app.extensions
+
+
+class TestSimilarEndpoint:
+    def test_returns_cards_with_scores(self, app):
+        first = ResumeService.save_resume_structured_data(
+            resume("Python, SQL", "Data Engineer")
+        )
+        second = ResumeService.save_resume_structured_data(
+            resume("Python, SQL", "Analytics Engineer")
+        )
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "s@example.com",
+                    "password": "password123",
+                    "first_name": "S",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "s@example.com", "password": "password123"}
+            )
+            response = client.get(
+                f"/api/resumes/{first}/similar?fields=title,experience_level"
+            )
+            missing = client.get("/api/resumes/000000000000000000000000/similar")
+
+        items = response.get_json()["items"]
+        assert [item["_id"] for item in items] == [str(second)]
+        assert items[0]["experience_level"] == "Analytics Engineer at Acme"
+        assert items[0]["url"] == f"/resume/feedback/{second}"
+        assert 0 < items[0]["score"] <= 1
+        assert missing.status_code == 404
+
+    def test_unavailable_while_the_index_builds(self, app):
+        resume_id = ResumeService.save_resume_structured_data(resume("Python"))
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "s@example.com",
+                    "password": "password123",
+                    "first_name": "S",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "s@example.com", "password": "password123"}
+            )
+            with patch.object(SimilarityService, "index", return_value=None):
+                response = client.get(f"/api/resumes/{resume_id}/similar")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+
+
+class TestMatchEndpoint:
+    def test_ranks_resumes_for_a_job_description(self, app):
+        ResumeService.save_resume_structured_data(resume("Figma", "Designer"))
+        ml = ResumeService.save_resume_structured_data(
+            resume("Python, PyTorch", "ML Engineer")
+        )
+        web = ResumeService.save_resume_structured_data(
+            resume("Python, Django", "Backend Developer")
+        )
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "m@example.com",
+                    "password": "password123",
+                    "first_name": "M",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "m@example.com", "password": "password123"}
+            )
+            response = client.post(
+                "/api/resumes/match?fields=title",
+                json={
+                    "job_description": "Senior ML engineer: Python, PyTorch",
+                    "limit": 2,
+                },
+            )
+            empty = client.post("/api/resumes/match", json={})
+
+        items = response.get_json()["items"]
+        assert [item["_id"] for item in items] == [str(ml), str(web)]
+        assert items[0]["matched_terms"][0] == "pytorch"
+        assert {"python", "ml", "engineer"} <= set(items[0]["matched_terms"])
+        assert set(items[0]) == {"_id", "title", "score", "url", "matched_terms"}
+        assert empty.status_code == 400
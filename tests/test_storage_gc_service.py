@@ -0,0 +1,122 @@
+"""Tests for the GridFS garbage collector."""
+
+import pytest
+import mongomock
+import mongomock.gridfs
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+from gridfs import GridFS
+from app import create_app
+from app.commands import gc_storage_command
+from app.extensions import mongo
+from app.services.storage_gc_service import StorageGCService
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+def put_file(data, age=timedelta(days=2)):
+    """Store a GridFS file and backdate its upload time."""
+    file_id = GridFS(mongo.db).put(data, filename="file.bin")
+    mongo.db["fs.files"].update_one(
+        {"_id": file_id},
+        {"$set": {"uploadDate": datetime.now(timezone.utc) - age}},
+    )
+    return file_id
+
+
+class TestFindOrphanedFiles:
+    def test_referenced_files_are_kept(self, app):
+        referenced = {
+            field: put_file(b"x" * 10)
+            for field in (
+                "file_id",
+                "preview_file_id",
+                "latex_file_id",
+                "preview_latex_file_id",
+            )
+        }
+        mongo.db.resumes.insert_one(dict(referenced))
+        orphan = put_file(b"y" * 20)
+
+        orphans = StorageGCService.find_orphaned_files()
+
+        assert orphans == [(orphan, 20)]
+
+    def test_recent_files_are_within_grace_period(self, app):
+        put_file(b"fresh upload", age=timedelta(minutes=5))
+
+        assert StorageGCService.find_orphaned_files(timedelta(hours=1)) == []
+
+
+class TestCollect:
+    def test_dry_run_reports_without_deleting(self, app):
+        put_file(b"a" * 100)
+        put_file(b"b" * 50)
+
+        report = StorageGCService.collect(dry_run=True)
+
+        assert report == {
+            "dry_run": True,
+            "orphaned_files": 2,
+            "deleted_files": 0,
+            "reclaimed_bytes": 150,
+        }
+        assert mongo.db["fs.files"].count_documents({}) == 2
+
+    def test_deletes_files_and_chunks_in_batches(self, app):
+        kept = put_file(b"kept")
+        mongo.db.resumes.insert_one({"file_id": kept})
+        for _ in range(5):
+            put_file(b"z" * 30)
+
+        # Patch the module's time binding, not time.sleep itself, so pymongo's
+        # background threads don't add calls
+        with patch("app.services.storage_gc_service.time") as mock_time:
+            report = StorageGCService.collect(batch_size=2, batch_pause=0.25)
+        sleep = mock_time.sleep
+
+        assert report["deleted_files"] == 5
+        assert report["reclaimed_bytes"] == 150
+        # Three batches of at most two files, with a pause between each
+        assert sleep.call_count == 2
+        assert [doc["_id"] for doc in mongo.db["fs.files"].find()] == [kept]
+        assert mongo.db["fs.chunks"].count_documents({"files_id": {"$ne": kept}}) == 0
+
+    def test_file_linked_after_marking_is_not_deleted(self, app):
+        file_id = put_file(b"linked late")
+        original = StorageGCService._drop_newly_referenced
+
+        def link_then_check(batch):
+            mongo.db.resumes.insert_one({"file_id": file_id})
+            return original(batch)
+
+        with patch.object(
+            StorageGCService, "_drop_newly_referenced", side_effect=link_then_check
+        ):
+            report = StorageGCService.collect()
+
+        assert report["deleted_files"] == 0
+        assert GridFS(mongo.db).exists(file_id)
+
+
+class TestCommand:
+    def test_cli_dry_run(self, app):
+        put_file(b"q" * 42)
+
+        result = app.test_cli_runner().invoke(gc_storage_command, ["--dry-run"])
+
+        assert result.exit_code == 0
+        assert "Would reclaim 42 bytes" in result.output
+        assert mongo.db["fs.files"].count_documents({}) == 1
@@ -0,0 +1,181 @@
+"""Tests for feed search typeahead suggestions."""
+
+import time
+import pytest
+import mongomock
+from unittest.mock import patch
+from app import create_app
+from app.extensions import mongo
+from app.services.resume_service import ResumeService
+from app.services.suggest_service import SuggestService
+from app.utils.suggest_index import SuggestIndex, SCAN_LIMIT
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "off"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+def texts(results):
+    return [result["text"] for result in results]
+
+
+def make_index():
+    return SuggestIndex.build(
+        [
+            ("skill", "python", "Python", 40),
+            ("skill", "pytorch", "PyTorch", 12),
+            ("skill", "machine learning", "Machine Learning", 9),
+            ("company", "pyramid analytics", "Pyramid Analytics", 2),
+            ("role", "product manager", "Product Manager", 30),
+        ]
+    )
+
+
+def resume(skills="", role="", company="", school=""):
+    return {
+        "skills": [{"category": "Languages", "skills": skills}],
+        "experience": [{"role": role, "company": company}],
+        "education": [{"institution": school}],
+    }
+
+
+class TestSuggestIndex:
+    def test_completions_are_ranked_by_frequency(self):
+        results = make_index().complete("py")
+
+        assert texts(results) == ["Python", "PyTorch", "Pyramid Analytics"]
+        assert results[0] == {"text": "Python", "kind": "skill", "count": 40}
+
+    def test_prefix_is_case_and_space_insensitive(self):
+        assert texts(make_index().complete("  PYT")) == ["Python", "PyTorch"]
+
+    def test_later_words_match(self):
+        assert texts(make_index().complete("learn")) == ["Machine Learning"]
+
+    def test_limit(self):
+        assert texts(make_index().complete("p", limit=2)) == [
+            "Python",
+            "Product Manager",
+        ]
+        assert make_index().complete("", limit=5) == []
+
+    def test_incremental_updates(self):
+        index = make_index()
+        index.complete("py")
+
+        index.update("skill", "pyspark", "PySpark", 50)
+        index.update("skill", "python", delta=-40)
+
+        assert texts(index.complete("py")) == [
+            "PySpark",
+            "PyTorch",
+            "Pyramid Analytics",
+        ]
+        assert len(index) == 5
+
+    def test_wide_prefixes_are_cached_and_invalidated(self):
+        index = SuggestIndex.build(
+            [
+                ("skill", f"skill {i:04d}", f"Skill {i}", i + 1)
+                for i in range(SCAN_LIMIT * 2)
+            ]
+        )
+
+        assert index.complete("skill", limit=1)[0]["count"] == SCAN_LIMIT * 2
+        assert index.stats()["cached_prefixes"] == 1
+
+        index.update("skill", "skill 0000", delta=10_000)
+
+        assert index.stats()["cached_prefixes"] == 0
+        assert index.complete("skill", limit=1)[0]["text"] == "Skill 0"
+
+    def test_lookup_is_fast(self):
+        index = SuggestIndex.build(
+            [("skill", f"tech {i}", f"Tech {i}", i % 97) for i in range(50_000)]
+        )
+        index.complete("t")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index.complete("t")
+            index.complete("tech 123")
+        elapsed = (time.perf_counter() - start) / 200
+
+        assert elapsed < 0.001
+
+
+class TestSuggestService:
+    def test_built_from_facet_counts(self, app):
+        ResumeService.save_resume_structured_data(
+            resume("Python, Go", role="Data Engineer", school="MIT")
+        )
+        ResumeService.save_resume_structured_data(resume("Python"))
+
+        suggestions = SuggestService.suggest("p")
+
+        assert suggestions[0] == {"text": "Python", "kind": "skill", "count": 2}
+        assert texts(SuggestService.suggest("eng")) == ["Data Engineer"]
+        # Locations are filters, not completions
+        assert SuggestService.suggest("bos") == []
+
+    def test_resume_writes_update_a_loaded_index(self, app):
+        resume_id = ResumeService.save_resume_structured_data(resume("Python"))
+        SuggestService.index()
+
+        ResumeService.save_resume_structured_data(
+            resume("Rust", company="Initech"), resume_id=resume_id
+        )
+
+        assert texts(SuggestService.suggest("ru")) == ["Rust"]
+        assert texts(SuggestService.suggest("ini")) == ["Initech"]
+        assert SuggestService.suggest("py") == []
+
+    def test_other_workers_writes_arrive_on_refresh(self, app):
+        app.config["SUGGEST_REFRESH_INTERVAL"] = 0
+        SuggestService.index()
+        mongo.db.facet_counts.insert_one(
+            {
+                "_id": "skill:go",
+                "facet": "skill",
+                "value": "go",
+                "label": "Go",
+                "count": 3,
+            }
+        )
+
+        assert texts(SuggestService.suggest("g")) == ["Go"]
+
+
+class TestSuggestEndpoint:
+    def test_returns_top_completions(self, app):
+        ResumeService.save_resume_structured_data(resume("Python, PyTorch"))
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "t@example.com",
+                    "password": "password123",
+                    "first_name": "T",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "t@example.com", "password": "password123"}
+            )
+            response = client.get("/api/feed/suggest?prefix=Py&limit=1")
+
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "suggestions": [{"text": "Python", "kind": "skill", "count": 1}]
+        }
+        assert "max-age=60" in response.headers["Cache-Control"]
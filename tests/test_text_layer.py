@@ -0,0 +1,215 @@
+"""Tests for the precomputed text layer served to the review viewer."""
+
+import json
+import pytest
+import mongomock
+import mongomock.gridfs
+from unittest.mock import patch
+from bson import ObjectId
+from app import create_app
+from app.extensions import mongo
+from app.services.blob_storage import BlobStorage
+from app.services.resume_service import ResumeService
+from app.services.storage_gc_service import REFERENCE_FIELDS
+from app.services.text_layer_service import TextLayerService
+from app.utils.pdf_text_layer import TEXT_LAYER_VERSION, extract_text_layer
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+def make_pdf(pages):
+    """Build a minimal Helvetica PDF; pages is a list of [(x, y, size, text)]."""
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", b""]
+    kids = []
+    for items in pages:
+        stream = b"".join(
+            b"BT /F1 %d Tf %d %d Td (%s) Tj ET\n" % (size, x, y, text.encode())
+            for x, y, size, text in items
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"endstream"
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        len(objects),
+        xref,
+    )
+    return out
+
+
+TWO_PAGE_PDF = make_pdf(
+    [
+        [(72, 700, 12, "Jane Doe"), (72, 680, 10, "Software Engineer")],
+        [(100, 500, 14, "Experience")],
+    ]
+)
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app that builds derivatives inline."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "sync"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context(), patch(
+            "app.services.thumbnail_service.render_first_page_png",
+            return_value=(None, False, "no pdftoppm"),
+        ):
+            yield app
+
+
+def create_resume(data=TWO_PAGE_PDF):
+    file_id = BlobStorage.put(data, "cv.pdf", "application/pdf")
+    resume_id = mongo.db.resumes.insert_one(
+        {"file_id": file_id, "filename": "cv.pdf"}
+    ).inserted_id
+    return str(resume_id), file_id
+
+
+class TestExtractTextLayer:
+    def test_items_carry_position_and_size(self):
+        data, success, error = extract_text_layer(TWO_PAGE_PDF)
+
+        assert success, error
+        layer = json.loads(data)
+        first, second = layer["pages"][0]["items"]
+        assert first[0] == "Jane Doe"
+        # transform folds the font size into the text matrix
+        assert first[1:7] == [12, 0, 0, 12, 72, 700]
+        assert second[0] == "Software Engineer"
+        assert second[5:7] == [72, 680]
+        assert first[7] > 0
+        assert layer["fonts"][first[9]] == {
+            "name": "Helvetica",
+            "family": "sans-serif",
+        }
+
+    def test_page_count_and_geometry(self):
+        layer = json.loads(extract_text_layer(TWO_PAGE_PDF)[0])
+
+        assert layer["num_pages"] == 2
+        assert [page["view"] for page in layer["pages"]] == [[0, 0, 612, 792]] * 2
+        assert layer["pages"][1]["rotate"] == 0
+        assert layer["pages"][1]["items"][0][0] == "Experience"
+
+    def test_output_is_compact(self):
+        data, _, _ = extract_text_layer(TWO_PAGE_PDF)
+
+        assert b": " not in data
+        assert b", " not in data.replace(b"Jane Doe", b"")
+
+    def test_invalid_pdf(self):
+        data, success, error = extract_text_layer(b"not a pdf")
+
+        assert not success
+        assert data is None
+        assert "text layer" in error
+
+
+class TestTextLayerService:
+    def test_extracted_once_per_file_id(self, app):
+        resume_id, file_id = create_resume()
+
+        with patch(
+            "app.services.text_layer_service.extract_text_layer",
+            wraps=extract_text_layer,
+        ) as extract:
+            first = TextLayerService.generate(resume_id)
+            second = TextLayerService.generate(resume_id)
+
+        assert extract.call_count == 1
+        assert first["text_layer_source_id"] == file_id
+        assert second["text_layer_file_id"] == first["text_layer_file_id"]
+
+    def test_new_pdf_rebuilds_layer(self, app):
+        resume_id, _ = create_resume()
+        TextLayerService.generate(resume_id)
+        pdf = make_pdf([[(72, 700, 12, "Updated")]])
+        new_file_id = BlobStorage.put(pdf, "v2.pdf", "application/pdf")
+
+        ResumeService.update_resume(resume_id, {"file_id": new_file_id})
+
+        doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        assert doc["text_layer_source_id"] == new_file_id
+        layer = json.loads(BlobStorage.get(doc["text_layer_file_id"]).read())
+        assert layer["num_pages"] == 1
+
+    def test_older_layout_is_rebuilt(self, app):
+        resume_id, _ = create_resume()
+        first = TextLayerService.generate(resume_id)
+        mongo.db.resumes.update_one(
+            {"_id": ObjectId(resume_id)},
+            {"$set": {"text_layer_version": TEXT_LAYER_VERSION - 1}},
+        )
+
+        second = TextLayerService.generate(resume_id)
+
+        assert first["text_layer_version"] == TEXT_LAYER_VERSION
+        assert second["text_layer_file_id"] != first["text_layer_file_id"]
+        assert second["text_layer_version"] == TEXT_LAYER_VERSION
+
+    def test_text_layers_are_gc_roots(self):
+        assert "text_layer_file_id" in REFERENCE_FIELDS
+
+
+class TestEndpoint:
+    def test_serves_json_with_immutable_versioned_url(self, app):
+        resume_id, file_id = create_resume()
+
+        with app.test_client() as client:
+            response = client.get(f"/resume/{resume_id}/text-layer.json?v={file_id}")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert "immutable" in response.headers["Cache-Control"]
+        assert response.get_json()["num_pages"] == 2
+
+    def test_unknown_resume_is_404(self, app):
+        with app.test_client() as client:
+            response = client.get(f"/resume/{ObjectId()}/text-layer.json")
+
+        assert response.status_code == 404
+
+    def test_feedback_page_links_text_layer(self, app):
+        resume_id, file_id = create_resume()
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "r@example.com",
+                    "password": "password123",
+                    "first_name": "R",
+                    "last_name": "V",
+                },
+            )
+            client.post(
+                "/login", data={"email": "r@example.com", "password": "password123"}
+            )
+            response = client.get(f"/resume/feedback/{resume_id}")
+
+        assert ResumeService.build_text_layer_path(resume_id, file_id) in (
+            response.data.decode()
+        )
@@ -0,0 +1,225 @@
+"""Tests for server-rendered feed thumbnails."""
+
+import pytest
+import mongomock
+import mongomock.gridfs
+from subprocess import TimeoutExpired
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from app import create_app
+from app.extensions import mongo
+from app.services.blob_storage import BlobStorage
+from app.services.pdf_derivatives import PdfDerivative
+from app.services.resume_service import ResumeService
+from app.services.storage_gc_service import REFERENCE_FIELDS
+from app.services.thumbnail_service import ThumbnailService
+from app.utils.pdf_thumbnail import render_first_page_png
+
+mongomock.gridfs.enable_gridfs_integration()
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\nfake-thumbnail"
+
+
+@pytest.fixture
+def app():
+    """Create and configure a test app that renders thumbnails inline."""
+    with patch("flask_pymongo.PyMongo.init_app"):
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["PDF_DERIVATIVES"] = "sync"
+        mongo.db = mongomock.MongoClient().db
+
+        with app.app_context():
+            yield app
+
+
+@pytest.fixture
+def renderer():
+    with patch(
+        "app.services.thumbnail_service.render_first_page_png",
+        return_value=(PNG_BYTES, True, None),
+    ) as render:
+        yield render
+
+
+def create_resume(data=b"%PDF-1.4 resume"):
+    file_id = BlobStorage.put(data, "cv.pdf", "application/pdf")
+    resume_id = mongo.db.resumes.insert_one(
+        {"file_id": file_id, "title": "Thumb", "created_at": 1}
+    ).inserted_id
+    return str(resume_id), file_id
+
+
+class TestRenderFirstPage:
+    def test_runs_pdftoppm_for_page_one(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout="", stderr="")
+
+            png, success, error = render_first_page_png(b"%PDF", width=300)
+
+        args = mock_run.call_args[0][0]
+        assert args[0] == "pdftoppm"
+        assert args[args.index("-f") + 1] == "1"
+        assert args[args.index("-l") + 1] == "1"
+        assert args[args.index("-scale-to-x") + 1] == "300"
+        # Nothing was written because pdftoppm was mocked
+        assert not success
+        assert png is None
+
+    def test_missing_binary(self):
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            png, success, error = render_first_page_png(b"%PDF")
+
+        assert not success
+        assert "not installed" in error
+
+    def test_timeout(self):
+        with patch(
+            "subprocess.run", side_effect=TimeoutExpired(cmd="pdftoppm", timeout=30)
+        ):
+            png, success, error = render_first_page_png(b"%PDF")
+
+        assert not success
+        assert "timed out" in error
+
+
+class TestGenerate:
+    def test_renders_once_per_file_id(self, app, renderer):
+        resume_id, file_id = create_resume()
+
+        first = ThumbnailService.generate(resume_id)
+        second = ThumbnailService.generate(resume_id)
+
+        assert renderer.call_count == 1
+        assert first["thumbnail_source_id"] == file_id
+        assert second["thumbnail_file_id"] == first["thumbnail_file_id"]
+        stored = BlobStorage.get(first["thumbnail_file_id"])
+        assert stored.read() == PNG_BYTES
+
+    def test_new_pdf_makes_thumbnail_stale(self, app, renderer):
+        resume_id, _ = create_resume()
+        ThumbnailService.generate(resume_id)
+        new_file_id = BlobStorage.put(b"%PDF-1.4 v2", "v2.pdf", "application/pdf")
+
+        ResumeService.update_resume(resume_id, {"file_id": new_file_id})
+
+        doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        assert renderer.call_count == 2
+        assert doc["thumbnail_source_id"] == new_file_id
+
+    def test_render_failure_is_not_retried_for_the_same_pdf(self, app):
+        resume_id, file_id = create_resume()
+
+        with patch(
+            "app.services.thumbnail_service.render_first_page_png",
+            return_value=(None, False, "boom"),
+        ) as render:
+            assert ThumbnailService.generate(resume_id) is None
+            assert ThumbnailService.generate(resume_id) is None
+
+        assert render.call_count == 1
+        doc = mongo.db.resumes.find_one()
+        assert "thumbnail_file_id" not in doc
+        assert doc["thumbnail_error_source_id"] == file_id
+
+    def test_derivatives_must_implement_build(self):
+        with pytest.raises(TypeError):
+
+            class Incomplete(PdfDerivative):
+                FILE_FIELD = "incomplete_file_id"
+
+    def test_upload_schedules_generation(self, app, renderer):
+        from io import BytesIO
+        from werkzeug.datastructures import FileStorage
+
+        upload = FileStorage(
+            stream=BytesIO(b"%PDF-1.4 upload"),
+            filename="upload.pdf",
+            content_type="application/pdf",
+        )
+
+        resume_id = ResumeService.save_resume_pdf(upload)
+
+        doc = mongo.db.resumes.find_one({"_id": ObjectId(resume_id)})
+        assert doc["thumbnail_source_id"] == doc["file_id"]
+
+    def test_async_mode_queues_background_job(self, app):
+        app.config["PDF_DERIVATIVES"] = "async"
+
+        with patch("app.services.pdf_derivatives._executor") as executor, patch(
+            "app.services.pdf_derivatives._pending", set()
+        ):
+            PdfDerivative.schedule("abc", (ThumbnailService,))
+            PdfDerivative.schedule("abc", (ThumbnailService,))
+
+        # The second request is dropped while the first is pending
+        assert executor.submit.call_count == 1
+
+    def test_thumbnails_are_gc_roots(self):
+        assert "thumbnail_file_id" in REFERENCE_FIELDS
+
+
+class TestEndpoint:
+    def test_serves_png_with_immutable_versioned_url(self, app, renderer):
+        resume_id, file_id = create_resume()
+
+        with app.test_client() as client:
+            response = client.get(f"/resume/{resume_id}/thumbnail.png?v={file_id}")
+            again = client.get(f"/resume/{resume_id}/thumbnail.png?v={file_id}")
+
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        assert response.data == PNG_BYTES
+        assert "immutable" in response.headers["Cache-Control"]
+        assert again.data == PNG_BYTES
+        # Rendered lazily on the first request only
+        assert renderer.call_count == 1
+
+    def test_missing_thumbnail_is_queued_not_rendered_in_the_request(self, app):
+        app.config["PDF_DERIVATIVES"] = "async"
+        resume_id, _ = create_resume()
+
+        with patch.object(PdfDerivative, "schedule") as schedule, patch(
+            "app.services.thumbnail_service.render_first_page_png",
+            side_effect=AssertionError,
+        ):
+            with app.test_client() as client:
+                response = client.get(f"/resume/{resume_id}/thumbnail.png")
+
+        assert response.status_code == 404
+        schedule.assert_called_once_with(resume_id, (ThumbnailService,))
+
+    def test_missing_thumbnail_is_404(self, app):
+        resume_id, _ = create_resume()
+
+        with patch(
+            "app.services.thumbnail_service.render_first_page_png",
+            return_value=(None, False, "no pdftoppm"),
+        ):
+            with app.test_client() as client:
+                response = client.get(f"/resume/{resume_id}/thumbnail.png")
+
+        assert response.status_code == 404
+
+    def test_feed_uses_lazy_images(self, app, renderer):
+        resume_id, file_id = create_resume()
+
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "t@example.com",
+                    "password": "password123",
+                    "first_name": "T",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "t@example.com", "password": "password123"}
+            )
+            response = client.get("/feed")
+
+        html = response.data.decode()
+        assert f'src="/resume/{resume_id}/thumbnail.png?v={file_id}"' in html
+        assert 'loading="lazy"' in html
+        assert "pdf.min.js" not in html
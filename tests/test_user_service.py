@@ -178,3 +178,127 @@ class TestVerifyPassword:
             user = UserService.get_user_by_email("test@example.com")
             result = UserService.verify_password(user, "wrongpassword")
             assert result is False
+
+
+@pytest.fixture
+def user_reads():
+    """Count find_one calls on the users collection."""
+    calls = []
+    original = mongomock.collection.Collection.find_one
+
+    def counted(self, *args, **kwargs):
+        if self.name == "users":
+            calls.append(args)
+        return original(self, *args, **kwargs)
+
+    with patch.object(mongomock.collection.Collection, "find_one", counted):
+        yield calls
+
+
+class TestUserCache:
+    """Tests for the per-process cache behind get_user_by_id()"""
+
+    def _create(self):
+        return UserService.create_user(
+            email="cache@example.com",
+            password="password123",
+            first_name="Cache",
+            last_name="User",
+        )
+
+    def test_repeated_loads_read_once(self, app, clean_db, user_reads):
+        """Test the session user is served from cache after the first load."""
+        with app.app_context():
+            user_id = self._create()
+            first = UserService.get_user_by_id(user_id)
+            second = UserService.get_user_by_id(user_id)
+
+            assert len(user_reads) == 1
+            assert first.email == second.email == "cache@example.com"
+            assert first is not second
+
+    def test_session_user_has_no_password_hash(self, app, clean_db):
+        """Test the loader projection leaves out the password hash."""
+        with app.app_context():
+            user_id = self._create()
+            user = UserService.get_user_by_id(user_id)
+
+            assert user.password_hash == ""
+            assert UserService.get_user_by_email("cache@example.com").password_hash
+
+    def test_current_resume_pointer_invalidates(self, app, clean_db):
+        """Test set_current_resume_for_user drops the cached user."""
+        from app.services.resume_service import ResumeService
+
+        with app.app_context():
+            user_id = self._create()
+            UserService.get_user_by_id(user_id)
+            ResumeService.set_current_resume_for_user(user_id, "resume-1")
+
+            assert UserService.get_user_by_id(user_id).current_resume_id == "resume-1"
+
+    def test_entries_expire(self, app, clean_db, user_reads):
+        """Test a cached user is reloaded once its TTL has passed."""
+        with app.app_context():
+            user_id = self._create()
+            UserService.configure_user_cache(ttl=0)
+            UserService.get_user_by_id(user_id)
+            UserService.get_user_by_id(user_id)
+
+            assert len(user_reads) == 2
+            assert UserService.user_cache_stats()["expirations"] == 1
+
+    def test_cache_is_bounded(self, app, clean_db):
+        """Test least recently used users are evicted beyond maxsize."""
+        with app.app_context():
+            UserService.configure_user_cache(maxsize=2)
+            ids = [
+                str(mongo.db.users.insert_one({"email": f"{n}@x.com"}).inserted_id)
+                for n in range(3)
+            ]
+            for user_id in ids:
+                UserService.get_user_by_id(user_id)
+
+            stats = UserService.user_cache_stats()
+            assert stats["size"] == 2
+            assert stats["evictions"] == 1
+
+    def test_hit_rate(self, app, clean_db):
+        """Test hit-rate metrics count cache lookups."""
+        with app.app_context():
+            user_id = self._create()
+            for _ in range(4):
+                UserService.get_user_by_id(user_id)
+
+            stats = UserService.user_cache_stats()
+            assert stats["hits"] == 3
+            assert stats["misses"] == 1
+            assert stats["hit_rate"] == 0.75
+
+    def test_metrics_endpoint(self, app, clean_db):
+        """Test /api/metrics reports the user cache counters."""
+        with app.test_client() as client:
+            client.post(
+                "/signup",
+                data={
+                    "email": "m@example.com",
+                    "password": "password123",
+                    "first_name": "M",
+                    "last_name": "U",
+                },
+            )
+            client.post(
+                "/login", data={"email": "m@example.com", "password": "password123"}
+            )
+            client.get("/")
+            response = client.get("/api/metrics")
+
+        assert response.status_code == 200
+        assert response.get_json()["user_cache"]["hits"] >= 1
+
+    def test_metrics_requires_login(self, app):
+        """Test anonymous users cannot read metrics."""
+        with app.test_client() as client:
+            response = client.get("/api/metrics")
+
+        assert response.status_code == 302